@@ -0,0 +1,209 @@
+"""
+Helper bersama halaman app (Streamlit, tanpa pandas/plotly): koneksi DuckDB per proses, help per
+tab, tombol export dan catatan waktu render. Modul halaman (page_*.py) di-import lazy oleh
+app_stc_analytics.py hanya saat tab-nya dibuka, jadi import di sini dijaga tetap ringan.
+"""
+import hashlib
+import logging
+import os
+import threading
+
+import streamlit as st
+
+from tools_db import ConnectionManager
+from tools_export import (
+    deferred_export, export_mime, export_name,
+    fig_spec, png_available, warm_renderer, chart_html, chart_png, charts_zip,
+)
+
+DB_PATH = os.getenv("EDA_DB_PATH", "stc_analytics.duckdb")
+WATCH_RETRY_S = 30
+
+# Satu koneksi DuckDB per proses (schema dibuat/migrasi sekali saat pertama dibuka)
+@st.cache_resource(show_spinner=False)
+def db_manager(db_path: str) -> ConnectionManager:
+    return ConnectionManager(db_path)
+
+def get_conn():
+    """Cursor baca milik thread ini (koneksi bersama, jangan di-close)."""
+    return db_manager(DB_PATH).reader()
+
+def db_writer():
+    """Context manager writer tunggal (upsert, clear, reset diserialisasi)."""
+    return db_manager(DB_PATH).writer()
+
+# Watch-folder di dalam proses app: app memegang lock file DuckDB selama berjalan, jadi
+# `python -m stc_analytics watch` terpisah tidak bisa menulis — di sini lewat writer yang sama.
+WATCH_DIR = os.getenv("EDA_WATCH_DIR")
+
+@st.cache_resource(show_spinner=False)
+def start_watcher(directory: str, db_path: str) -> threading.Event:
+    from tools_watch import watch_dir  # tools_ingest (pandas) hanya kalau watcher dipakai
+
+    manager = db_manager(db_path)
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            try:
+                watch_dir(db_path, directory, stop=stop, connection=manager.writer)
+            except Exception:
+                logging.getLogger("stc_analytics.watch").exception("watch-folder %s gagal", directory)
+                stop.wait(WATCH_RETRY_S)
+
+    threading.Thread(target=loop, name="stc-watch", daemon=True).start()
+    return stop
+
+# -------------------------------
+# Help per tab
+# -------------------------------
+HELP_COST = """
+**Apa itu Cost (Vision)?**  
+Menampilkan biaya gas per transaksi/function dari file output STC-Vision.
+
+**Format CSV (header contoh):**  
+`Network, Tx Hash, Block, Gas Used, Gas Price (Gwei), Estimated Fee (ETH), Estimated Fee (Rp), Contract, Function, Timestamp, Status`
+
+**Tips:** Timestamp boleh kosong (kita auto-isi); NDJSON didukung (1 objek per baris).
+"""
+
+HELP_SWC = """
+**Apa itu Security (SWC)?**  
+Menampilkan daftar temuan berdasarkan **Smart Contract Weakness Classification**.
+
+**Kolom minimal:**  
+`finding_id (opsional), timestamp, network, contract, file, line_start, line_end, swc_id, title, severity, confidence, status, remediation, commit_hash`
+
+> Kalau `finding_id` kosong, kita auto-generate **contract::swc_id::line_start** dan *de-dup* batch sebelum upsert.
+"""
+
+HELP_BENCH = """
+**Apa itu Performance (Bench)?**  
+Menampilkan hasil uji beban (TPS/latency/success rate).
+
+**runs.csv:**  
+`run_id, timestamp, network, scenario, contract, function_name, concurrency, tx_per_user, tps_avg, tps_peak, p50_ms, p95_ms, success_rate`
+
+**bench_tx.csv (opsional):**  
+`run_id, tx_hash, submitted_at, mined_at, latency_ms, status, gas_used, gas_price_wei, block_number, function_name`  
+Dari bench_tx dihitung per run: persentil latency (latency_ms, atau mined_at − submitted_at bila kosong),
+histogram latency dan TPS mined per detik. Status `success`/`ok`/`confirmed`/`mined` dihitung sukses.
+"""
+
+def show_help(which: str):
+    with st.expander("🆘 Help", expanded=False):
+        if which == "cost":
+            st.markdown(HELP_COST)
+        elif which == "swc":
+            st.markdown(HELP_SWC)
+        elif which == "bench":
+            st.markdown(HELP_BENCH)
+
+# -------------------------------
+# Export (CSV on-demand + chart)
+# -------------------------------
+def download_query(label: str, sql: str, params=(), file_name: str = "export.csv", **kwargs):
+    """
+    Tombol download CSV yang baru menjalankan COPY DuckDB saat diklik (tools_export);
+    gzip mengikuti toggle sidebar. Klik tidak memicu rerun script.
+    """
+    gz = st.session_state.get("export_gzip", False)
+    mgr = db_manager(DB_PATH)
+    return st.download_button(
+        label,
+        data=deferred_export(mgr.reader, sql, params, gzip=gz),
+        file_name=export_name(file_name, gz),
+        mime=export_mime(gz),
+        on_click="ignore",
+        use_container_width=True,
+        **kwargs,
+    )
+
+def _keyify(name: str) -> str:
+    return hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+
+def page_charts() -> dict:
+    """Chart yang tampil di run ini: base_name -> spec JSON (untuk ZIP semua chart halaman)."""
+    return st.session_state.setdefault("_page_charts", {})
+
+def reset_page_charts() -> None:
+    st.session_state["_page_charts"] = {}
+
+def fig_export_buttons(fig, base_name: str) -> None:
+    """HTML/PNG baru dirender saat tombol diklik (tools_export, cache per hash spec figure)."""
+    spec = page_charts()[base_name] = fig_spec(fig)
+    k = _keyify(base_name)
+    c1, c2 = st.columns(2)
+    
+    with c1:
+        st.download_button(
+            "⬇️ Export chart (HTML)",
+            data=lambda: chart_html(spec),
+            file_name=f"{base_name}.html",
+            mime="text/html",
+            key=f"dl_html_{k}",
+            on_click="ignore",
+            use_container_width=True,
+        )
+    with c2:
+        if png_available():
+            warm_renderer()
+            c2.download_button(
+                "⬇️ Export PNG",
+                data=lambda: chart_png(spec),
+                file_name=f"{base_name}.png",
+                mime="image/png",
+                key=f"dl_png_{k}",
+                on_click="ignore",
+                use_container_width=True,
+            )
+        else:
+            c2.caption("Tambah `kaleido` di requirements.txt untuk export PNG")
+
+def chart_zip_button(base_name: str) -> None:
+    """Satu ZIP semua chart di halaman; dibuat di thread server Streamlit saat diklik."""
+    charts = dict(page_charts())
+    if not charts:
+        return
+    st.download_button(
+        f"📦 Export semua chart ({len(charts)}) — ZIP",
+        data=lambda: charts_zip(charts),
+        file_name=f"{base_name}_charts.zip",
+        mime="application/zip",
+        key=f"dl_zip_{_keyify(base_name)}",
+        on_click="ignore",
+        use_container_width=True,
+    )
+
+# -------------------------------
+# Waktu render (cold start & render pertama per tab, per proses)
+# -------------------------------
+_TIMINGS = {"cold_start": None, "tabs": {}, "last": None}
+_timing_lock = threading.Lock()
+_timing_log = logging.getLogger("stc_analytics.timing")
+
+def record_render(tab: str, seconds: float, import_seconds: float, run_seconds: float) -> None:
+    """
+    Catat satu run: seconds = render tab (termasuk import modul halaman), import_seconds = import
+    modul halaman saja, run_seconds = seluruh script. Run pertama proses dicatat sebagai cold start.
+    """
+    with _timing_lock:
+        if _TIMINGS["cold_start"] is None:
+            _TIMINGS["cold_start"] = run_seconds
+            _timing_log.info("cold start %.2fs (tab %s)", run_seconds, tab)
+        if tab not in _TIMINGS["tabs"]:
+            _TIMINGS["tabs"][tab] = (seconds, import_seconds)
+            _timing_log.info("render pertama %s %.2fs (import modul %.2fs)", tab, seconds, import_seconds)
+        _TIMINGS["last"] = (tab, run_seconds)
+
+def timing_report() -> str:
+    """Ringkasan markdown waktu startup/render proses ini."""
+    with _timing_lock:
+        lines = []
+        if _TIMINGS["cold_start"] is not None:
+            lines.append(f"- Cold start (run pertama proses): **{_TIMINGS['cold_start']:.2f}s**")
+        for tab, (sec, imp) in _TIMINGS["tabs"].items():
+            lines.append(f"- Render pertama {tab}: **{sec:.2f}s** (import modul {imp:.2f}s)")
+        if _TIMINGS["last"] is not None:
+            lines.append(f"- Run terakhir ({_TIMINGS['last'][0]}): {_TIMINGS['last'][1]:.2f}s")
+    return "\n".join(lines)
@@ -0,0 +1,366 @@
+"""
+Helper data halaman app yang butuh pandas: template CSV, baca upload, upsert dan ingest multi-file
+dengan manifest. Di-import oleh modul halaman (page_*.py), bukan oleh script app saat startup.
+"""
+import csv
+import hashlib
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import streamlit as st
+
+import tools_db
+from app_common import db_writer, get_conn
+from tools_ingest import (
+    CSV_TYPED_RULES, spool_upload, read_csv_duckdb, table_schema,
+    UpsertResult, upsert_df, transaction,
+    file_kind, file_digest, expand_paths, parse_file, ingest_path,
+)
+from tools_files import file_hash
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+@st.cache_data(show_spinner=False)
+def _read_csv_with_key(path_str: str, content_hash: str) -> pd.DataFrame:
+    # cache key = (path_str, content_hash) -> isi file berubah, cache auto refresh.
+    # content_hash dari tools_files.file_hash: di-hash ulang hanya saat (mtime_ns, size) berubah
+    return pd.read_csv(path_str)
+
+def _load_csv(path: Path, fallback_cols: list[str]) -> pd.DataFrame:
+    try:
+        if path.exists():
+            return _read_csv_with_key(str(path), file_hash(path))
+        else:
+            st.warning(f"Template tidak ditemukan: {path.name} — pakai fallback kosong.")
+    except Exception as e:
+        st.error(f"Gagal baca {path.name}: {e}")
+    return pd.DataFrame(columns=fallback_cols).head(0)
+
+def load_templates_from_repo():
+    tpl_cost = _load_csv(
+        TEMPLATES_DIR / "vision_template.csv",
+        ["Network","Tx Hash","From","To","Block","Gas Used","Gas Price (Gwei)",
+         "Estimated Fee (ETH)","Estimated Fee (Rp)","Contract","Function","Timestamp","Status"]
+    )
+    tpl_swc = _load_csv(
+        TEMPLATES_DIR / "swc_findings_template.csv",
+        ["finding_id","timestamp","network","contract","file","line_start","line_end",
+         "swc_id","title","severity","confidence","status","remediation","commit_hash"]
+    )
+    tpl_runs = _load_csv(
+        TEMPLATES_DIR / "bench_runs_template.csv",
+        ["run_id","timestamp","network","scenario","contract","function_name",
+         "concurrency","tx_per_user","tps_avg","tps_peak","p50_ms","p95_ms","success_rate"]
+    )
+    tpl_tx = _load_csv(
+        TEMPLATES_DIR / "bench_tx_template.csv",
+        ["run_id","tx_hash","submitted_at","mined_at","latency_ms","status",
+         "gas_used","gas_price_wei","block_number","function_name"]
+    )
+    return tpl_cost, tpl_swc, tpl_runs, tpl_tx
+
+# --- CSV reader yang toleran (mobile-friendly) ---
+def read_csv_any(uploaded):
+    """Baca CSV dari st.file_uploader apa pun MIME/ekstensinya."""
+    if uploaded is None:
+        return None
+
+    # coba pointer ke awal
+    try:
+        uploaded.seek(0)
+    except Exception:
+        pass
+
+    # Percobaan 0: parser CSV DuckDB (multithread), hasil tetap semua kolom str
+    path = None
+    try:
+        path = spool_upload(uploaded, suffix=".csv")
+        mem = duckdb.connect()
+        try:
+            return read_csv_duckdb(mem, path)
+        finally:
+            mem.close()
+    except Exception:
+        pass
+    finally:
+        if path:
+            os.unlink(path)
+
+    # Percobaan 1: langsung ke pandas dengan setting yang aman untuk teks
+    try:
+        uploaded.seek(0)
+    except Exception:
+        pass
+    try:
+        return pd.read_csv(
+            uploaded,
+            sep=",",
+            engine="python",
+            on_bad_lines="skip",
+            encoding="utf-8",
+            dtype=str,                # semua kolom str biar gak diubah-ubah
+            keep_default_na=False,    # "" tetap "", bukan NaN
+            na_filter=False,          # jangan auto-NA
+            quoting=csv.QUOTE_MINIMAL # hormati quotes dari exporter
+        )
+    except Exception:
+        pass
+
+    # Percobaan 2: paksa bytes -> StringIO
+    try:
+        data = uploaded.getvalue() if hasattr(uploaded, "getvalue") else uploaded.read()
+        return pd.read_csv(
+            io.StringIO(data.decode("utf-8", "ignore")),
+            sep=",",
+            engine="python",
+            on_bad_lines="skip",
+            dtype=str,
+            keep_default_na=False,
+            na_filter=False,
+            quoting=csv.QUOTE_MINIMAL
+        )
+    except Exception:
+        return None
+
+
+def sample_templates():
+    """Buat sample DF utk user download sebagai template."""
+    cost_cols = [...]
+    swc_cols = [...]
+    runs_cols = [...]
+    tx_cols = [...]
+
+    # return template-only headers, tidak perlu isi
+    return {
+        "cost": pd.DataFrame(columns=cost_cols),
+        "swc": pd.DataFrame(columns=swc_cols),
+        "runs": pd.DataFrame(columns=runs_cols),
+        "tx": pd.DataFrame(columns=tx_cols),
+    }
+
+def csv_bytes(df: pd.DataFrame) -> bytes:
+    if df is None or not isinstance(df, pd.DataFrame):
+        return b""
+    buff = io.StringIO()
+    df.to_csv(buff, index=False)
+    return buff.getvalue().encode("utf-8")
+
+# -------------------------------
+# Helpers (DB)
+# -------------------------------
+def upsert(table: str, d: pd.DataFrame, key_cols: list, col_list: list | None = None,
+           con=None, after: list = ()) -> UpsertResult:
+    if con is not None:
+        return upsert_df(con, table, d, key_cols, col_list, after=after)
+    with db_writer() as con:
+        return upsert_df(con, table, d, key_cols, col_list, after=after)
+
+def ingest_upload_path(uploaded, table: str, kind: str) -> UpsertResult:
+    """Spool upload ke temp file lalu tools_ingest.ingest_path (typed/streaming) + caption."""
+    path = spool_upload(uploaded, suffix=".ndjson" if kind == "ndjson" else ".csv")
+    try:
+        with db_writer() as con:
+            res, stats = ingest_path(con, table, path, kind)
+    finally:
+        os.unlink(path)
+    if stats["skipped_rows"]:
+        label = "NDJSON" if kind == "ndjson" else "CSV"
+        st.caption(f"{stats['skipped_rows']:,} baris {label} rusak dilewati ({getattr(uploaded, 'name', table)}).")
+    if stats["invalid_timestamps"]:
+        st.caption(f"🔴 Timestamp gagal parsing: {stats['invalid_timestamps']:,} (diisi waktu ingest).")
+    return res
+
+# -------------------------------
+# Ingest manifest (skip upload yang sudah pernah masuk)
+# -------------------------------
+def upload_digest(uploaded) -> str:
+    """SHA-256 isi file upload; di-cache per file_id supaya rerun tidak hash ulang."""
+    cache = st.session_state.setdefault("_upload_digests", {})
+    fid = getattr(uploaded, "file_id", None)
+    if fid is not None and fid in cache:
+        return cache[fid]
+    h = hashlib.sha256()
+    buf = uploaded.getbuffer() if hasattr(uploaded, "getbuffer") else uploaded.getvalue()
+    h.update(buf)
+    digest = h.hexdigest()
+    if fid is not None:
+        cache[fid] = digest
+    return digest
+
+def manifest_lookup(digest: str, table: str):
+    return tools_db.manifest_lookup(get_conn(), digest, table)
+
+def manifest_record(digest: str, table: str, row_count: int, file_name: str) -> None:
+    with db_writer() as con:
+        tools_db.manifest_record(con, digest, table, row_count, file_name)
+
+PARSE_QUEUE_BATCHES = 2
+
+def _parse_worker(out: queue.Queue, stop: threading.Event, table: str, path: str, kind: str,
+                  schema: list, stats: dict) -> None:
+    """Thread pool: batch parse_file -> `out` (antrian terbatas), diakhiri None atau exception."""
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    batches = parse_file(table, path, kind, schema, stats)
+    try:
+        for d in batches:
+            if not put(d):
+                return
+        put(None)
+    except Exception as e:
+        put(e)
+    finally:
+        batches.close()
+
+def _queued_batches(out: queue.Queue):
+    while True:
+        item = out.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def ingest_files(table: str, items: list, ingest_fn, key_cols: list, after: list = ()) -> UpsertResult:
+    """
+    Ingest banyak file sekaligus. items: [(kind, upload|path)] dari file_uploader multi-file
+    dan/atau path server. File yang hash isinya sudah tercatat di ingest_manifest untuk tabel
+    ini dilewati ('Force re-ingest' di sidebar memaksa proses ulang); file dicatat di manifest
+    hanya kalau ada baris masuk atau parse bersih (tanpa baris rusak).
+    >1 file & >1 CPU: parse_file paralel di thread pool (maks `workers` file sekaligus), batch
+    lewat antrian terbatas ke satu writer (urut file, satu transaksi per file). Selain itu — juga tabel bench dengan 'Typed CSV ingest'
+    mati — ingest_fn(kind, file) langsung per file. Progress per file + rows/s total.
+    """
+    force = st.session_state.get("force_reingest", False)
+    todo = []
+    for kind, src in items:
+        is_path = isinstance(src, str)
+        name = src if is_path else getattr(src, "name", "upload")
+        digest = file_digest(src) if is_path else upload_digest(src)
+        hit = None if force else manifest_lookup(digest, table)
+        if hit is not None:
+            st.caption(
+                f"`{name}` sudah di-ingest ke {table} ({hit[0]:,} baris, {hit[2]:%Y-%m-%d %H:%M}) — dilewati. "
+                "Aktifkan **Force re-ingest** di sidebar untuk memproses ulang."
+            )
+            continue
+        todo.append((kind, src, name, digest))
+
+    total = UpsertResult()
+    if not todo:
+        return total
+    if force:
+        # sekali pakai: checkbox dimatikan di rerun berikutnya (widget sudah dirender di run ini)
+        st.session_state["force_reingest_used"] = True
+    bar = st.progress(0.0, text=f"Ingest {len(todo)} file → {table}…")
+    t0 = time.perf_counter()
+
+    def done(i: int, name: str, digest: str, res: UpsertResult, clean: bool = False) -> None:
+        nonlocal total
+        if res.rows or clean:
+            manifest_record(digest, table, res.rows, name)
+        total += res
+        rate = total.rows / max(time.perf_counter() - t0, 1e-6)
+        bar.progress(
+            i / len(todo),
+            text=f"{i}/{len(todo)} file · {os.path.basename(name)}: {res.rows:,} baris · {rate:,.0f} rows/s",
+        )
+
+    # thread, bukan proses: fork dari server Streamlit (multithread, DB DuckDB terbuka) bisa deadlock,
+    # spawn menjalankan ulang script app (__main__). read_csv/read_json DuckDB & pyarrow melepas GIL.
+    workers = min(len(todo), os.cpu_count() or 1)
+    typed = table not in CSV_TYPED_RULES or st.session_state.get("typed_csv", True)
+    if workers <= 1 or not typed:
+        for i, (kind, src, name, digest) in enumerate(todo, 1):
+            if isinstance(src, str):
+                with open(src, "rb") as f:
+                    res = ingest_fn(kind, f)
+            else:
+                res = ingest_fn(kind, src)
+            done(i, name, digest, res)
+        return total
+
+    spooled = []
+    skipped = invalid_ts = 0
+    try:
+        schema = table_schema(get_conn(), table)
+        cols = [c for c, _ in schema]
+        jobs = []
+        for kind, src, name, digest in todo:
+            if isinstance(src, str):
+                path = src
+            else:
+                path = spool_upload(src, suffix=".ndjson" if kind == "ndjson" else ".csv")
+                spooled.append(path)
+            jobs.append((kind, path, name, digest))
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stc-parse") as pool:
+            jobs = iter(jobs)
+            pending = deque()
+
+            def submit_next() -> None:
+                job = next(jobs, None)
+                if job is not None:
+                    kind, path, name, digest = job
+                    out, stats = queue.Queue(maxsize=PARSE_QUEUE_BATCHES), {}
+                    pool.submit(_parse_worker, out, stop, table, path, kind, schema, stats)
+                    pending.append((out, stats, name, digest))
+
+            try:
+                # maks `workers` file diparse sekaligus, tiap file maks PARSE_QUEUE_BATCHES batch menunggu writer
+                for _ in range(workers):
+                    submit_next()
+                # parse paralel, tulis berurutan (baris terakhir per key tetap deterministik)
+                i = 0
+                while pending:
+                    out, stats, name, digest = pending.popleft()
+                    submit_next()
+                    i += 1
+                    res = UpsertResult()
+                    # satu transaksi per file; batch di-upsert begitu selesai diparse (tanpa concat)
+                    with db_writer() as con, transaction(con):
+                        for d in _queued_batches(out):
+                            res += upsert_df(con, table, d, key_cols, cols, after=after, begin=False)
+                    skipped += stats["skipped_rows"]
+                    invalid_ts += stats["invalid_timestamps"]
+                    done(i, name, digest, res, clean=not stats["skipped_rows"])
+            finally:
+                stop.set()
+    finally:
+        for path in spooled:
+            os.unlink(path)
+    if skipped:
+        st.caption(f"{skipped:,} baris rusak dilewati ({table}).")
+    if invalid_ts:
+        st.caption(f"🔴 Timestamp gagal parsing: {invalid_ts:,} (diisi waktu ingest).")
+    return total
+
+def server_path_items(key: str, placeholder: str, kind: str | None = None) -> list:
+    """Input path/glob di server + tombol; return [(kind, path)] hanya saat tombol diklik."""
+    pattern = st.text_input(
+        "Path / glob di server (opsional)", key=key, placeholder=placeholder,
+        help="Direktori atau glob (mis. /data/bench/*.csv, /data/**/*.ndjson) — dibaca langsung di server tanpa upload."
+    )
+    if not st.button("📂 Ingest dari path", key=f"{key}_go") or not pattern.strip():
+        return []
+    paths = expand_paths(pattern)
+    if not paths:
+        st.warning(f"Tidak ada file yang cocok dengan `{pattern}`.")
+        return []
+    st.session_state[f"{key}_done"] = True
+    return [(kind or file_kind(p), p) for p in paths]
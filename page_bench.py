@@ -0,0 +1,343 @@
+"""Tab Performance (Bench) — di-import lazy oleh app_stc_analytics.py saat tab dibuka."""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from app_common import db_writer, download_query, fig_export_buttons, get_conn, show_help
+from app_data import ingest_files, ingest_upload_path, read_csv_any, server_path_items, upsert
+from tools_bench import (
+    BENCH_RUNS_VIEW, bench_overview, bench_metrics, bench_rows, bench_rows_sql, bench_runs_where, render_bench_validation_db,
+    run_stats_where, run_stats_ids, run_stats, run_latency_hist, run_tps_timeline,
+)
+from tools_db import TABLE_AFTER, run_id_match_count
+from tools_ingest import UpsertResult, normalize_run_id, table_schema, upsert_source
+from tools_latency import RUN_STATS, TPS_WINDOW_S
+from tools_table import paged_table
+
+
+def render():
+    st.title("🚀 Performance Analytics — STC Bench")
+
+    with st.expander("Ingest CSV Bench (runs & tx)", expanded=False):
+        col1, col2 = st.columns(2)
+
+        # ---- bench_runs ----
+        with col1:
+            runs = st.file_uploader("bench_runs.csv", type=None, key="runs_csv", accept_multiple_files=True)
+            runs_paths = server_path_items("runs_path", "/data/bench/runs_*.csv", kind="csv")
+
+            def ingest_bench_runs(kind, f) -> UpsertResult:
+                if st.session_state.get("typed_csv", True):
+                    return ingest_upload_path(f, "bench_runs", "csv")
+                d = read_csv_any(f)
+                d["run_id"] = normalize_run_id(d["run_id"])
+                cols = [
+                    "run_id","timestamp","network","scenario","contract","function_name",
+                    "concurrency","tx_per_user","tps_avg","tps_peak","p50_ms","p95_ms","success_rate"
+                ]
+                for c in cols:
+                    if c not in d.columns:
+                        d[c] = None
+                d["timestamp"] = (
+                    pd.to_datetime(d["timestamp"], errors="coerce", utc=True)
+                      .dt.tz_localize(None)
+                )
+                return upsert("bench_runs", d, ["run_id"], cols)
+
+            items = [("csv", f) for f in runs or []] + runs_paths
+            if items:
+                res = ingest_files("bench_runs", items, ingest_bench_runs, ["run_id"])
+                if res.rows:
+                    st.success(f"{res.rows} baris masuk ke bench_runs ({res}).")
+
+        # ---- bench_tx ----
+        with st.expander("📘 Panduan Upload CSV (Wajib Baca)", expanded=False):
+            st.markdown("""
+            ### ℹ️ Penting! Unggah Dua File CSV secara Bersamaan
+
+Untuk menjalankan analisis performa dengan akurat, **dua file CSV harus diunggah secara bersamaan**:
+
+#### 📁 File yang dibutuhkan:
+1. **`bench_runs.csv`** – berisi ringkasan pengujian (_run ID, skenario, concurrency, TPS, latency_, dll).
+2. **`bench_tx.csv`** – berisi detail transaksi dari setiap run (_run ID, hash, status, gas used_, dll).
+
+---
+
+#### 🧩 Kenapa harus dua file?
+Data performa dihasilkan dari **penggabungan (`JOIN`) berdasarkan kolom `run_id`**. Jika salah satu file tidak tersedia:
+- Grafik dan metrik seperti **TPS vs Concurrency**, **Latency**, dan **Success Rate** tidak dapat dihitung dengan lengkap.
+- Data tidak dapat dianalisis secara menyeluruh.
+- Hasil akan kosong atau tidak valid.
+
+---
+
+#### ✅ Tips:
+- Gunakan template CSV yang tersedia di [GitHub repo](https://github.com/mrbrightsides/stc-analytics/tree/main/dummy).
+- Pastikan struktur kolom sesuai, terutama kolom `run_id` sebagai penghubung utama.
+- Setelah diunggah, sistem akan menampilkan notifikasi sukses dan mengaktifkan dashboard analitik.
+            """)
+
+        with col2:
+            tx = st.file_uploader("bench_tx.csv", type=None, key="tx_csv", accept_multiple_files=True)
+            tx_paths = server_path_items("tx_path", "/data/bench/tx_*.csv", kind="csv")
+
+            def stage_bench_tx_pandas(con, f) -> None:
+                d = read_csv_any(f)
+                d["run_id"] = normalize_run_id(d["run_id"])
+                cols = [
+                    "run_id","tx_hash","submitted_at","mined_at","latency_ms","status",
+                    "gas_used","gas_price_wei","block_number","function_name"
+                ]
+                for c in cols:
+                    if c not in d.columns:
+                        d[c] = None
+                d["submitted_at"] = pd.to_datetime(d["submitted_at"], errors="coerce")
+                d["mined_at"] = pd.to_datetime(d["mined_at"], errors="coerce")
+
+                con.execute("""
+                    CREATE OR REPLACE TEMP TABLE stg (
+                        run_id TEXT,
+                        tx_hash TEXT,
+                        submitted_at TIMESTAMP,
+                        mined_at TIMESTAMP,
+                        latency_ms INTEGER,
+                        status TEXT,
+                        gas_used INTEGER,
+                        gas_price_wei BIGINT,
+                        block_number INTEGER,
+                        function_name TEXT
+                    );
+                """)
+
+                # Pastikan semua kolom punya tipe data sesuai DuckDB
+                # latency_ms kosong tetap NULL (metrik run memakai mined_at - submitted_at)
+                d["latency_ms"] = pd.to_numeric(d["latency_ms"], errors="coerce")
+                d["gas_used"] = pd.to_numeric(d["gas_used"], errors="coerce").fillna(0).astype("int64")
+                d["gas_price_wei"] = pd.to_numeric(d["gas_price_wei"], errors="coerce").fillna(0).astype("int64")
+                d["block_number"] = pd.to_numeric(d["block_number"], errors="coerce").fillna(0).astype("int64")
+
+                # Teks
+                for col in ["run_id", "tx_hash", "status", "function_name"]:
+                    d[col] = d[col].astype(str).fillna("")
+
+                # Timestamp
+                d["submitted_at"] = pd.to_datetime(d["submitted_at"], errors="coerce")
+                d["mined_at"] = pd.to_datetime(d["mined_at"], errors="coerce")
+              
+                object_cols = d.select_dtypes(include="object").columns
+                for col in object_cols:
+                    d[col] = d[col].fillna("").astype(str)
+
+                for col in d.select_dtypes(include="object").columns:
+                    d[col] = d[col].astype(str).fillna("").str.replace(r"[\n\r\t]", " ", regex=True)
+
+                d = d.loc[:, cols]
+
+                con.register("df_stage", d.loc[:, cols])
+                con.execute("""
+                    INSERT INTO stg (
+                        run_id, tx_hash, submitted_at, mined_at, latency_ms,
+                        status, gas_used, gas_price_wei, block_number, function_name
+                    )
+                    SELECT
+                        run_id, tx_hash, submitted_at, mined_at, latency_ms,
+                        status, gas_used, gas_price_wei, block_number, function_name
+                    FROM df_stage;
+                """)
+                con.unregister("df_stage")
+
+            def ingest_bench_tx(kind, f) -> UpsertResult:
+                if st.session_state.get("typed_csv", True):
+                    return ingest_upload_path(f, "bench_tx", "csv")
+                with db_writer() as con:
+                    try:
+                        stage_bench_tx_pandas(con, f)
+                        cols = [c for c, _ in table_schema(con, "bench_tx")]
+                        # run_id sudah dinormalisasi di staging; bench_tx_runs & metrik per run ikut di transaksi upsert
+                        return upsert_source(
+                            con, "bench_tx", "stg", ["run_id", "tx_hash"], cols,
+                            dedup=True, after=TABLE_AFTER["bench_tx"],
+                        )
+                    finally:
+                        con.execute("DROP TABLE IF EXISTS stg;")
+
+            items = [("csv", f) for f in tx or []] + tx_paths
+            if items:
+                res = ingest_files("bench_tx", items, ingest_bench_tx, ["run_id", "tx_hash"], after=TABLE_AFTER["bench_tx"])
+                if res.rows:
+                    match_cnt = run_id_match_count(get_conn())
+                    st.success(f"{res.rows} baris masuk ke bench_tx ({res}). run_id match: {match_cnt}")
+
+        render_bench_validation_db(get_conn)
+
+        # ---- Templates ----
+        button_html = lambda label, url: f"""
+        <a href="{url}" target="_blank">
+            <button style="width:100%;padding:0.5em 1em;font-size:1em;">{label}</button>
+        </a>
+        """
+        dcol1, dcol2 = st.columns(2)
+        with dcol1:
+            st.markdown(button_html("⬇️ Template bench_runs.csv", "https://drive.google.com/uc?export=download&id=1tJMjVpuE4v7pfMhlMtYOBMLYgP3MH9fs"), unsafe_allow_html=True)
+        with dcol2:
+            st.markdown(button_html("⬇️ Template bench_tx.csv", "https://drive.google.com/uc?export=download&id=1GNBfIdw8c3-4xGOAud3R2NJqoLA-EFyw"), unsafe_allow_html=True)
+
+    # ===== di luar expander =====    
+    want_load = st.session_state.get("load_existing", False)
+    no_new_upload = not (
+        st.session_state.get("runs_csv") or st.session_state.get("tx_csv")
+        or st.session_state.get("runs_path_done") or st.session_state.get("tx_path_done")
+    )
+    if no_new_upload and not want_load:
+        st.info("Belum ada data benchmark untuk sesi ini. Upload bench_runs/bench_tx atau aktifkan ‘Load existing stored data’.")
+        st.stop()
+
+    con = get_conn()
+    overview = bench_overview(con)
+
+    if overview["rows"] == 0:
+        st.info("Belum ada data benchmark.")
+    else:
+        # ===== filters (tanggal + network + scenario + function) =====
+        fc1, fc2, fc3, fc4 = st.columns([1.4,1,1,1])
+        with fc1:
+            dmin, dmax = overview["ts_min"], overview["ts_max"]
+            date_range = st.date_input(
+                "Tanggal",
+                value=(None if dmin is None else dmin.date(),
+                       None if dmax is None else dmax.date())
+            )
+        with fc2:
+            f_net = st.selectbox("Network", ["(All)"] + overview["networks"], index=0)
+        with fc3:
+            f_scn = st.selectbox("Scenario", ["(All)"] + overview["scenarios"], index=0)
+        with fc4:
+            f_fn  = st.selectbox("Function", ["(All)"] + overview["functions"], index=0)
+
+        # apply filters (SQL; metrik dari rollup bench_runs_daily)
+        where_runs, params_runs = bench_runs_where(
+            date_range,
+            network=None if f_net == "(All)" else f_net,
+            scenario=None if f_scn == "(All)" else f_scn,
+            fn=None if f_fn == "(All)" else f_fn,
+        )
+        n_runs, tps_peak, p95_mean, succ_mean = bench_metrics(con, where_runs, params_runs)
+        plot = bench_rows(con, where_runs, params_runs)
+
+        # ===== badge + download =====
+        b1, b2 = st.columns([2,1])
+        with b1:
+            avg_sr = (succ_mean * 100) if n_runs else 0.0
+            st.caption(
+                f"Menampilkan **{n_runs:,}** runs"
+                + (f" | Network: **{f_net}**"   if f_net != "(All)" else "")
+                + (f" | Scenario: **{f_scn}**"  if f_scn != "(All)" else "")
+                + (f" | Function: **{f_fn}**"   if f_fn != "(All)" else "")
+                + f" | Avg Success Rate: **{avg_sr:.1f}%**"
+            )
+        with b2:
+            download_query(
+                "⬇️ Download CSV (Filtered)", bench_rows_sql(where_runs), params_runs,
+                file_name="bench_runs_filtered.csv",
+            )
+
+        # ===== metrics =====
+        k1, k2, k3 = st.columns(3)
+        k1.metric("TPS Peak", f"{tps_peak:,.2f}" if n_runs else "0")
+        k2.metric("Latency p95 (ms)", f"{p95_mean:,.0f}" if n_runs else "0")
+        k3.metric("Success Rate", f"{avg_sr:.1f}%")
+
+        # ===== charts =====
+        c1, c2 = st.columns(2)
+        with c1:
+            fig = px.line(
+                plot.sort_values("concurrency"),
+                x="concurrency", y="tps_avg", color="scenario",
+                markers=True, title="TPS vs Concurrency",
+                labels={"concurrency":"Concurrency","tps_avg":"TPS Avg","scenario":"Scenario"},
+                template="plotly_white",
+                color_discrete_sequence=px.colors.qualitative.Set2,
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            fig_export_buttons(fig, "bench_tps_vs_concurrency")
+        with c2:
+            lat = plot.melt(
+                id_vars=["concurrency","scenario"],
+                value_vars=["p50_ms","p95_ms"],
+                var_name="metric", value_name="latency_ms"
+            )
+            fig = px.line(
+                lat.sort_values("concurrency"),
+                x="concurrency", y="latency_ms", color="metric",
+                markers=True, title="Latency (p50/p95) vs Concurrency",
+                labels={"concurrency":"Concurrency","latency_ms":"Latency (ms)","metric":"Metric"},
+                template="plotly_white",
+                color_discrete_sequence=px.colors.qualitative.Set2,
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            fig_export_buttons(fig, "bench_latency_vs_concurrency")
+
+        # ===== table =====
+        st.markdown("### Detail Runs")
+        paged_table(
+            con, "bench_detail", BENCH_RUNS_VIEW, where_runs, params_runs,
+            key_cols=("run_id",), total=n_runs,
+        )
+
+        # ===== latency per transaksi (bench_tx, dimaterialisasi per run saat ingest) =====
+        st.markdown("### Latency per Transaksi (bench_tx)")
+        run_ids = run_stats_ids(con, where_runs, params_runs)
+        if not run_ids:
+            st.info("Belum ada bench_tx untuk run pada filter ini.")
+        else:
+            where_stats, params_stats = run_stats_where(where_runs, params_runs)
+            paged_table(
+                con, "bench_run_stats", RUN_STATS, where_stats, params_stats,
+                key_cols=("run_id",), default_sort="p95_ms", total=len(run_ids),
+            )
+            sel_run = st.selectbox("Drilldown run", run_ids, index=0, key="bench_drill_run")
+            rs = run_stats(con, sel_run)
+            m1, m2, m3, m4, m5 = st.columns(5)
+            for col, label, key in ((m1, "p50 (ms)", "p50_ms"), (m2, "p90 (ms)", "p90_ms"),
+                                    (m3, "p95 (ms)", "p95_ms"), (m4, "p99 (ms)", "p99_ms"), (m5, "Max (ms)", "max_ms")):
+                col.metric(label, "-" if pd.isna(rs[key]) else f"{rs[key]:,.0f}")
+            t1, t2, t3 = st.columns(3)
+            t1.metric("TPS mined (rata-rata)", "-" if pd.isna(rs["tps_mined"]) else f"{rs['tps_mined']:,.2f}")
+            t2.metric("Peak TPS (1 detik)", "-" if pd.isna(rs["tps_peak_1s"]) else f"{rs['tps_peak_1s']:,.0f}")
+            t3.metric(f"Peak TPS ({TPS_WINDOW_S} detik)", "-" if pd.isna(rs["tps_peak_window"]) else f"{rs['tps_peak_window']:,.2f}")
+            st.caption(
+                f"{rs['tx_n']:,} tx · sukses {rs['ok_n']:,} · mined {rs['mined_n']:,} · "
+                f"persentil {'exact' if rs['quantile_method'] == 'exact' else 'perkiraan (t-digest)'}"
+            )
+
+            h1, h2 = st.columns(2)
+            with h1:
+                hist = run_latency_hist(con, sel_run)
+                fig = px.bar(
+                    hist, x="bin_mid_ms", y="n", title=f"Distribusi Latency — {sel_run}",
+                    labels={"bin_mid_ms": "Latency (ms)", "n": "Jumlah tx"},
+                    hover_data={"bin_lo_ms": ":,.0f", "bin_hi_ms": ":,.0f"},
+                    template="plotly_white",
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                )
+                fig.update_traces(width=(hist["bin_hi_ms"] - hist["bin_lo_ms"]).tolist())
+                for key, dash in (("p50_ms", "dot"), ("p95_ms", "dash"), ("p99_ms", "dashdot")):
+                    if not pd.isna(rs[key]):
+                        fig.add_vline(x=rs[key], line_dash=dash, annotation_text=key.removesuffix("_ms"))
+                st.plotly_chart(fig, use_container_width=True)
+                fig_export_buttons(fig, "bench_latency_histogram")
+            with h2:
+                tl = run_tps_timeline(con, sel_run).rename(
+                    columns={"mined": "Mined / detik", "tps_window": f"Rata-rata {TPS_WINDOW_S} detik"}
+                )
+                fig = px.line(
+                    tl.melt(id_vars="second", var_name="metric", value_name="tps"),
+                    x="second", y="tps", color="metric", title=f"Throughput Mined — {sel_run}",
+                    labels={"second": "Waktu", "tps": "TPS", "metric": "Metric"},
+                    template="plotly_white",
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                fig_export_buttons(fig, "bench_tps_timeline")
+
+        show_help("bench")
@@ -0,0 +1,248 @@
+"""Tab Security (SWC) — di-import lazy oleh app_stc_analytics.py saat tab dibuka."""
+import json
+import re
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from app_common import download_query, fig_export_buttons, get_conn
+from app_data import csv_bytes, ingest_files, ingest_upload_path, read_csv_any, server_path_items, upsert
+from tools_ingest import COLS_SWC, UpsertResult, map_swc
+from tools_swc import (
+    SEVERITY_ORDER, SEV_UNKNOWN, SEV_RANK_SQL, swc_where, swc_overview, swc_metrics, swc_heatmap, swc_by_severity,
+    swc_ids, swc_rows_sql, swc_detail_sql, swc_detail_export_sql, DETAIL_DTYPES, load_swc_kb,
+)
+from tools_table import paged_table
+
+
+def render():
+    st.title("🛡️ Security Analytics — STC for SWC")
+
+    # --- Ingest (AUTO seperti Bench/Vision) ---
+    with st.expander("Ingest CSV/NDJSON SWC Findings", expanded=False):
+        left, right = st.columns(2)
+        with left:
+            swc_csv = st.file_uploader("Upload CSV swc_findings.csv", type=None, key="swc_csv", accept_multiple_files=True)
+        with right:
+            swc_nd = st.file_uploader(
+                "Upload NDJSON swc_findings.ndjson", type=["ndjson","jsonl"], key="swc_nd", accept_multiple_files=True
+            )
+        swc_paths = server_path_items("swc_path", "/data/swc/*.ndjson")
+
+        # ==== DOWNLOAD BUTTONS ====
+        col_dl1, col_dl2 = st.columns(2)
+        with col_dl1:
+            st.download_button(
+                "⬇️ Template CSV (SWC)",
+                data=csv_bytes(pd.DataFrame(columns=[
+                    "finding_id","timestamp","network","contract","file","line_start","line_end",
+                    "swc_id","title","severity","confidence","status","remediation","commit_hash"
+                ]).head(0)),
+                file_name="swc_findings_template.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+        with col_dl2:
+            sample_rows = [
+                {
+                    "finding_id":"", "timestamp":"2025-08-11T09:45:00Z", "network":"Sepolia",
+                    "contract":"SmartReservation","file":"contracts/SmartReservation.sol",
+                    "line_start":98,"line_end":102,"swc_id":"SWC-105","title":"Potential issue SWC-105 detected",
+                    "severity":"Low","confidence":0.82,"status":"Open","remediation":"Review and document",
+                    "commit_hash":"0xa36e...c5b0"
+                },
+                {
+                    "finding_id":"SmartTourismToken::SWC-108::279","timestamp":"2025-08-10T16:20:00Z",
+                    "network":"Arbitrum Sepolia","contract":"SmartTourismToken",
+                    "file":"contracts/SmartTourismToken.sol","line_start":279,"line_end":288,"swc_id":"SWC-108",
+                    "title":"Potential issue SWC-108 detected","severity":"Medium","confidence":0.87,"status":"Fixed",
+                    "remediation":"Refactor code and add checks","commit_hash":"0xc54f...54c8"
+                },
+            ]
+            ndjson_bytes = ("\n".join(json.dumps(r) for r in sample_rows)).encode("utf-8")
+            st.download_button(
+                "⬇️ Contoh NDJSON (SWC)",
+                data=ndjson_bytes,
+                file_name="swc_findings_sample.ndjson",
+                mime="application/x-ndjson",
+                use_container_width=True,
+            )
+        # ==== END DOWNLOAD BUTTONS ====
+
+        # ---- Auto-ingest (langsung proses saat upload) ----
+        def ingest_swc(kind, f) -> UpsertResult:
+            if kind == "ndjson":
+                return ingest_upload_path(f, "swc_findings", "ndjson")
+            d = read_csv_any(f)
+            d = map_swc(d)
+            if d.attrs.get("invalid_timestamps"):
+                st.caption(f"🔴 Timestamp gagal parsing: {d.attrs['invalid_timestamps']:,} (diisi waktu ingest).")
+            return upsert("swc_findings", d, ["finding_id"], COLS_SWC)
+
+        items = [("csv", f) for f in swc_csv or []] + [("ndjson", f) for f in swc_nd or []] + swc_paths
+        ing = ingest_files("swc_findings", items, ingest_swc, ["finding_id"])
+
+        if ing.rows:
+            st.success(f"{ing.rows} temuan masuk ke swc_findings ({ing}).")
+
+    # ===== DI LUAR EXPANDER (tapi masih di halaman SWC) =====
+    want_load = st.session_state.get("load_existing", False)
+    no_new_upload = not (
+        st.session_state.get("swc_csv") or st.session_state.get("swc_nd")
+        or st.session_state.get("swc_path_done")
+    )
+    if no_new_upload and not want_load:
+        st.info("Belum ada data temuan SWC untuk sesi ini. Upload CSV/NDJSON atau aktifkan ‘Load existing stored data’.")
+        st.stop()
+
+    # --- Load data ---
+    con = get_conn()
+    ov = swc_overview(con)
+
+    if ov["rows"] == 0:
+        st.info("Belum ada data temuan SWC.")
+    else:
+        # ====== filters (mirip Vision) ======
+        fc1, fc2, fc3 = st.columns([1.4, 1, 1])
+        with fc1:
+            dmin, dmax = ov["ts_min"], ov["ts_max"]
+            date_range = st.date_input(
+                "Tanggal",
+                value=(None if dmin is None else dmin.date(),
+                       None if dmax is None else dmax.date())
+            )
+        with fc2:
+            nets = ["(All)"] + ov["networks"]
+            f_net = st.selectbox("Network", nets, index=0)
+        with fc3:
+            sevs = ["(All)"] + ov["severities"]
+            f_sev = st.selectbox("Severity", sevs, index=0)
+
+        # apply filters -> WHERE berparameter
+        where, params = swc_where(
+            date_range,
+            network=None if f_net == "(All)" else f_net,
+            severity=None if f_sev == "(All)" else f_sev,
+        )
+        total, high, uniq = swc_metrics(con, where, params)
+
+        # ====== badge + download ======
+        b1, b2 = st.columns([2, 1])
+        with b1:
+            st.caption(
+                f"Menampilkan **{total:,}** temuan"
+                + (f" | Network: **{f_net}**" if f_net != "(All)" else "")
+                + (f" | Severity: **{f_sev}**" if f_sev != "(All)" else "")
+            )
+        with b2:
+            download_query(
+                "⬇️ Download CSV (Filtered)", swc_rows_sql(where), params, file_name="swc_findings_filtered.csv"
+            )
+
+        # ====== metrics ======
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Total Findings", f"{total:,}")
+        m2.metric("High Severity", f"{high:,}")
+        m3.metric("Unique SWC IDs", f"{uniq:,}")
+
+        # ====== heatmap ======
+        pivot = swc_heatmap(con, where, params)
+        if not pivot.empty:
+            fig = px.imshow(
+                pivot,
+                text_auto=True, aspect="auto",
+                title="SWC-ID × Severity (count)",
+                template="plotly_white",
+                color_continuous_scale="Blues"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            fig_export_buttons(fig, "swc_heatmap")
+
+        by_sev = swc_by_severity(con, where, params)
+        if not by_sev.empty:
+            fig = px.bar(
+                by_sev, x="sev", y="size", color="sev",
+                title="Findings by Severity",
+                labels={"sev":"Severity", "size":"Count"},
+                template="plotly_white",
+                color_discrete_sequence=px.colors.qualitative.Set2,
+            )
+            fig.update_xaxes(categoryorder="array", categoryarray=SEVERITY_ORDER + [SEV_UNKNOWN])
+            st.plotly_chart(fig, use_container_width=True)
+            fig_export_buttons(fig, "swc_by_severity")
+
+        # ====== table ======
+        st.markdown("### Detail Temuan")
+        paged_table(
+            con, "swc_detail", f"({swc_detail_sql(where)}) d", params=params, key_cols=("finding_id",),
+            sort_options={
+                "severity": SEV_RANK_SQL.format(col="severity"),
+                **{c: c for c in ["timestamp", "network", "contract", "file", "swc_id", "title",
+                                  "confidence", "status"]},
+            },
+            default_sort="severity", default_desc=False, total=total, dtypes=DETAIL_DTYPES,
+        )
+
+        download_query(
+            "⬇️ Download tabel di atas (CSV, semua halaman)", swc_detail_export_sql(where), params,
+            file_name="swc_table_filtered.csv", key="dl_swc_table_filtered",
+        )
+
+        available_ids = swc_ids(con, where, params)
+
+        # ====== SWC Knowledge ======
+        st.markdown("### 🔎 SWC Knowledge")
+        kb = load_swc_kb()
+        if not kb:
+            st.warning("SWC KB JSON belum ditemukan. Letakkan file **swc_kb.json** di direktori app atau set env `SWC_KB_PATH`.")
+        else:
+            if not available_ids:
+                st.info("Tidak ada SWC-ID pada data saat ini.")
+            else:
+                sel = st.selectbox("Pilih SWC-ID untuk penjelasan", available_ids, index=0)
+                entry = kb.get(sel)
+                if entry:
+                    st.subheader(f"{sel} — {entry.get('title','')}")
+                    if entry.get("pending"):
+                        st.caption(f"Draft kontribusi `{entry['pending']}` (pending_kb) — belum masuk swc_kb.json.")
+                    desc = entry.get("description","").strip()
+                    if desc:
+                        st.markdown(desc)
+                    mit = entry.get("mitigation","").strip()
+                    if mit:
+                        st.markdown("**Mitigation:**")
+                        for b in [x.strip() for x in re.split(r"[\n;]", mit) if x.strip()]:
+                            st.markdown(f"- {b}")
+                else:
+                    st.info("SWC ini belum ada di KB JSON.")
+
+                    with st.expander("➕ Tambahkan penjelasan untuk SWC ini"):
+                        new_title = st.text_input("Judul SWC", key="title_input")
+                        new_desc = st.text_area("Deskripsi SWC", key="desc_input", height=200)
+                        new_mitigation = st.text_area("Mitigasi (opsional)", key="mitigation_input", height=100)
+
+                        if st.button("💾 Buat Draft JSON untuk Pull Request"):
+                            if new_title and new_desc:
+                                draft_kb = {
+                                    sel: {
+                                        "title": new_title.strip(),
+                                        "description": new_desc.strip(),
+                                        "mitigation": new_mitigation.strip()
+                                    }
+                                }
+                                draft_json = json.dumps(draft_kb, indent=2)
+
+                                st.download_button(
+                                    label="⬇️ Download Draft KB (JSON)",
+                                    data=draft_json,
+                                    file_name=f"{sel}_kb_contribution.json",
+                                    mime="application/json",
+                                    use_container_width=True
+                                )
+
+                                st.success("✅ Draft berhasil dibuat.")
+                                st.info("Silakan ajukan file ini sebagai Pull Request ke repositori kami.")
+                                st.markdown("[📌 Buat PR di GitHub](https://github.com/mrbrightsides/stc-analytics/pulls)", unsafe_allow_html=True)
+                            else:
+                                st.error("Judul dan deskripsi wajib diisi.")
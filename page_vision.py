@@ -0,0 +1,383 @@
+"""Tab Cost (Vision) — di-import lazy oleh app_stc_analytics.py saat tab dibuka."""
+import json
+from datetime import timedelta
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from app_common import download_query, fig_export_buttons, get_conn
+from app_data import csv_bytes, ingest_files, ingest_upload_path, read_csv_any, server_path_items, upsert
+from tools_db import and_where
+from tools_ingest import UpsertResult, map_csv_cost
+from tools_table import paged_table
+from tools_vision import (
+    UNPARSED_LABEL, FN_SQL, SERIES_POINTS, SERIES_POINT_OPTIONS, SMOOTH_WINDOW, SCATTER_GL_POINTS, SCATTER_POINTS,
+    vision_where, vision_summary, vision_options, vision_unparsed_stats, vision_cost_by_fn,
+    vision_series, vision_series_range, vision_series_median, vision_scatter, vision_scatter_count,
+    vision_scatter_density, vision_cost_iqr_threshold, vision_scatter_outliers, vision_top_cost,
+    vision_rows_sql,
+)
+
+
+def render():
+    st.title("💰 Cost Analytics — STC Vision")
+
+    ing = UpsertResult()
+
+    with st.expander("Ingest data (NDJSON/CSV) → DuckDB", expanded=False):
+        left, right = st.columns(2)
+        with left:
+            cs = st.file_uploader(
+                "Upload CSV (dari STC-Vision)",
+                type=None, key="csv_cost", accept_multiple_files=True
+            )
+        with right:
+            nd = st.file_uploader(
+                "Upload NDJSON (vision_costs.ndjson / jsonl)",
+                type=["ndjson", "jsonl"], key="nd_cost", accept_multiple_files=True
+            )
+        vision_paths = server_path_items("vision_path", "/data/vision/*.ndjson")
+
+        # === Templates / samples ===
+        tpl_cost = pd.DataFrame(columns=[
+            "Timestamp", "Network", "Tx Hash", "Contract", "Function",
+            "Block", "Gas Used", "Gas Price (Gwei)",
+            "Estimated Fee (ETH)", "Estimated Fee (Rp)", "Status"
+        ]).head(0)
+        c1, c2 = st.columns(2)
+        with c1:
+            st.download_button(
+                "⬇️ Template CSV (Vision)",
+                data=csv_bytes(tpl_cost),
+                file_name="vision_template.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+        with c2:
+            vision_sample_rows = [{
+                "id": "demo::bookHotel", "project": "STC", "network": "Sepolia",
+                "timestamp": "2025-08-12T09:45:00Z", "tx_hash": "0xabc123...",
+                "contract": "SmartReservation", "function_name": "bookHotel",
+                "block_number": 123456, "gas_used": 21000, "gas_price_wei": 22500000000,
+                "cost_eth": 0.0005, "cost_idr": 15000, "meta_json": "{\"status\":\"Success\"}"
+            }]
+            ndjson_bytes = ("\n".join(json.dumps(r) for r in vision_sample_rows)).encode("utf-8")
+            st.download_button(
+                "⬇️ Contoh NDJSON (Vision)",
+                data=ndjson_bytes,
+                file_name="vision_sample.ndjson",
+                mime="application/x-ndjson",
+                use_container_width=True
+            )
+
+        def ingest_vision(kind, f) -> UpsertResult:
+            # === NDJSON ingest ===
+            if kind == "ndjson":
+                return ingest_upload_path(f, "vision_costs", "ndjson")
+            # === CSV ingest ===
+            raw = read_csv_any(f)
+            if raw is None or raw.empty:
+                st.warning("CSV kosong atau tidak terbaca.")
+                return UpsertResult()
+            d = map_csv_cost(raw)
+            return upsert("vision_costs", d, ["id"], d.columns.tolist())
+
+        items = [("ndjson", f) for f in nd or []] + [("csv", f) for f in cs or []] + vision_paths
+        ing += ingest_files("vision_costs", items, ingest_vision, ["id"])
+
+        if ing.rows:
+            st.success(f"{ing.rows} baris masuk ke vision_costs ({ing}).")
+
+    # ==== Load & tampilkan data (di luar expander) ====
+    want_load = st.session_state.get("load_existing", False)
+    no_new_upload = not (
+        st.session_state.get("nd_cost") or st.session_state.get("csv_cost")
+        or st.session_state.get("vision_path_done")
+    )
+    if no_new_upload and not want_load:
+        st.info("Belum ada data cost untuk sesi ini. Upload NDJSON/CSV atau aktifkan ‘Load existing stored data’ di sidebar.")
+        st.stop()
+
+    con = get_conn()
+    summary = vision_summary(con)
+
+    if summary["rows"] == 0:
+        st.info("Belum ada data cost.")
+    else:
+        # Ringkasan
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Total Rows", f"{summary['rows']:,}")
+        c2.metric("Unique Tx", f"{summary['unique_tx']:,}")
+        c3.metric("Total IDR", f"{int(summary['total_idr']):,}")
+
+        st.markdown("### Detail Vision Costs")
+        paged_table(con, "vision_detail", "vision_costs", key_cols=("id",), total=summary["rows"])
+        download_query("⬇️ Download CSV (All)", vision_rows_sql(), file_name="vision_costs_all.csv")
+
+        # ====== Filters & plotting (with explorer links) ======
+        def short_tx(x: str) -> str:
+            x = str(x or "")
+            return x[:6] + "…" + x[-4:] if len(x) > 12 else x
+
+        def explorer_tx_url(network: str, tx: str) -> str:
+            base = {
+                "Ethereum": "https://etherscan.io/tx/{}",
+                "Sepolia": "https://sepolia.etherscan.io/tx/{}",
+                "Arbitrum": "https://arbiscan.io/tx/{}",
+                "Arbitrum One": "https://arbiscan.io/tx/{}",
+                "Arbitrum Sepolia": "https://sepolia.arbiscan.io/tx/{}",
+                "Polygon": "https://polygonscan.com/tx/{}",
+                "Polygon Amoy": "https://amoy.polygonscan.com/tx/{}",
+            }.get(str(network), "https://etherscan.io/tx/{}")
+            return base.format(tx)
+
+        net_opts, fn_opts = vision_options(con)
+        fc1, fc2, fc3, fc4, fc5, fc6, fc7 = st.columns([1.4, 1, 1, 1, 1, 1, 1])
+        with fc1:
+            dmin, dmax = summary["ts_min"], summary["ts_max"]
+            date_range = st.date_input(
+                "Tanggal",
+                value=(None if dmin is None else dmin.date(),
+                       None if dmax is None else dmax.date())
+            )
+        with fc2:
+            f_net = st.selectbox("Network", ["(All)"] + net_opts, index=0)
+        with fc3:
+            f_fn = st.selectbox(
+                "Function",
+                ["(All)"] + fn_opts,
+                index=0,
+                help=f"'{UNPARSED_LABEL}' berarti nama fungsi tidak terdeteksi dari data transaksi/ABI."
+            )
+        hide_unknown_default = (f_fn != "(All)")
+        with fc4:
+            hide_unknown = st.checkbox(f"Sembunyikan ({UNPARSED_LABEL})", value=hide_unknown_default)
+        with fc5:
+            do_smooth = st.checkbox("Smoothing (7-pt)", value=False)
+        with fc6:
+            line_log = st.checkbox("Line: log scale (Y)", value=False)
+        with fc7:
+            scatter_scale = st.selectbox("Scatter scale", ["linear", "log x", "log y", "log x & y"], index=0)
+
+        # Filter -> WHERE berparameter (stats: tanpa 'sembunyikan unparsed')
+        filt = dict(
+            date_range=date_range,
+            network=None if f_net == "(All)" else f_net,
+            fn=None if f_fn == "(All)" else f_fn,
+        )
+        where_stats, params_stats = vision_where(**filt)
+        where_plot, params_plot = vision_where(**filt, hide_unparsed=hide_unknown or (f_fn != "(All)"))
+
+        total_rows_stats, unparsed_count = vision_unparsed_stats(con, where_stats, params_stats)
+        pct_unparsed = (unparsed_count / total_rows_stats * 100.0) if total_rows_stats > 0 else 0.0
+        n_plot = total_rows_stats - unparsed_count if where_plot != where_stats else total_rows_stats
+
+        b1, b2, b3 = st.columns([2, 1, 1])
+        with b1:
+            st.caption(
+                f"Menampilkan **{n_plot:,}** transaksi"
+                + (f" | Network: **{f_net}**"  if f_net != "(All)" else "")
+                + (f" | Function: **{f_fn}**"  if f_fn != "(All)" else "")
+                + (f" | Unparsed: **{pct_unparsed:.1f}%**" if total_rows_stats > 0 else "")
+            )
+        with b2:
+            download_query(
+                "⬇️ Download CSV (Filtered)", vision_rows_sql(where_plot), params_plot,
+                file_name="vision_filtered.csv",
+            )
+        with b3:
+            download_query(
+                "⬇️ Unparsed CSV", vision_rows_sql(and_where(where_stats, f"{FN_SQL} = ?")),
+                params_stats + [UNPARSED_LABEL],
+                file_name="vision_unparsed_filtered.csv", disabled=unparsed_count == 0,
+            )
+
+        # Charts
+        g1, g2 = st.columns(2)
+        with g1:
+            n_series, ts_lo, ts_hi = vision_series_range(con, where_plot, params_plot)
+            if n_series:
+                smooth = do_smooth and n_series >= SMOOTH_WINDOW
+                show_median = st.checkbox("Tampilkan garis median", value=False)
+                tight_range = st.checkbox("Tight Y-range (tanpa 0)", value=True)
+                y_pad_pct = st.slider("Padding Y-axis (%)", 0, 25, 8, key="y_pad_pct") if tight_range else 0
+                # series besar: budget titik + zoom waktu (query ulang resolusi penuh di rentang itu)
+                x_range = None
+                max_points = SERIES_POINTS
+                if n_series > SERIES_POINT_OPTIONS[0]:
+                    max_points = st.select_slider(
+                        "Titik maks (downsampling)", SERIES_POINT_OPTIONS, value=SERIES_POINTS,
+                        help="Di atas budget ini, tiap bucket waktu per network diwakili titik min & max.",
+                    )
+                if n_series > max_points and ts_hi > ts_lo:
+                    zoom = st.slider(
+                        "Zoom waktu", min_value=ts_lo, max_value=ts_hi, value=(ts_lo, ts_hi),
+                        step=max((ts_hi - ts_lo) / 500, timedelta(seconds=1)), format="YYYY-MM-DD HH:mm",
+                    )
+                    if tuple(zoom) != (ts_lo, ts_hi):
+                        x_range = tuple(zoom)
+                ts, n_points = vision_series(
+                    con, where_plot, params_plot, smooth=smooth, max_points=max_points, x_range=x_range
+                )
+                y = "cost_idr_num"
+                if len(ts) < n_points:
+                    st.caption(f"Menampilkan {len(ts):,} dari {n_points:,} titik (min/max per bucket waktu).")
+                fig = px.line(
+                    ts, x="ts", y=y, color="network", markers=not do_smooth,
+                    title="Biaya per Transaksi (Rp) vs Waktu",
+                    labels={"ts": "Waktu", y: "Biaya (Rp)", "network": "Jaringan"},
+                    template="plotly_white",
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                )
+                if line_log:
+                    fig.update_yaxes(type="log")
+
+                if show_median:
+                    med = vision_series_median(con, where_plot, params_plot, smooth=smooth, x_range=x_range)
+                    if med is not None:
+                        fig.add_hline(y=med, line_dash="dot",
+                                      annotation_text=f"Median: {med:,.0f} Rp",
+                                      annotation_position="top left")
+                if tight_range:
+                    yvals = pd.to_numeric(ts[y], errors="coerce").dropna()
+                    if not yvals.empty:
+                        ymin, ymax = float(yvals.min()), float(yvals.max())
+                        if ymin == ymax:  
+                            ymin *= 0.9; ymax *= 1.05
+                        pad = (ymax - ymin) * (y_pad_pct / 100.0)
+                        fig.update_yaxes(range=[max(0, ymin - pad), ymax + pad])
+                st.plotly_chart(fig, use_container_width=True)
+                fig_export_buttons(fig, "vision_cost_timeseries")
+
+        with g2:
+            by_fn = vision_cost_by_fn(con, where_plot, params_plot, limit=15)
+            if not by_fn.empty:
+                fig = px.bar(
+                    by_fn, x="fn", y="cost_idr_num", color="fn", text_auto=True,
+                    title="Total Biaya per Function (Rp) — Top 15",
+                    labels={"fn": "Function", "cost_idr_num": "Total Biaya (Rp)"},
+                    color_discrete_map={UNPARSED_LABEL: "#F59E0B"},
+                    template="plotly_white",
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                )
+                fig.update_xaxes(categoryorder="total descending")
+                st.plotly_chart(fig, use_container_width=True)
+                fig_export_buttons(fig, "vision_fn_top15")
+
+        n_sc = vision_scatter_count(con, where_plot, params_plot)
+        if n_sc:
+            scatter_mode = st.radio(
+                "Mode scatter", ["Auto", "Titik", "Density"], horizontal=True, key="scatter_mode",
+                help=f"Auto: titik (WebGL di atas {SCATTER_GL_POINTS:,}), grid density di atas {SCATTER_POINTS:,} titik.",
+            )
+            density = scatter_mode == "Density" or (scatter_mode == "Auto" and n_sc > SCATTER_POINTS)
+            log_x = scatter_scale in ("log x", "log x & y")
+            log_y = scatter_scale in ("log y", "log x & y")
+
+            if density:
+                grid = vision_scatter_density(con, where_plot, params_plot, log_x=log_x, log_y=log_y)
+                n_mat = grid.pivot(index="iy", columns="ix", values="n")
+                cost_mat = grid.pivot(index="iy", columns="ix", values="cost_idr_num")
+                fig = go.Figure(go.Heatmap(
+                    x=grid.groupby("ix")["x"].first()[n_mat.columns], y=grid.groupby("iy")["y"].first()[n_mat.index],
+                    z=n_mat.values, customdata=cost_mat.values,
+                    colorscale="Blues", colorbar=dict(title="Transaksi"),
+                    hovertemplate=(
+                        "Gas Used≈%{x:,.0f}<br>Gas Price (wei)≈%{y:,.0f}"
+                        "<br>Transaksi=%{z:,}<br>Total Biaya (Rp)=%{customdata:,.0f}<extra></extra>"
+                    ),
+                ))
+                fig.update_layout(
+                    title=f"Gas Used vs Gas Price (density, {n_sc:,} transaksi)", template="plotly_white",
+                    xaxis_title="Gas Used", yaxis_title="Gas Price (wei)",
+                )
+            else:
+                sc = vision_scatter(con, where_plot, params_plot)
+                fig = px.scatter(
+                    sc, x="gas_used_num", y="gas_price_num", size="cost_idr_num", color="network",
+                    title="Gas Used vs Gas Price (size = Biaya Rp)",
+                    labels={"gas_used_num": "Gas Used", "gas_price_num": "Gas Price (wei)", "network": "Jaringan"},
+                    custom_data=["fn", "tx_short", "cost_idr_num"],
+                    render_mode="webgl" if n_sc > SCATTER_GL_POINTS else "svg",
+                    template="plotly_white",
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                )
+                fig.update_traces(hovertemplate=(
+                    "Function=%{customdata[0]}<br>Tx=%{customdata[1]}"
+                    "<br>Gas Used=%{x:,.0f}<br>Gas Price (wei)=%{y:,.0f}"
+                    "<br>Biaya (Rp)=%{customdata[2]:,.0f}"
+                    "<br>(Buka detail di tabel Unparsed di bawah)<extra></extra>"
+                ))
+
+            # outlier biaya (Q3 + 1.5 IQR) sebagai trace overlay kecil
+            threshold = vision_cost_iqr_threshold(con, where_plot, params_plot)
+            out = vision_scatter_outliers(con, where_plot, params_plot, threshold) if threshold is not None else None
+            if out is not None and not out.empty:
+                fig.add_scatter(
+                    x=out["gas_used_num"], y=out["gas_price_num"],
+                    mode="markers",
+                    marker=dict(symbol="star", size=16, line=dict(width=2)),
+                    name="Outliers (Biaya tinggi)",
+                    customdata=out[["fn", "tx_short", "cost_idr_num"]],
+                    hovertemplate=(
+                        "Function=%{customdata[0]}<br>Tx=%{customdata[1]}"
+                        "<br>Biaya (Rp)=%{customdata[2]:,.0f}<extra></extra>"
+                    ),
+                )
+            if log_x:
+                fig.update_xaxes(type="log")
+            if log_y:
+                fig.update_yaxes(type="log")
+            st.plotly_chart(fig, use_container_width=True)
+            fig_export_buttons(fig, "vision_gas_vs_price")
+
+            topn = st.slider("Tampilkan Top N transaksi berdasarkan biaya (Rp)", 5, 50, 15, key="topn_cost")
+            top_tbl = vision_top_cost(con, where_plot, params_plot, limit=topn)
+            top_tbl["tx_short"] = top_tbl["tx_hash"].astype(str).map(short_tx)
+            top_tbl["explorer_url"] = [explorer_tx_url(n, t) for n, t in zip(top_tbl["network"], top_tbl["tx_hash"])]
+            st.markdown("#### 💸 Top transaksi berdasarkan biaya (Rp)")
+            st.dataframe(
+                top_tbl[["timestamp","network","contract","fn","tx_short","cost_idr_num","explorer_url"]],
+                use_container_width=True,
+                column_config={
+                    "tx_short": "Tx (short)",
+                    "fn": "Function",
+                    "cost_idr_num": st.column_config.NumberColumn("Biaya (Rp)", format="%,d"),
+                    "timestamp": st.column_config.DatetimeColumn("Waktu"),
+                    "explorer_url": st.column_config.LinkColumn("Explorer", display_text="Open"),
+                },
+                hide_index=True,
+            )
+            st.download_button(
+                "⬇️ Download Top transaksi (CSV)",
+                data=lambda tbl=top_tbl: csv_bytes(tbl),
+                file_name="vision_top_cost.csv",
+                mime="text/csv",
+                on_click="ignore",
+                use_container_width=True,
+            )
+
+        # Tabel Unparsed: semua baris unparsed (tanpa filter halaman), berhalaman di DuckDB
+        _, unparsed_all = vision_unparsed_stats(con, "", [])
+        if unparsed_all:
+            def unparsed_view(d: pd.DataFrame) -> pd.DataFrame:
+                d = d.assign(
+                    Explorer=[explorer_tx_url(n, t) for n, t in zip(d["network"], d["tx_hash"])],
+                    **{"Tx (short)": d["tx_hash"].map(short_tx)},
+                )
+                return d[["timestamp", "network", "contract", "Tx (short)", "Explorer", "cost_idr"]]
+
+            st.markdown("#### 🔎 Unparsed Function — periksa di explorer")
+            paged_table(
+                con, "vision_unparsed", "vision_costs", f"WHERE {FN_SQL} = ?", [UNPARSED_LABEL], key_cols=("id",),
+                sort_options={c: c for c in ["timestamp", "network", "contract", "cost_idr"]},
+                total=unparsed_all, prepare=unparsed_view,
+                column_config={
+                    "Explorer": st.column_config.LinkColumn("Explorer", display_text="Open"),
+                    "cost_idr": st.column_config.NumberColumn("Biaya (Rp)", format="%,d"),
+                    "timestamp": st.column_config.DatetimeColumn("Waktu"),
+                },
+            )
+            st.caption("Catatan: Unparsed berarti nama fungsi tidak terdeteksi dari data transaksi. Cek ABI/source di explorer.")
@@ -0,0 +1,141 @@
+"""
+CLI STC Analytics — ingest file ke DuckDB tanpa Streamlit/Plotly (untuk cron / batch malam).
+
+    python -m stc_analytics ingest --table bench_tx data/bench/tx_*.csv
+    python -m stc_analytics ingest --table vision_costs /data/vision/ --db stc_analytics.duckdb --force
+    python -m stc_analytics watch /data/collector --interval 2
+
+Mapping & upsert sama dengan app (tools_ingest / tools_db). Exit code: 0 sukses,
+1 file tidak ditemukan / error lain, 2 schema error (kolom wajib hilang).
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import duckdb
+
+from tools_db import DB_PATH, TABLE_KEYS, ensure_db, manifest_lookup, manifest_record
+from tools_ingest import SchemaError, UpsertResult, expand_paths, file_digest, ingest_path
+from tools_watch import watch_dir
+
+STAGES = ["hash", "parse", "map", "write"]
+
+
+def cmd_ingest(args) -> int:
+    paths = []
+    for p in args.paths:
+        paths += expand_paths(p)
+    if not paths:
+        print(f"Tidak ada file yang cocok: {' '.join(args.paths)}", file=sys.stderr)
+        return 1
+
+    ensure_db(args.db)
+    con = duckdb.connect(args.db)
+    timings = {}
+    total = UpsertResult()
+    n_files = n_skipped = 0
+    t0 = time.perf_counter()
+    try:
+        for path in paths:
+            t_file = time.perf_counter()
+            digest = file_digest(path)
+            timings["hash"] = timings.get("hash", 0.0) + time.perf_counter() - t_file
+            hit = None if args.force else manifest_lookup(con, digest, args.table)
+            if hit is not None:
+                n_skipped += 1
+                print(f"{path}: sudah di-ingest ({hit[0]:,} baris, {hit[2]:%Y-%m-%d %H:%M}) — dilewati")
+                continue
+            try:
+                res, stats = ingest_path(con, args.table, path, args.kind, timings=timings)
+            except SchemaError as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                return 2
+            manifest_record(con, digest, args.table, res.rows, os.path.basename(path))
+            total += res
+            n_files += 1
+            dt = time.perf_counter() - t_file
+            extra = ""
+            if stats["skipped_rows"]:
+                extra += f", {stats['skipped_rows']:,} baris rusak dilewati"
+            if stats["invalid_timestamps"]:
+                extra += f", {stats['invalid_timestamps']:,} timestamp gagal parse"
+            print(f"{path}: {res.rows:,} baris ({res}{extra}) {dt:.2f}s, {res.rows / max(dt, 1e-6):,.0f} rows/s")
+    except (OSError, duckdb.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        con.close()
+
+    elapsed = time.perf_counter() - t0
+    print(
+        f"Total {args.table}: {n_files} file ({n_skipped} dilewati), {total.rows:,} baris ({total}) "
+        f"dalam {elapsed:.2f}s — {total.rows / max(elapsed, 1e-6):,.0f} rows/s"
+    )
+    print("Tahap: " + ", ".join(f"{s} {timings[s]:.2f}s" for s in STAGES if s in timings))
+    return 0
+
+
+def cmd_watch(args) -> int:
+    if not os.path.isdir(args.directory):
+        print(f"Direktori tidak ditemukan: {args.directory}", file=sys.stderr)
+        return 1
+    ensure_db(args.db)
+
+    def on_batch(path, table, res, nbytes, dt):
+        print(
+            f"{datetime.now():%H:%M:%S} {os.path.basename(path)} -> {table}: +{nbytes:,} B, "
+            f"{res.rows:,} baris ({res}) {res.rows / max(dt, 1e-6):,.0f} rows/s",
+            flush=True,
+        )
+
+    if not args.once:
+        print(f"Memantau {args.directory} tiap {args.interval:g}s (Ctrl+C untuk berhenti)", flush=True)
+    try:
+        watch_dir(
+            args.db, args.directory, table=args.table, interval=args.interval,
+            max_bytes=args.max_mb * 1024 * 1024, on_batch=on_batch, once=args.once,
+        )
+    except SchemaError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="stc_analytics", description="STC Analytics — ingest headless ke DuckDB")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="Ingest CSV/NDJSON (file, direktori, atau glob) ke satu tabel")
+    p.add_argument("--table", required=True, choices=list(TABLE_KEYS))
+    p.add_argument("paths", nargs="+", help="File, direktori, atau glob (mis. 'data/**/*.ndjson')")
+    p.add_argument("--db", default=DB_PATH, help=f"Path DuckDB (default: $EDA_DB_PATH atau {DB_PATH})")
+    p.add_argument("--kind", choices=["csv", "ndjson"], help="Paksa format; default dari ekstensi file (bench_runs/bench_tx hanya CSV)")
+    p.add_argument("--force", action="store_true", help="Proses ulang walaupun sudah tercatat di ingest_manifest")
+    p.set_defaults(func=cmd_ingest)
+
+    w = sub.add_parser("watch", help="Pantau direktori collector & ingest baris baru (append) secara berkala")
+    w.add_argument("directory")
+    w.add_argument("--table", choices=list(TABLE_KEYS), help="Paksa tabel; default dari nama file")
+    w.add_argument("--db", default=DB_PATH, help=f"Path DuckDB (default: $EDA_DB_PATH atau {DB_PATH})")
+    w.add_argument("--interval", type=float, default=2.0, help="Jeda antar putaran (detik)")
+    w.add_argument("--max-mb", type=int, default=16, help="Maks MB per file per micro-batch")
+    w.add_argument("--once", action="store_true", help="Satu putaran sampai backlog habis lalu keluar")
+    w.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except duckdb.IOException as e:
+        print(f"DB sedang dipakai proses lain (mis. app Streamlit, lihat EDA_WATCH_DIR): {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import duckdb
+import pytest
+
+# modul app (tools_*.py) ada di root repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools_db import migrate  # noqa: E402
+
+
+@pytest.fixture
+def con():
+    """DuckDB in-memory dengan schema terbaru (semua MIGRATIONS)."""
+    c = duckdb.connect()
+    migrate(c)
+    yield c
+    c.close()
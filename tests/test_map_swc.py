@@ -0,0 +1,30 @@
+"""Regresi map_swc: output harus sama persis dengan fixture dummy/swc_findings_sample_200.expected.csv."""
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from tools_ingest import COLS_SWC, SWC_TEXT_COLS, map_swc
+
+DUMMY = Path(__file__).resolve().parent.parent / "dummy"
+
+
+def read_expected(path: Path) -> pd.DataFrame:
+    d = pd.read_csv(
+        path,
+        dtype={c: "string" for c in SWC_TEXT_COLS},
+        keep_default_na=False,
+        na_values={c: [""] for c in ["timestamp", "line_start", "line_end", "confidence"]},
+    )
+    d["timestamp"] = pd.to_datetime(d["timestamp"], format="ISO8601").astype("datetime64[ns]")
+    d[["line_start", "line_end"]] = d[["line_start", "line_end"]].astype("Int64")
+    d["confidence"] = d["confidence"].astype("float64")
+    return d[COLS_SWC]
+
+
+def test_map_swc_sample_200():
+    raw = pd.read_csv(DUMMY / "swc_findings_sample_200.csv")
+    out = map_swc(raw)
+    assert out.attrs["invalid_timestamps"] == 0
+    expected = read_expected(DUMMY / "swc_findings_sample_200.expected.csv")
+    assert_frame_equal(out.reset_index(drop=True), expected)
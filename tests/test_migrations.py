@@ -0,0 +1,86 @@
+"""Jalur upgrade schema (tools_db.migrate): DB baru, DB lama sebelum schema_version, v3 -> v4, gagal = rollback."""
+import duckdb
+import pytest
+
+import tools_db
+from tools_db import MIGRATIONS, SCHEMA_VERSION, migrate, primary_key, schema_version
+
+
+def versions(con) -> list:
+    return [r[0] for r in con.execute("SELECT version FROM schema_version ORDER BY 1").fetchall()]
+
+
+@pytest.fixture
+def legacy():
+    """DB lama (sebelum schema_version): bench_tx tanpa PK, kolom belum lengkap, run_id belum dinormalisasi."""
+    c = duckdb.connect()
+    c.execute("CREATE TABLE bench_runs (run_id TEXT, p50_ms DOUBLE);")
+    c.execute("INSERT INTO bench_runs VALUES ('r1 ', 100.0);")
+    c.execute("""CREATE TABLE bench_tx (
+      run_id TEXT, tx_hash TEXT, submitted_at TIMESTAMP, mined_at TIMESTAMP, latency_ms DOUBLE, status TEXT
+    );""")
+    c.execute("""INSERT INTO bench_tx VALUES
+      ('r1', '0xa', '2024-01-01 00:00:00', '2024-01-01 00:00:01', 1000, 'success'),
+      ('r1' || chr(10), '0xa', '2024-01-01 00:00:00', '2024-01-01 00:00:02', 2000, 'success'),
+      ('r1', '0xb', '2024-01-01 00:00:00', '2024-01-01 00:00:03', NULL, 'success');""")
+    c.execute("CREATE TABLE swc_findings (finding_id TEXT, severity TEXT);")
+    c.execute("INSERT INTO swc_findings VALUES ('f1', 'Info'), ('f2', 'HIGH');")
+    yield c
+    c.close()
+
+
+def test_fresh_db_applies_all_migrations(con):
+    assert schema_version(con) == SCHEMA_VERSION
+    assert versions(con) == [v for v, _, _ in MIGRATIONS]
+
+
+def test_migrate_is_idempotent(con):
+    before = con.execute("SELECT * FROM schema_version ORDER BY 1").fetchall()
+    assert migrate(con) == SCHEMA_VERSION
+    assert con.execute("SELECT * FROM schema_version ORDER BY 1").fetchall() == before
+
+
+def test_legacy_bench_tx_gets_primary_key_with_last_duplicate_kept(legacy):
+    migrate(legacy)
+    assert primary_key(legacy, "bench_tx") == ["run_id", "tx_hash"]
+    # 'r1' dan 'r1\n' jadi key yang sama setelah normalisasi: baris terakhir yang tersisa
+    assert legacy.execute("SELECT run_id, tx_hash, latency_ms FROM bench_tx ORDER BY 2").fetchall() == [
+        ("r1", "0xa", 2000.0), ("r1", "0xb", None),
+    ]
+    assert legacy.execute("SELECT run_id FROM bench_runs").fetchall() == [("r1",)]
+    assert legacy.execute("SELECT run_id FROM bench_tx_runs").fetchall() == [("r1",)]
+
+
+def test_legacy_tables_get_missing_columns_and_severity_normalized(legacy):
+    migrate(legacy)
+    cols = [r[1] for r in legacy.execute("PRAGMA table_info('bench_runs')").fetchall()]
+    assert cols[:2] == ["run_id", "p50_ms"]
+    assert {c for c, _ in tools_db.TABLE_COLUMNS["bench_runs"]} <= set(cols)
+    assert legacy.execute("SELECT severity FROM swc_findings ORDER BY 1").fetchall() == [("high",), ("informational",)]
+
+
+def test_legacy_run_stats_use_latency_fallback(legacy):
+    migrate(legacy)
+    # 0xa: latency_ms 2000; 0xb: latency_ms NULL -> mined_at - submitted_at = 3000
+    assert legacy.execute("SELECT tx_n, lat_n, max_ms FROM bench_run_stats").fetchall() == [(2, 2, 3000.0)]
+
+
+def test_upgrade_from_v3_only_runs_pending_migration(con):
+    con.execute("INSERT INTO bench_tx (run_id, tx_hash, latency_ms) VALUES ('r1', '0xa', 5);")
+    con.execute("DELETE FROM schema_version WHERE version = 4;")
+    assert migrate(con) == 4
+    assert versions(con) == [1, 2, 3, 4]
+    assert con.execute("SELECT tx_n, p50_ms FROM bench_run_stats").fetchall() == [(1, 5.0)]
+
+
+def test_failed_migration_rolls_back_and_keeps_version(con, monkeypatch):
+    def broken(c):
+        c.execute("CREATE TABLE half_done (x INTEGER);")
+        raise RuntimeError("migrasi gagal")
+
+    monkeypatch.setattr(tools_db, "MIGRATIONS", MIGRATIONS + [(SCHEMA_VERSION + 1, "rusak", broken)])
+    monkeypatch.setattr(tools_db, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+    with pytest.raises(RuntimeError):
+        migrate(con)
+    assert schema_version(con) == SCHEMA_VERSION
+    assert not con.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'half_done'").fetchone()[0]
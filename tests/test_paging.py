@@ -0,0 +1,79 @@
+"""Pagination keyset (tools_table.fetch_page): semua halaman berurutan = satu ORDER BY penuh, tanpa dobel/lompat."""
+import duckdb
+import pytest
+
+from tools_table import fetch_page
+
+
+@pytest.fixture
+def db():
+    c = duckdb.connect()
+    # v: nilai kembar + NULL (urut per key), ts: timestamp untuk cursor datetime
+    c.execute("CREATE TABLE t (id TEXT, grp TEXT, v DOUBLE, ts TIMESTAMP);")
+    c.execute("""
+        INSERT INTO t
+        SELECT printf('id%02d', i), CASE WHEN i % 2 = 0 THEN 'a' ELSE 'b' END,
+               CASE WHEN i % 5 = 0 THEN NULL ELSE (i % 3)::DOUBLE END,
+               TIMESTAMP '2024-01-01' + to_hours(i % 4)
+        FROM range(23) r(i);
+    """)
+    yield c
+    c.close()
+
+
+def walk(con, page_size: int, order: str = "v", key_cols=("id",), desc: bool = False,
+         where: str = "", params=(), source: str = "t") -> list:
+    pages, after = [], None
+    while True:
+        df, after = fetch_page(con, source, where, list(params), order, list(key_cols), page_size, after, desc)
+        pages.append([tuple(r) for r in df[list(key_cols)].itertuples(index=False)])
+        if after is None:
+            return pages
+
+
+def expected(con, order: str = "v", key_cols=("id",), desc: bool = False, where: str = "", params=()) -> list:
+    d = "DESC" if desc else "ASC"
+    keys = ", ".join(key_cols)
+    by = ", ".join([f"{order} {d} NULLS LAST"] + [f"{k} {d}" for k in key_cols])
+    return con.execute(f"SELECT {keys} FROM t {where} ORDER BY {by}", list(params)).fetchall()
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("page_size", [1, 4, 5, 22, 23, 100])
+def test_pages_concatenate_to_full_order(db, page_size, desc):
+    pages = walk(db, page_size, desc=desc)
+    assert [k for p in pages for k in p] == expected(db, desc=desc)
+    assert all(len(p) == page_size for p in pages[:-1])
+
+
+def test_exact_multiple_has_no_trailing_empty_page(db):
+    pages = walk(db, 23)
+    assert [len(p) for p in pages] == [23]
+
+
+def test_page_boundary_inside_null_block(db):
+    # 5 baris v NULL di akhir; halaman 20 berhenti di tengah blok NULL
+    pages = walk(db, 20)
+    assert [len(p) for p in pages] == [20, 3]
+    assert [k for p in pages for k in p] == expected(db)
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_timestamp_sort_with_ties(db, desc):
+    pages = walk(db, 3, order="ts", desc=desc)
+    assert [k for p in pages for k in p] == expected(db, order="ts", desc=desc)
+
+
+def test_composite_key_tiebreak(db):
+    pages = walk(db, 4, order="v", key_cols=("grp", "id"))
+    assert [k for p in pages for k in p] == expected(db, order="v", key_cols=("grp", "id"))
+
+
+def test_where_params_combined_with_cursor(db):
+    where, params = "WHERE grp = ?", ["a"]
+    pages = walk(db, 2, where=where, params=params)
+    assert [k for p in pages for k in p] == expected(db, where=where, params=params)
+
+
+def test_empty_result_is_single_empty_page(db):
+    assert walk(db, 10, where="WHERE id = ?", params=["tidak-ada"]) == [[]]
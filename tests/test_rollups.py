@@ -0,0 +1,88 @@
+"""Rollup dashboard (tools_rollup) harus selalu sama dengan agregat ulang dari tabel fakta setelah upsert."""
+import pandas as pd
+import pytest
+
+from tools_db import TABLE_COLUMNS, TABLE_KEYS, clear_all
+from tools_ingest import upsert_df
+from tools_rollup import BENCH_DAILY, ROLLUPS, SWC_DAILY, VISION_DAILY, VISION_HOURLY
+
+
+def rows(table: str, *records) -> pd.DataFrame:
+    cols = [c for c, _ in TABLE_COLUMNS[table]]
+    d = pd.DataFrame([{c: r.get(c) for c in cols} for r in records], columns=cols)
+    for c, t in TABLE_COLUMNS[table]:
+        if t == "TIMESTAMP":
+            d[c] = pd.to_datetime(d[c])
+    return d
+
+
+def cost(id_, ts, network="eth", fn="mint", idr=100.0, **kw):
+    return dict(id=id_, timestamp=ts, network=network, contract="C1", function_name=fn,
+                cost_idr=idr, cost_eth=0.001, gas_used=21000, **kw)
+
+
+def upsert(con, table: str, *records):
+    return upsert_df(con, table, rows(table, *records), TABLE_KEYS[table], [c for c, _ in TABLE_COLUMNS[table]])
+
+
+def assert_rollup_matches_facts(con, rollup):
+    cols = ", ".join(rollup.columns)
+    stored = con.execute(f"SELECT {cols} FROM {rollup.name} ORDER BY ALL").fetchall()
+    fresh = con.execute(f"SELECT {cols} FROM ({rollup.select()}) ORDER BY ALL").fetchall()
+    assert stored == fresh
+
+
+@pytest.fixture
+def vision(con):
+    upsert(con, "vision_costs",
+           cost("a", "2024-01-01 10:15"), cost("b", "2024-01-01 10:45", idr=300.0),
+           cost("c", "2024-01-02 08:00", network="arb"), cost("d", "2024-01-02 08:30", fn=None, idr=None))
+    return con
+
+
+@pytest.mark.parametrize("rollup", [VISION_DAILY, VISION_HOURLY], ids=lambda r: r.name)
+def test_vision_rollups_match_after_insert(vision, rollup):
+    assert_rollup_matches_facts(vision, rollup)
+
+
+@pytest.mark.parametrize("rollup", [VISION_DAILY, VISION_HOURLY], ids=lambda r: r.name)
+def test_vision_rollups_match_after_row_moves_group(vision, rollup):
+    # network & hari berubah: grup lama harus ikut dihitung ulang (bukan hanya grup baru)
+    upsert(vision, "vision_costs", cost("b", "2024-01-03 09:00", network="arb", idr=50.0))
+    assert_rollup_matches_facts(vision, rollup)
+
+
+def test_hourly_max_recomputed_when_max_row_lowered(vision):
+    upsert(vision, "vision_costs", cost("b", "2024-01-01 10:45", idr=10.0))
+    assert_rollup_matches_facts(vision, VISION_HOURLY)
+    row = vision.execute(f"""
+        SELECT cost_max, ts_cost_max FROM {VISION_HOURLY.name}
+        WHERE timestamp = '2024-01-01 10:00' AND network = 'eth'
+    """).fetchone()
+    assert row == (100.0, pd.Timestamp("2024-01-01 10:15"))
+
+
+def test_daily_totals_equal_fact_table_totals(vision):
+    assert vision.execute(f"SELECT SUM(n), SUM(cost_idr) FROM {VISION_DAILY.name}").fetchone() == \
+        vision.execute("SELECT COUNT(*), SUM(COALESCE(cost_idr, 0)) FROM vision_costs").fetchone()
+
+
+def test_swc_and_bench_rollups_match(con):
+    upsert(con, "swc_findings",
+           dict(finding_id="f1", timestamp="2024-01-01", network="eth", severity="high", swc_id="SWC-107"),
+           dict(finding_id="f2", timestamp="2024-01-01", network="eth", severity="low", swc_id="SWC-101"))
+    upsert(con, "swc_findings", dict(finding_id="f2", timestamp="2024-01-02", network="eth", severity="high",
+                                     swc_id="SWC-107"))
+    upsert(con, "bench_runs",
+           dict(run_id="r1", timestamp="2024-01-01", network="eth", scenario="s", function_name="mint",
+                tps_peak=10.0, p95_ms=90.0, success_rate=0.9),
+           dict(run_id="r2", timestamp="2024-01-01", network="eth", scenario="s", function_name="mint",
+                tps_peak=12.0, p95_ms=None, success_rate=1.0))
+    assert_rollup_matches_facts(con, SWC_DAILY)
+    assert_rollup_matches_facts(con, BENCH_DAILY)
+
+
+def test_clear_all_empties_rollups(vision):
+    clear_all(vision)
+    for rollup in (r for rs in ROLLUPS.values() for r in rs):
+        assert vision.execute(f"SELECT COUNT(*) FROM {rollup.name}").fetchone()[0] == 0
@@ -0,0 +1,71 @@
+"""Engine upsert transaksional (tools_ingest.upsert_source): jalur INSERT OR REPLACE vs DELETE+INSERT & hitungan."""
+import pandas as pd
+import pytest
+
+from tools_ingest import UpsertResult, transaction, upsert_df, upsert_source
+
+RUN_COLS = ["run_id", "tps_avg", "p50_ms", "p95_ms"]
+
+
+def runs(*rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=RUN_COLS)
+
+
+def generation(con, table: str) -> int:
+    row = con.execute("SELECT gen FROM table_generation WHERE table_name = ?", [table]).fetchone()
+    return row[0] if row else 0
+
+
+def test_insert_counts_new_rows(con):
+    res = upsert_df(con, "bench_runs", runs(("r1", 10.0, 5.0, 9.0), ("r2", 20.0, 6.0, 8.0)), ["run_id"], RUN_COLS)
+    assert res == UpsertResult(inserted=2, updated=0, unchanged=0)
+    assert con.execute("SELECT COUNT(*) FROM bench_runs").fetchone()[0] == 2
+
+
+def test_identical_rows_are_unchanged_and_not_written(con):
+    d = runs(("r1", 10.0, 5.0, 9.0))
+    upsert_df(con, "bench_runs", d, ["run_id"], RUN_COLS)
+    gen = generation(con, "bench_runs")
+    res = upsert_df(con, "bench_runs", d, ["run_id"], RUN_COLS)
+    assert res == UpsertResult(inserted=0, updated=0, unchanged=1)
+    assert generation(con, "bench_runs") == gen
+
+
+def test_primary_key_path_replaces_changed_row(con):
+    upsert_df(con, "bench_runs", runs(("r1", 10.0, 5.0, 9.0), ("r2", 20.0, 6.0, 8.0)), ["run_id"], RUN_COLS)
+    res = upsert_df(con, "bench_runs", runs(("r1", 11.0, 5.0, 9.0), ("r2", 20.0, 6.0, 8.0)), ["run_id"], RUN_COLS)
+    assert res == UpsertResult(inserted=0, updated=1, unchanged=1)
+    assert con.execute("SELECT run_id, tps_avg FROM bench_runs ORDER BY 1").fetchall() == [("r1", 11.0), ("r2", 20.0)]
+
+
+def test_non_primary_key_path_deletes_then_inserts(con):
+    # tabel tanpa PRIMARY KEY -> DELETE baris lama per key lalu INSERT
+    con.execute("CREATE TABLE kv (k TEXT, v INTEGER);")
+    con.execute("INSERT INTO kv VALUES ('a', 1), ('b', 2);")
+    con.register("src", pd.DataFrame({"k": ["a", "c"], "v": [10, 3]}))
+    res = upsert_source(con, "kv", "src", ["k"], ["k", "v"])
+    assert res == UpsertResult(inserted=1, updated=1, unchanged=0)
+    assert con.execute("SELECT k, v FROM kv ORDER BY k").fetchall() == [("a", 10), ("b", 2), ("c", 3)]
+
+
+def test_dedup_keeps_last_row_per_key(con):
+    con.execute("CREATE TEMP TABLE stg AS SELECT * FROM (VALUES ('r1', 1.0), ('r1', 2.0)) t(run_id, tps_avg);")
+    res = upsert_source(con, "bench_runs", "stg", ["run_id"], ["run_id", "tps_avg"], dedup=True)
+    assert res == UpsertResult(inserted=1, updated=0, unchanged=0)
+    assert con.execute("SELECT tps_avg FROM bench_runs").fetchall() == [(2.0,)]
+
+
+def test_failing_after_sql_rolls_back_upsert(con):
+    with pytest.raises(Exception):
+        upsert_df(con, "bench_runs", runs(("r1", 10.0, 5.0, 9.0)), ["run_id"], RUN_COLS,
+                  after=["SELECT * FROM tabel_tidak_ada;"])
+    assert con.execute("SELECT COUNT(*) FROM bench_runs").fetchone()[0] == 0
+
+
+def test_batches_in_outer_transaction_commit_together(con):
+    with pytest.raises(RuntimeError):
+        with transaction(con):
+            upsert_df(con, "bench_runs", runs(("r1", 10.0, 5.0, 9.0)), ["run_id"], RUN_COLS, begin=False)
+            upsert_df(con, "bench_runs", runs(("r2", 20.0, 6.0, 8.0)), ["run_id"], RUN_COLS, begin=False)
+            raise RuntimeError("batch gagal")
+    assert con.execute("SELECT COUNT(*) FROM bench_runs").fetchone()[0] == 0
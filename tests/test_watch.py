@@ -0,0 +1,102 @@
+"""Watch-folder (tools_watch): ingest hanya baris baru sejak offset tersimpan, lanjut setelah restart."""
+import json
+
+import duckdb
+
+from tools_db import clear_all, migrate
+from tools_watch import ingest_appended, table_for_file
+
+RUNS_HEADER = "run_id,tps_avg,p50_ms,p95_ms\n"
+
+
+def run_line(i: int) -> str:
+    return f"r{i},{i}.0,10,20\n"
+
+
+def append(path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def offset(con, path) -> int:
+    return con.execute("SELECT byte_offset FROM ingest_offsets WHERE path = ?", [str(path)]).fetchone()[0]
+
+
+def count(con, table: str) -> int:
+    return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_only_appended_lines_are_ingested(con, tmp_path):
+    path = tmp_path / "bench_runs_node1.csv"
+    path.write_text(RUNS_HEADER + run_line(1) + run_line(2))
+    res, _, _ = ingest_appended(con, str(path), "bench_runs")
+    assert res.inserted == 2
+    append(path, run_line(3))
+    res, nbytes, more = ingest_appended(con, str(path), "bench_runs")
+    # header diingat: potongan baru (tanpa header) tetap di-parse
+    assert (res.inserted, res.unchanged, nbytes, more) == (1, 0, len(run_line(3)), False)
+    assert count(con, "bench_runs") == 3
+
+
+def test_incomplete_last_line_waits_for_newline(con, tmp_path):
+    path = tmp_path / "vision_costs.ndjson"
+    path.write_text(json.dumps({"id": "a", "cost_idr": 1}) + "\n" + '{"id": "b", "cost')
+    res, _, _ = ingest_appended(con, str(path), "vision_costs")
+    assert res.inserted == 1
+    assert offset(con, path) == path.read_text().index("\n") + 1
+    append(path, '_idr": 2}\n')
+    res, _, _ = ingest_appended(con, str(path), "vision_costs")
+    assert res.inserted == 1
+    assert offset(con, path) == path.stat().st_size
+
+
+def test_restart_resumes_from_stored_offset(tmp_path):
+    db = str(tmp_path / "w.duckdb")
+    path = tmp_path / "bench_runs.csv"
+    path.write_text(RUNS_HEADER + run_line(1))
+    with duckdb.connect(db) as c:
+        migrate(c)
+        ingest_appended(c, str(path), "bench_runs")
+    append(path, run_line(2))
+    # proses baru (koneksi baru): hanya r2 yang diproses
+    with duckdb.connect(db) as c:
+        res, nbytes, _ = ingest_appended(c, str(path), "bench_runs")
+        assert (res.rows, nbytes) == (1, len(run_line(2)))
+        assert ingest_appended(c, str(path), "bench_runs")[1] == 0
+
+
+def test_truncated_file_starts_over(con, tmp_path):
+    path = tmp_path / "bench_runs.csv"
+    path.write_text(RUNS_HEADER + run_line(1) + run_line(2))
+    ingest_appended(con, str(path), "bench_runs")
+    path.write_text(RUNS_HEADER + run_line(9))
+    res, _, _ = ingest_appended(con, str(path), "bench_runs")
+    assert res.inserted == 1
+    assert offset(con, path) == path.stat().st_size
+
+
+def test_max_bytes_splits_backlog_into_micro_batches(con, tmp_path):
+    path = tmp_path / "bench_runs.csv"
+    path.write_text(RUNS_HEADER + "".join(run_line(i) for i in range(10)))
+    res, _, more = ingest_appended(con, str(path), "bench_runs", max_bytes=len(run_line(0)) * 3)
+    assert (res.rows, more) == (3, True)
+    while more:
+        _, _, more = ingest_appended(con, str(path), "bench_runs", max_bytes=len(run_line(0)) * 3)
+    assert count(con, "bench_runs") == 10
+
+
+def test_clear_all_keeps_offsets(con, tmp_path):
+    path = tmp_path / "bench_runs.csv"
+    path.write_text(RUNS_HEADER + run_line(1))
+    ingest_appended(con, str(path), "bench_runs")
+    clear_all(con)
+    res, nbytes, _ = ingest_appended(con, str(path), "bench_runs")
+    assert (res.rows, nbytes, count(con, "bench_runs")) == (0, 0, 0)
+
+
+def test_table_for_file_routes_by_name():
+    assert table_for_file("/in/bench_tx_node1.csv") == "bench_tx"
+    assert table_for_file("/in/swc_findings.ndjson") == "swc_findings"
+    # tabel bench hanya CSV
+    assert table_for_file("/in/bench_runs.ndjson") is None
+    assert table_for_file("/in/notes.txt") is None
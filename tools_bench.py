@@ -1,18 +1,104 @@
 import streamlit as st
 
+from tools_db import and_where, date_range_conds, run_id_match_count, where_sql
+from tools_latency import RUN_HIST, RUN_STATS, RUN_TPS
+from tools_rollup import BENCH_DAILY, rollup_ok
+
+# bench_runs untuk tabel detail: network kosong tampil "(Unknown)" (sama dengan filter halaman)
+BENCH_RUNS_VIEW = "(SELECT * REPLACE (COALESCE(network, '(Unknown)') AS network) FROM bench_runs) r"
+NET_SQL = "COALESCE(network, '(Unknown)')"
+
+
+def bench_runs_where(date_range=None, network: str = None, scenario: str = None, fn: str = None) -> tuple:
+    """(klausa WHERE, params) filter halaman Bench (bench_runs, BENCH_RUNS_VIEW atau rollup); None = semua."""
+    conds, params = date_range_conds(date_range)
+    for col, val in ((NET_SQL, network), ("scenario", scenario), ("function_name", fn)):
+        if val is not None:
+            conds.append(f"{col} = ?")
+            params.append(val)
+    return where_sql(conds), params
+
+
+def bench_overview(con) -> dict:
+    """Jumlah run, rentang waktu & opsi filter dari rollup bench_runs_daily."""
+    rows, ts_min, ts_max = con.execute(
+        f"SELECT COALESCE(SUM(n), 0), MIN(ts_min), MAX(ts_max) FROM {BENCH_DAILY.name}"
+    ).fetchone()
+    opts = {
+        key: [r[0] for r in con.execute(
+            f"SELECT DISTINCT {expr} FROM {BENCH_DAILY.name} WHERE {expr} IS NOT NULL ORDER BY 1"
+        ).fetchall()]
+        for key, expr in (("networks", NET_SQL), ("scenarios", "scenario"), ("functions", "function_name"))
+    }
+    return {"rows": rows, "ts_min": ts_min, "ts_max": ts_max, **opts}
+
+
+def bench_metrics(con, where: str, params: list) -> tuple:
+    """(jumlah run, TPS peak maks, rata-rata p95, rata-rata success rate [kosong = 0]) untuk filter `where`."""
+    if rollup_ok(BENCH_DAILY, where, params):
+        sql = f"""
+            SELECT COALESCE(SUM(n), 0), MAX(tps_peak_max), SUM(p95_sum) / NULLIF(SUM(p95_n), 0),
+                   SUM(succ_sum) / NULLIF(SUM(n), 0)
+            FROM {BENCH_DAILY.name} {where}
+        """
+    else:
+        sql = f"""
+            SELECT COUNT(*), MAX(tps_peak), AVG(p95_ms), AVG(COALESCE(success_rate, 0))
+            FROM bench_runs {where}
+        """
+    n, tps_peak, p95, succ = con.execute(sql, params).fetchone()
+    nan = float("nan")
+    return n, nan if tps_peak is None else tps_peak, nan if p95 is None else p95, succ or 0.0
+
+
+def bench_rows_sql(where: str = "") -> str:
+    return f"SELECT * FROM {BENCH_RUNS_VIEW} {where} ORDER BY timestamp DESC"
+
+
+def bench_rows(con, where: str = "", params: list = ()):
+    return con.execute(bench_rows_sql(where), list(params)).df()
+
+
+# -------------------------------
+# Metrik per run dari bench_tx (tabel materialisasi tools_latency)
+# -------------------------------
+def run_stats_where(where: str, params: list) -> tuple:
+    """Filter halaman (bench_runs) -> (WHERE, params) untuk tabel metrik per run."""
+    return and_where("", f"run_id IN (SELECT run_id FROM bench_runs {where})"), list(params)
+
+
+def run_stats_ids(con, where: str, params: list) -> list:
+    sql_where, sql_params = run_stats_where(where, params)
+    return [r[0] for r in con.execute(
+        f"SELECT run_id FROM {RUN_STATS} {sql_where} ORDER BY run_id", sql_params
+    ).fetchall()]
+
+
+def run_stats(con, run_id: str) -> dict:
+    df = con.execute(f"SELECT * FROM {RUN_STATS} WHERE run_id = ?", [run_id]).df()
+    return {} if df.empty else df.iloc[0].to_dict()
+
+
+def run_latency_hist(con, run_id: str):
+    return con.execute(
+        f"SELECT bin_lo_ms, bin_hi_ms, (bin_lo_ms + bin_hi_ms) / 2 AS bin_mid_ms, n FROM {RUN_HIST} "
+        "WHERE run_id = ? ORDER BY bin", [run_id],
+    ).df()
+
+
+def run_tps_timeline(con, run_id: str):
+    return con.execute(
+        f"SELECT second, mined, tps_window FROM {RUN_TPS} WHERE run_id = ? ORDER BY second", [run_id]
+    ).df()
+
+
 def render_bench_validation_db(get_conn_fn):
     con = get_conn_fn()
 
     # --- hitung dari TABEL (setelah insert) ---
     rows_runs = con.execute("SELECT COUNT(*) FROM bench_runs").fetchone()[0]
     rows_tx   = con.execute("SELECT COUNT(*) FROM bench_tx"  ).fetchone()[0]
-    match_cnt = con.execute("""
-        SELECT COUNT(*) FROM (
-            SELECT DISTINCT r.run_id
-            FROM bench_runs r
-            JOIN bench_tx   t ON r.run_id = t.run_id
-        )
-    """).fetchone()[0]
+    match_cnt = run_id_match_count(con)
 
     # --- tampilkan metrik (selaras dengan atas) ---
     c1, c2, c3 = st.columns(3)
@@ -40,5 +126,3 @@ def render_bench_validation_db(get_conn_fn):
         st.error(f"Kolom wajib hilang di bench_runs.csv: {missing_runs}")
     if missing_tx:
         st.error(f"Kolom wajib hilang di bench_tx.csv: {missing_tx}")
-
-    con.close()
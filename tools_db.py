@@ -0,0 +1,506 @@
+"""
+Schema & helper DuckDB STC Analytics tanpa Streamlit — dipakai app dan CLI (stc_analytics.py).
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import duckdb
+
+from tools_latency import RUN_STATS_SYNC_SQL, RUN_STATS_TABLES, ensure_run_stats, run_stats_sql
+from tools_rollup import ROLLUPS, ROLLUP_TABLES, ensure_rollups
+
+DB_PATH = os.getenv("EDA_DB_PATH", "stc_analytics.duckdb")
+
+DATA_TABLES = ["vision_costs","swc_findings","bench_runs","bench_tx"]
+AUX_TABLES = ["ingest_manifest","bench_tx_runs","ingest_offsets"] + RUN_STATS_TABLES
+
+# key upsert per tabel
+TABLE_KEYS = {
+    "vision_costs": ["id"],
+    "swc_findings": ["finding_id"],
+    "bench_runs": ["run_id"],
+    "bench_tx": ["run_id", "tx_hash"],
+}
+
+# Kolom per tabel data (urutan = urutan kolom tabel baru). Kolom baru selalu ditambah di akhir,
+# lalu buat migrasi add_columns(...) di MIGRATIONS supaya DB lama ikut tanpa reload data.
+TABLE_COLUMNS = {
+    "vision_costs": [
+        ("id", "TEXT"), ("project", "TEXT"), ("network", "TEXT"), ("timestamp", "TIMESTAMP"),
+        ("tx_hash", "TEXT"), ("contract", "TEXT"), ("function_name", "TEXT"), ("block_number", "BIGINT"),
+        ("gas_used", "BIGINT"), ("gas_price_wei", "BIGINT"), ("cost_eth", "DOUBLE"), ("cost_idr", "DOUBLE"),
+        ("meta_json", "TEXT"),
+    ],
+    "swc_findings": [
+        ("finding_id", "TEXT"), ("timestamp", "TIMESTAMP"), ("network", "TEXT"), ("contract", "TEXT"),
+        ("file", "TEXT"), ("line_start", "BIGINT"), ("line_end", "BIGINT"), ("swc_id", "TEXT"),
+        ("title", "TEXT"), ("severity", "TEXT"), ("confidence", "DOUBLE"), ("status", "TEXT"),
+        ("remediation", "TEXT"), ("commit_hash", "TEXT"),
+    ],
+    "bench_runs": [
+        ("run_id", "TEXT"), ("timestamp", "TIMESTAMP"), ("network", "TEXT"), ("scenario", "TEXT"),
+        ("contract", "TEXT"), ("function_name", "TEXT"), ("concurrency", "BIGINT"), ("tx_per_user", "BIGINT"),
+        ("tps_avg", "DOUBLE"), ("tps_peak", "DOUBLE"), ("p50_ms", "DOUBLE"), ("p95_ms", "DOUBLE"),
+        ("success_rate", "DOUBLE"),
+    ],
+    "bench_tx": [
+        ("run_id", "TEXT"), ("tx_hash", "TEXT"), ("submitted_at", "TIMESTAMP"), ("mined_at", "TIMESTAMP"),
+        ("latency_ms", "DOUBLE"), ("status", "TEXT"), ("gas_used", "BIGINT"), ("gas_price_wei", "TEXT"),
+        ("block_number", "BIGINT"), ("function_name", "TEXT"),
+    ],
+}
+
+
+def table_ddl(table: str, name: str = None) -> str:
+    """CREATE TABLE tabel data dari TABLE_COLUMNS + PK TABLE_KEYS (name: nama lain, mis. tabel sementara)."""
+    cols = [f"{c} {t}" for c, t in TABLE_COLUMNS[table]]
+    cols.append(f"PRIMARY KEY ({', '.join(TABLE_KEYS[table])})")
+    return f"CREATE TABLE {name or table} ({', '.join(cols)});"
+
+
+# normalisasi run_id (trim + newline/tab jadi spasi), sama dengan tools_ingest.normalize_run_id
+RUN_ID_NORM_SQL = "trim(translate({col}, chr(10) || chr(13) || chr(9), '   '))"
+
+# bench_tx_runs: run_id unik di bench_tx, diisi saat ingest (tidak perlu scan bench_tx)
+TX_RUNS_SYNC_SQL = """
+    INSERT OR IGNORE INTO bench_tx_runs
+    SELECT DISTINCT run_id FROM upsert_delta WHERE _is_new;
+"""
+
+# generation per tabel untuk cache query (lihat QueryCache); tabel turunan ikut tabel induknya
+CACHE_TABLES = {
+    "vision_costs": "vision_costs",
+    "swc_findings": "swc_findings",
+    "bench_runs": "bench_runs",
+    "bench_tx": "bench_tx",
+    "bench_tx_runs": "bench_tx",
+    **{t: "bench_tx" for t in RUN_STATS_TABLES},
+    **{r.name: base for base, rs in ROLLUPS.items() for r in rs},
+}
+QUERY_CACHE_MB = int(os.getenv("EDA_QUERY_CACHE_MB", "256"))
+
+# SQL turunan yang dijalankan di transaksi upsert (lihat tools_ingest.upsert_source)
+TABLE_AFTER = {
+    "bench_tx": [TX_RUNS_SYNC_SQL, *RUN_STATS_SYNC_SQL],
+}
+
+
+def date_range_conds(date_range, col: str = "timestamp") -> tuple:
+    """Filter tanggal halaman -> ([kondisi], [params]); date_range (start, end) date, end inklusif."""
+    conds, params = [], []
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start, end = date_range
+        if start:
+            conds.append(f"{col} >= ?")
+            params.append(datetime.combine(start, datetime.min.time()))
+        if end:
+            conds.append(f"{col} < ?")
+            params.append(datetime.combine(end, datetime.min.time()) + timedelta(days=1))
+    return conds, params
+
+
+def where_sql(conds: list) -> str:
+    return ("WHERE " + " AND ".join(conds)) if conds else ""
+
+
+def and_where(where: str, cond: str) -> str:
+    return f"{where} AND {cond}" if where else f"WHERE {cond}"
+
+
+def primary_key(con, table: str) -> list:
+    row = con.execute(
+        "SELECT constraint_column_names FROM duckdb_constraints() "
+        "WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'",
+        [table],
+    ).fetchone()
+    return list(row[0]) if row else []
+
+
+def migrate_bench_tx_pk(con):
+    """
+    bench_tx lama (tanpa key): bangun ulang dengan PK (run_id, tx_hash), duplikat dibuang (ambil
+    terakhir). Dipanggil di dalam transaksi migrasi (lihat migrate).
+    """
+    con.execute(table_ddl("bench_tx", "bench_tx_pk"))
+    con.execute("""
+        INSERT INTO bench_tx_pk
+        SELECT COALESCE(run_id, '') AS run_id, COALESCE(tx_hash, '') AS tx_hash,
+               submitted_at, mined_at, latency_ms, status, gas_used, gas_price_wei,
+               block_number, function_name
+        FROM bench_tx
+        QUALIFY row_number() OVER (
+            PARTITION BY COALESCE(run_id, ''), COALESCE(tx_hash, '') ORDER BY rowid DESC
+        ) = 1
+        ORDER BY run_id, tx_hash;
+    """)
+    con.execute("DROP TABLE bench_tx;")
+    con.execute("ALTER TABLE bench_tx_pk RENAME TO bench_tx;")
+
+
+def normalize_run_ids(con, table: str) -> None:
+    """
+    run_id lama: trim + newline/tab jadi spasi (sama dengan ingest). Baris yang key-nya jadi sama
+    setelah normalisasi (mis. 'r1' dan 'r1 ') dibuang kecuali yang terakhir, supaya PK tidak bentrok.
+    """
+    norm = RUN_ID_NORM_SQL.format(col="run_id")
+    part = ", ".join(norm if k == "run_id" else f"COALESCE({k}, '')" for k in TABLE_KEYS[table])
+    con.execute(f"""
+        DELETE FROM {table} WHERE rowid IN (
+            SELECT rowid FROM {table} WHERE run_id IS NOT NULL
+            QUALIFY row_number() OVER (PARTITION BY {part} ORDER BY rowid DESC) > 1
+        );
+    """)
+    con.execute(f"UPDATE {table} SET run_id = {norm} WHERE run_id <> {norm};")
+
+
+def add_columns(con, table: str, columns: list) -> None:
+    """Perubahan schema aditif di tempat: ALTER TABLE ADD COLUMN untuk [(kolom, tipe)] yang belum ada."""
+    for col, typ in columns:
+        con.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {typ};")
+
+
+# -------------------------------
+# Migrasi schema (berurutan, versi tercatat di schema_version)
+# -------------------------------
+def _m1_base(con):
+    """Schema dasar. Idempotent, jadi DB lama (sebelum schema_version) ikut di-upgrade di tempat."""
+    for table, columns in TABLE_COLUMNS.items():
+        con.execute(table_ddl(table).replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+        # DB lama yang kolomnya belum lengkap
+        add_columns(con, table, columns)
+    # severity dari ingest lama: huruf kecil + alias (sama dengan tools_ingest.map_swc)
+    con.execute("""
+        UPDATE swc_findings SET severity = CASE lower(severity)
+            WHEN 'info' THEN 'informational' WHEN 'informative' THEN 'informational'
+            ELSE lower(severity) END
+        WHERE severity <> lower(severity) OR severity IN ('info', 'informative');
+    """)
+    # run_id unik di bench_tx (untuk hitung run_id match tanpa scan bench_tx)
+    has_tx_runs = con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'bench_tx_runs'"
+    ).fetchone()[0]
+    if not has_tx_runs:
+        # DB lama: normalisasi run_id sekali saja, sebelum bench_tx diberi PK
+        for t in ("bench_runs", "bench_tx"):
+            normalize_run_ids(con, t)
+    if not primary_key(con, "bench_tx"):
+        migrate_bench_tx_pk(con)
+    # akses per run (drilldown, dedup per run)
+    con.execute("CREATE INDEX IF NOT EXISTS idx_bench_tx_run ON bench_tx (run_id);")
+    if not has_tx_runs:
+        con.execute("CREATE TABLE bench_tx_runs (run_id TEXT PRIMARY KEY);")
+        con.execute("INSERT INTO bench_tx_runs SELECT DISTINCT run_id FROM bench_tx WHERE run_id IS NOT NULL;")
+    # manifest upload: file yang sama (hash isi) tidak di-ingest ulang tiap rerun
+    con.execute("""CREATE TABLE IF NOT EXISTS ingest_manifest (
+      content_hash TEXT, table_name TEXT, row_count BIGINT,
+      file_name TEXT, ingested_at TIMESTAMP,
+      PRIMARY KEY (content_hash, table_name)
+    );""")
+    # watch-folder: offset byte per file (lihat tools_watch)
+    con.execute("""CREATE TABLE IF NOT EXISTS ingest_offsets (
+      path TEXT PRIMARY KEY, table_name TEXT, file_id TEXT, byte_offset BIGINT,
+      header TEXT, row_count BIGINT, updated_at TIMESTAMP
+    );""")
+    # generation tabel data: naik tiap ingest/clear/reset -> invalidasi QueryCache
+    con.execute("CREATE TABLE IF NOT EXISTS table_generation (table_name TEXT PRIMARY KEY, gen BIGINT);")
+
+
+def _m2_rollups(con):
+    """Rollup dashboard (lihat tools_rollup), diisi penuh sekali dari tabel fakta."""
+    ensure_rollups(con)
+
+
+def _m3_run_stats(con):
+    """Metrik latency/TPS per run dari bench_tx (lihat tools_latency), diisi penuh sekali."""
+    ensure_run_stats(con)
+
+
+def _m4_run_stats_latency(con):
+    """Hitung ulang metrik per run dengan fallback mined_at - submitted_at untuk latency_ms NULL."""
+    for sql in run_stats_sql("SELECT DISTINCT run_id FROM bench_tx"):
+        con.execute(sql)
+
+
+# (versi, nama, fungsi) — hanya boleh ditambah di akhir; migrasi yang sudah rilis jangan diubah
+MIGRATIONS = [
+    (1, "schema dasar", _m1_base),
+    (2, "rollup dashboard", _m2_rollups),
+    (3, "metrik latency per run", _m3_run_stats),
+    (4, "metrik latency: fallback latency_ms NULL", _m4_run_stats_latency),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# db_path -> versi schema yang sudah dipastikan di proses ini (ensure_db tanpa koneksi)
+_schema_ready = {}
+_schema_lock = threading.Lock()
+
+
+def schema_version(con) -> int:
+    has = con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'schema_version'"
+    ).fetchone()[0]
+    if not has:
+        return 0
+    return con.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(con) -> int:
+    """
+    Jalankan migrasi yang belum tercatat di schema_version secara berurutan, masing-masing dalam
+    transaksinya sendiri (gagal -> rollback, versi tidak maju). Return versi akhir.
+    """
+    current = schema_version(con)
+    if current >= SCHEMA_VERSION:
+        return current
+    con.execute("""CREATE TABLE IF NOT EXISTS schema_version (
+      version INTEGER PRIMARY KEY, name TEXT, applied_at TIMESTAMP
+    );""")
+    for version, name, fn in MIGRATIONS:
+        if version <= current:
+            continue
+        con.execute("BEGIN TRANSACTION;")
+        try:
+            fn(con)
+            con.execute("INSERT INTO schema_version VALUES (?, ?, now()::TIMESTAMP)", [version, name])
+            con.execute("COMMIT;")
+        except Exception:
+            con.execute("ROLLBACK;")
+            raise
+        current = version
+    return current
+
+
+def ensure_db(db_path: str = DB_PATH, con=None) -> int:
+    """
+    Pastikan schema terbaru (migrate), return versinya. con: pakai koneksi yang sudah ada (mis.
+    writer ConnectionManager) dan selalu dicek; tanpa con hasilnya di-cache per db_path untuk proses ini.
+    """
+    key = os.path.abspath(db_path)
+    if con is not None:
+        _schema_ready.pop(key, None)
+        return migrate(con)
+    with _schema_lock:
+        if key not in _schema_ready:
+            con = duckdb.connect(db_path)
+            try:
+                _schema_ready[key] = migrate(con)
+            finally:
+                con.close()
+        return _schema_ready[key]
+
+
+def drop_all(db_path: str = DB_PATH, con=None):
+    own = con is None
+    if own:
+        con = duckdb.connect(db_path)
+    for t in DATA_TABLES + AUX_TABLES + ROLLUP_TABLES + ["schema_version"]:
+        con.execute(f"DROP TABLE IF EXISTS {t};")
+    _schema_ready.pop(os.path.abspath(db_path), None)
+    if own:
+        con.close()
+
+
+def clear_all(con) -> None:
+    """
+    Kosongkan data. ingest_offsets dibiarkan: watch-folder melanjutkan dari offset terakhir,
+    bukan meng-ingest ulang isi file yang baru saja dihapus.
+    """
+    for t in DATA_TABLES + AUX_TABLES + ROLLUP_TABLES:
+        if t != "ingest_offsets":
+            con.execute(f"DELETE FROM {t};")
+    bump_generation(con, DATA_TABLES)
+
+
+def bump_generation(con, tables) -> None:
+    """Naikkan generation tabel (panggil di transaksi/koneksi yang sama dengan perubahan datanya)."""
+    for t in tables:
+        con.execute(
+            "INSERT INTO table_generation VALUES (?, 1) "
+            "ON CONFLICT (table_name) DO UPDATE SET gen = table_generation.gen + 1;",
+            [t],
+        )
+
+
+# -------------------------------
+# Cache hasil query
+# -------------------------------
+_CACHEABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_TABLE_RE = re.compile(r"\b(" + "|".join(sorted(CACHE_TABLES, key=len, reverse=True)) + r")\b")
+_UNTRACKED_RE = re.compile(r"\b(" + "|".join(t for t in AUX_TABLES if t not in CACHE_TABLES) + r"|table_generation)\b")
+
+
+def _result_nbytes(value) -> int:
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    # list baris: perkiraan kasar ~64 B per sel
+    return 64 * sum(len(r or ()) for r in value) + 64
+
+
+class QueryCache:
+    """
+    Cache hasil query bersama antar sesi, key (SQL, params, jenis hasil, generation tabel yang dibaca).
+    Dibatasi max_bytes dengan eviksi LRU; hasil yang lebih besar dari budget tidak disimpan.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value) -> None:
+        size = _result_nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._items[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, n) = self._items.popitem(last=False)
+                self.nbytes -= n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+class _CachedResult:
+    """Hasil execute() yang baru dijalankan saat df()/fetchall()/fetchone() dipanggil."""
+
+    def __init__(self, cur, cache, sql, params, key):
+        self._cur, self._cache = cur, cache
+        self._sql, self._params, self._key = sql, params, key
+
+    def _get(self, kind, run):
+        key = self._key + (kind,)
+        value = self._cache.get(key)
+        if value is None:
+            value = run(self._cur.execute(self._sql, self._params))
+            self._cache.put(key, value)
+        return value
+
+    def df(self):
+        # salinan: pemanggil boleh menambah/mengubah kolom
+        return self._get("df", lambda r: r.df()).copy()
+
+    def fetchall(self):
+        return list(self._get("all", lambda r: r.fetchall()))
+
+    def fetchone(self):
+        return self._get("one", lambda r: [r.fetchone()])[0]
+
+    def __getattr__(self, name):
+        return getattr(self._cur.execute(self._sql, self._params), name)
+
+
+class CachedCursor:
+    """
+    Bungkus cursor baca: SELECT/WITH yang membaca CACHE_TABLES dilayani dari QueryCache
+    selama generation tabelnya belum berubah; query lain diteruskan apa adanya.
+    """
+
+    def __init__(self, cur, cache: QueryCache):
+        self._cur, self._cache = cur, cache
+
+    def execute(self, sql: str, params=None):
+        if not _CACHEABLE_RE.match(sql) or _UNTRACKED_RE.search(sql):
+            return self._cur.execute(sql, params)
+        tables = sorted({CACHE_TABLES[t] for t in _TABLE_RE.findall(sql)})
+        if not tables:
+            return self._cur.execute(sql, params)
+        gens = dict(self._cur.execute("SELECT table_name, gen FROM table_generation").fetchall())
+        params = list(params or [])
+        key = (sql, tuple(params), tuple((t, gens.get(t, 0)) for t in tables))
+        return _CachedResult(self._cur, self._cache, sql, params, key)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class ConnectionManager:
+    """
+    Satu instance DuckDB per file untuk seluruh proses (catalog & buffer pool tetap hangat).
+    reader(): cursor per thread untuk query baca (jangan di-close pemanggil), lewat QueryCache
+    bersama kalau cache_bytes > 0.
+    writer(): context manager; satu cursor writer, diserialisasi dengan lock (re-entrant
+    di thread yang sama), jadi upsert/clear/reset tidak saling tabrak antar sesi.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, cache_bytes: int = QUERY_CACHE_MB * 1024 * 1024):
+        self.db_path = db_path
+        self.cache = QueryCache(cache_bytes) if cache_bytes > 0 else None
+        self._db = duckdb.connect(db_path)
+        self._cursor_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._writer = self._new_cursor()
+        with self.writer() as con:
+            ensure_db(db_path, con=con)
+
+    def _new_cursor(self):
+        with self._cursor_lock:
+            return self._db.cursor()
+
+    def reader(self):
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            cur = self._new_cursor()
+            if self.cache is not None:
+                cur = CachedCursor(cur, self.cache)
+            self._local.cursor = cur
+        return cur
+
+    @contextmanager
+    def writer(self):
+        with self._write_lock:
+            yield self._writer
+
+    def close(self) -> None:
+        with self._write_lock:
+            self._writer.close()
+            self._db.close()
+
+
+def run_id_match_count(con) -> int:
+    return con.execute("""
+        SELECT COUNT(*) FROM bench_runs r
+        JOIN bench_tx_runs t ON r.run_id = t.run_id
+    """).fetchone()[0]
+
+
+# -------------------------------
+# Ingest manifest
+# -------------------------------
+def manifest_lookup(con, digest: str, table: str):
+    return con.execute(
+        "SELECT row_count, file_name, ingested_at FROM ingest_manifest WHERE content_hash = ? AND table_name = ?",
+        [digest, table],
+    ).fetchone()
+
+
+def manifest_record(con, digest: str, table: str, row_count: int, file_name: str) -> None:
+    con.execute(
+        "INSERT OR REPLACE INTO ingest_manifest VALUES (?, ?, ?, ?, now()::TIMESTAMP)",
+        [digest, table, int(row_count), file_name],
+    )
@@ -0,0 +1,179 @@
+"""
+Export on-demand (tanpa Streamlit), dikerjakan saat tombol download diklik — render tanpa klik
+tidak mengerjakan export apa pun.
+
+- CSV: query ditulis DuckDB langsung ke file temp lewat COPY (query) TO, opsional gzip, lalu
+  handle file-nya diserahkan ke download_button (file dihapus begitu selesai dibaca/ditutup).
+  Tidak ada DataFrame/StringIO penuh di memori Python.
+- Chart (HTML/PNG/ZIP): dari spec JSON figure, di-cache per hash spec; PNG lewat satu proses
+  kaleido yang tetap hidup dan dipakai bergantian.
+"""
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+import zipfile
+
+from tools_db import QueryCache
+
+EXPORT_DIR = os.getenv("EDA_EXPORT_DIR") or None  # None = direktori temp sistem
+FIG_CACHE_MB = int(os.getenv("EDA_FIG_CACHE_MB", "64"))
+
+
+def export_name(file_name: str, gzip: bool = False) -> str:
+    return file_name + ".gz" if gzip else file_name
+
+
+def export_mime(gzip: bool = False) -> str:
+    return "application/gzip" if gzip else "text/csv"
+
+
+def copy_csv(con, sql: str, params=(), path: str = None, gzip: bool = False) -> str:
+    """COPY hasil `sql` ke CSV (header, NULL -> kosong) di `path` (default file temp baru). Return path."""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".csv.gz" if gzip else ".csv", prefix="stc_export_", dir=EXPORT_DIR)
+        os.close(fd)
+    opts = "FORMAT CSV, HEADER" + (", COMPRESSION gzip" if gzip else "")
+    con.execute(f"COPY ({sql}) TO '{path.replace(chr(39), chr(39) * 2)}' ({opts})", list(params))
+    return path
+
+
+class _TempExport(io.FileIO):
+    """File export temp read-only yang dihapus saat ditutup; read() sampai habis langsung menutupnya."""
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        if size is None or size < 0 or not data:
+            self.close()
+        return data
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            try:
+                os.unlink(self.name)
+            except FileNotFoundError:
+                pass
+
+
+def export_csv(con, sql: str, params=(), gzip: bool = False) -> _TempExport:
+    """Handle file export untuk `sql` (data= download_button); file temp terhapus setelah dibaca."""
+    path = copy_csv(con, sql, params, gzip=gzip)
+    try:
+        return _TempExport(path, "rb")
+    except OSError:
+        os.unlink(path)
+        raise
+
+
+def deferred_export(con_fn, sql: str, params=(), gzip: bool = False):
+    """
+    Callable untuk `data=` st.download_button: baru dijalankan saat diklik (thread server,
+    bisa beda dengan thread script) — con_fn dipanggil di situ untuk cursor thread tersebut.
+    """
+    params = list(params)
+    return lambda: export_csv(con_fn(), sql, params, gzip=gzip)
+
+
+# -------------------------------
+# Chart
+# -------------------------------
+_fig_cache = QueryCache(FIG_CACHE_MB * 1024 * 1024)
+_scope = None
+_scope_lock = threading.Lock()  # satu renderer kaleido per proses, request PNG bergantian
+_warm_started = False
+_warm_lock = threading.Lock()
+
+
+def fig_spec(fig) -> str:
+    return fig.to_json()
+
+
+def png_available() -> bool:
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def _spec_key(kind: str, spec: str) -> tuple:
+    return kind, hashlib.sha1(spec.encode("utf-8")).hexdigest()
+
+
+def _renderer():
+    """PlotlyScope kaleido 0.2.x (proses Chromium persisten); None untuk kaleido v1 (lewat plotly.io)."""
+    global _scope
+    if _scope is None:
+        try:
+            from kaleido.scopes.plotly import PlotlyScope
+        except ImportError:
+            return None
+        import plotly
+
+        # plotly.js milik paket plotly terpasang, bukan bawaan kaleido (lebih lama dari spec figure)
+        js = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+        _scope = PlotlyScope(plotlyjs=js if os.path.exists(js) else None)
+    return _scope
+
+
+def _render_png(spec: str) -> bytes:
+    with _scope_lock:
+        scope = _renderer()
+        if scope is None:
+            import plotly.io as pio
+            return pio.to_image(json.loads(spec), format="png")
+        return scope.transform(json.loads(spec), format="png")
+
+
+def warm_renderer() -> None:
+    """Nyalakan renderer PNG di thread latar (sekali per proses) supaya klik pertama tidak menunggu start kaleido."""
+    global _warm_started
+    if not png_available():
+        return
+    with _warm_lock:
+        if _warm_started:
+            return
+        _warm_started = True
+    spec = json.dumps({"data": [], "layout": {"width": 10, "height": 10}})
+    threading.Thread(target=lambda: _safe(_render_png, spec), name="kaleido-warmup", daemon=True).start()
+
+
+def _safe(fn, *args):
+    try:
+        return fn(*args)
+    except Exception:
+        return None
+
+
+def _cached(kind: str, spec: str, fn) -> bytes:
+    key = _spec_key(kind, spec)
+    data = _fig_cache.get(key)
+    if data is None:
+        data = fn(spec)
+        _fig_cache.put(key, data)
+    return data
+
+
+def chart_html(spec: str) -> bytes:
+    import plotly.io as pio
+    return _cached("html", spec, lambda s: pio.to_html(
+        json.loads(s), include_plotlyjs="cdn", full_html=False
+    ).encode("utf-8"))
+
+
+def chart_png(spec: str) -> bytes:
+    return _cached("png", spec, _render_png)
+
+
+def charts_zip(charts: dict) -> bytes:
+    """ZIP berisi <nama>.html (+ <nama>.png kalau kaleido tersedia) untuk tiap chart {nama: spec}."""
+    png = png_available()
+    buff = io.BytesIO()
+    with zipfile.ZipFile(buff, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, spec in charts.items():
+            zf.writestr(f"{name}.html", chart_html(spec))
+            img = _safe(chart_png, spec) if png else None
+            if img is not None:
+                zf.writestr(f"{name}.png", img)
+    return buff.getvalue()
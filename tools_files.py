@@ -0,0 +1,57 @@
+"""
+Cache isi file lokal (tanpa Streamlit) yang dikunci (path, mtime_ns, size): file dibaca/di-hash
+ulang hanya kalau berubah; render berikutnya cukup os.stat. Dipakai untuk KB SWC dan template CSV.
+"""
+import hashlib
+import os
+import threading
+
+_cache = {}  # key -> (stamp, nilai)
+_lock = threading.Lock()
+
+
+def file_stamp(path: str):
+    """(mtime_ns, size) file, atau None kalau tidak ada."""
+    try:
+        s = os.stat(path)
+    except OSError:
+        return None
+    return s.st_mtime_ns, s.st_size
+
+
+def cached_files(key, paths: list, loader):
+    """
+    loader(paths) di-cache per `key` selama stamp semua `paths` sama (file hilang/baru juga
+    dihitung berubah). Loader dipanggil di luar lock; hasil paralel yang sama tinggal ditimpa.
+    """
+    stamp = tuple((p, file_stamp(p)) for p in paths)
+    with _lock:
+        hit = _cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = loader(paths)
+    with _lock:
+        _cache[key] = (stamp, value)
+    return value
+
+
+def _sha256(path: str) -> str:
+    try:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        return h.hexdigest()
+    except OSError:
+        return "missing"
+
+
+def file_hash(path) -> str:
+    """SHA-256 isi file ("missing" kalau tidak ada), dihitung ulang hanya saat file berubah."""
+    path = str(path)
+    return cached_files(("sha256", os.path.abspath(path)), [path], lambda ps: _sha256(ps[0]))
+
+
+def clear_file_cache() -> None:
+    with _lock:
+        _cache.clear()
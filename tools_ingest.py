@@ -0,0 +1,867 @@
+"""
+Helper ingest tanpa Streamlit: parsing file upload pakai DuckDB.
+
+Semua fungsi di sini menerima koneksi DuckDB dari pemanggil (lihat get_conn di app),
+jadi bisa dipakai dari dashboard maupun skrip biasa.
+"""
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+
+import duckdb
+import pandas as pd
+from pandas.api import types as pdt
+
+from tools_db import TABLE_AFTER, TABLE_KEYS, bump_generation, primary_key
+from tools_rollup import ROLLUPS, refresh_rollups
+
+SPOOL_CHUNK = 8 * 1024 * 1024
+NDJSON_BATCH_ROWS = 50_000
+NDJSON_EXTS = (".ndjson", ".jsonl", ".json")
+
+COLS_SWC = [
+    "finding_id","timestamp","network","contract","file",
+    "line_start","line_end","swc_id","title","severity",
+    "confidence","status","remediation","commit_hash",
+]
+SWC_TEXT_COLS = [
+    "finding_id","network","contract","file","swc_id",
+    "title","severity","status","remediation","commit_hash"
+]
+SEVERITY_ALIASES = {"info": "informational", "informative": "informational"}
+CONFIDENCE_WORDS = {"low": 0.25, "medium": 0.50, "high": 0.75}
+
+VISION_COLS = [
+    "id", "project", "network", "timestamp", "tx_hash", "contract", "function_name",
+    "block_number", "gas_used", "gas_price_wei", "cost_eth", "cost_idr", "meta_json"
+]
+
+# aturan tambahan per tabel untuk mode typed (meniru casting lama di app)
+CSV_TYPED_RULES = {
+    # keys: kolom wajib ada di CSV & di-trim
+    "bench_runs": {
+        "keys": ["run_id"],
+        # wajib ada di CSV tapi tidak di-trim (CSV tabel lain tidak menimpa metrik run dengan NULL)
+        "required": ["tps_avg", "p50_ms", "p95_ms"],
+        "clean_text": ["run_id"],
+    },
+    "bench_tx": {
+        "keys": ["run_id"],
+        "required": ["tx_hash"],
+        # NaN -> 0 seperti .fillna(0).astype("int64") di jalur pandas (latency_ms tidak: kosong = NULL)
+        "zero_fill": ["gas_used", "gas_price_wei", "block_number"],
+        # teks: newline/tab jadi spasi, NULL jadi ""
+        "clean_text": ["run_id", "tx_hash", "status", "function_name"],
+    },
+}
+
+
+def spool_upload(uploaded, suffix: str = "") -> str:
+    """Tulis file upload (file-like / bytes) ke temp file dan kembalikan path-nya. Pemanggil wajib hapus."""
+    fd, path = tempfile.mkstemp(prefix="stc_ingest_", suffix=suffix)
+    with os.fdopen(fd, "wb") as out:
+        if isinstance(uploaded, (bytes, bytearray, memoryview)):
+            out.write(uploaded)
+        else:
+            try:
+                uploaded.seek(0)
+            except Exception:
+                pass
+            shutil.copyfileobj(uploaded, out, SPOOL_CHUNK)
+    return path
+
+
+class SchemaError(ValueError):
+    """Kolom wajib tidak ada di file/DataFrame yang di-ingest."""
+
+
+def file_kind(name: str) -> str:
+    return "ndjson" if str(name).lower().endswith(NDJSON_EXTS) else "csv"
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 isi file (sama dengan hash upload untuk isi yang sama)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(SPOOL_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def expand_paths(pattern: str) -> list:
+    """Path server: direktori -> semua file di dalamnya, selain itu glob (mendukung **)."""
+    p = os.path.expanduser(pattern.strip())
+    if not p:
+        return []
+    if os.path.isdir(p):
+        names = [os.path.join(p, n) for n in os.listdir(p)]
+    else:
+        names = glob.glob(p, recursive=True)
+    return sorted(n for n in names if os.path.isfile(n))
+
+
+def table_schema(con, table: str) -> list:
+    """[(kolom, tipe DuckDB), ...] dari tabel target (hasil ensure_db)."""
+    return [(r[1], r[2]) for r in con.execute(f"PRAGMA table_info('{table}')").fetchall()]
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _scan_csv(con, path: str, rejects: str) -> str:
+    """read_csv semua kolom VARCHAR; baris rusak dilewati & dicatat di rejects table."""
+    con.execute("SET TimeZone = 'UTC';")
+    p = path.replace("'", "''")
+    return (
+        f"read_csv('{p}', header=true, delim=',', quote='\"', all_varchar=true, "
+        f"ignore_errors=true, store_rejects=true, "
+        f"rejects_table='{rejects}_errors', rejects_scan='{rejects}_scans')"
+    )
+
+
+def _count_rejects(con, rejects: str) -> int:
+    try:
+        return int(con.execute(f"SELECT COUNT(DISTINCT line) FROM {rejects}_errors").fetchone()[0])
+    except Exception:
+        return 0
+    finally:
+        con.execute(f"DROP TABLE IF EXISTS {rejects}_errors;")
+        con.execute(f"DROP TABLE IF EXISTS {rejects}_scans;")
+
+
+def read_csv_duckdb(con, path: str) -> pd.DataFrame:
+    """
+    Pengganti pd.read_csv(engine="python", dtype=str): parser CSV DuckDB (multithread).
+    Hasil: semua kolom string, sel kosong = "" (bukan NaN). Jumlah baris rusak yang
+    dilewati ada di df.attrs["skipped_rows"].
+    """
+    rejects = f"rej_{uuid.uuid4().hex[:8]}"
+    rel = _scan_csv(con, path, rejects)
+    cols = [r[0] for r in con.execute(f"DESCRIBE SELECT * FROM {rel}").fetchall()]
+    select = ", ".join(f"COALESCE({_q(c)}, '') AS {_q(c)}" for c in cols)
+    df = con.execute(f"SELECT {select} FROM {rel}").df()
+    df.attrs["skipped_rows"] = _count_rejects(con, rejects)
+    return df
+
+
+def _int_expr(src: str, typ: str) -> str:
+    # "1860" & "1860.0" sama-sama valid (mirip pd.to_numeric)
+    return f"COALESCE(TRY_CAST({src} AS {typ}), TRY_CAST(TRY_CAST({src} AS DOUBLE) AS {typ}))"
+
+
+def _ts_expr(src: str) -> str:
+    # cast TIMESTAMPTZ (ICU) mahal: hanya untuk string yang kelihatan punya offset/Z,
+    # sisanya dianggap UTC naive (sama seperti pd.to_datetime(utc=True))
+    has_tz = (
+        f"(right(trim({src}), 1) IN ('Z', 'z') OR substr(trim({src}), -6, 1) IN ('+', '-') "
+        f"OR substr(trim({src}), -5, 1) IN ('+', '-'))"
+    )
+    return (
+        f"CASE WHEN {has_tz} THEN CAST(TRY_CAST(NULLIF(trim({src}), '') AS TIMESTAMPTZ) AS TIMESTAMP) "
+        f"ELSE TRY_CAST({src} AS TIMESTAMP) END"
+    )
+
+
+def _typed_expr(col: str, typ: str, present: bool, rules: dict) -> str:
+    if not present:
+        if col in rules.get("zero_fill", []):
+            return f"CAST(CAST(0 AS BIGINT) AS {typ})"
+        if col in rules.get("clean_text", []):
+            return "''"
+        return f"CAST(NULL AS {typ})"
+
+    src = _q(col)
+    if col in rules.get("keys", []):
+        # setara str.strip(): spasi, tab & newline
+        src = f"trim({src}, ' ' || chr(9) || chr(10) || chr(13))"
+    t = typ.upper()
+    zero_fill = col in rules.get("zero_fill", [])
+    if t.startswith("TIMESTAMP"):
+        expr = _ts_expr(src)
+    elif t in ("BIGINT", "INTEGER", "SMALLINT", "TINYINT", "HUGEINT"):
+        expr = _int_expr(src, t)
+    elif t in ("DOUBLE", "FLOAT", "REAL") or t.startswith("DECIMAL"):
+        expr = f"TRY_CAST({src} AS {t})"
+    elif zero_fill:
+        # kolom teks berisi angka (mis. bench_tx.gas_price_wei): simpan sebagai integer string
+        return f"CAST(COALESCE({_int_expr(src, 'BIGINT')}, 0) AS VARCHAR)"
+    else:
+        expr = src
+        if col in rules.get("clean_text", []):
+            # translate mahal; cek contains dulu (mayoritas nilai bersih)
+            dirty = " OR ".join(f"contains({expr}, chr({n}))" for n in (10, 13, 9))
+            expr = (
+                f"CASE WHEN {dirty} THEN translate({expr}, chr(10) || chr(13) || chr(9), '   ') "
+                f"ELSE COALESCE({expr}, '') END"
+            )
+        else:
+            expr = f"COALESCE({expr}, '')"
+    if zero_fill:
+        expr = f"COALESCE({expr}, 0)"
+    return expr
+
+
+def stage_csv_typed(con, path: str, table: str, stage: str = "stg", schema: list = None) -> tuple:
+    """
+    Mode typed: DuckDB parse CSV langsung sesuai schema tabel target ke TEMP TABLE `stage`.
+    Kolom yang tidak ada di CSV diisi NULL (atau 0/"" sesuai CSV_TYPED_RULES), nilai
+    yang gagal di-cast jadi NULL. Return (baris_staged, baris_rusak_dilewati).
+    schema: [(kolom, tipe)] kalau tabel target tidak ada di `con` (mis. worker in-memory).
+    """
+    schema = schema or table_schema(con, table)
+    if not schema:
+        raise ValueError(f"Tabel {table} tidak ditemukan")
+    rules = CSV_TYPED_RULES.get(table, {})
+    rejects = f"rej_{uuid.uuid4().hex[:8]}"
+    rel = _scan_csv(con, path, rejects)
+    header = {r[0] for r in con.execute(f"DESCRIBE SELECT * FROM {rel}").fetchall()}
+    missing_keys = [c for c in rules.get("keys", []) + rules.get("required", []) if c not in header]
+    if missing_keys:
+        _count_rejects(con, rejects)
+        raise SchemaError(f"Missing columns for {table}: {missing_keys}")
+
+    select = ", ".join(
+        f"{_typed_expr(c, t, c in header, rules)} AS {_q(c)}" for c, t in schema
+    )
+    con.execute(f"DROP TABLE IF EXISTS {stage};")
+    con.execute(f"CREATE TEMP TABLE {stage} AS SELECT {select} FROM {rel};")
+    n = con.execute(f"SELECT COUNT(*) FROM {stage}").fetchone()[0]
+    return n, _count_rejects(con, rejects)
+
+
+# -------------------------------
+# Upsert engine (satu transaksi)
+# -------------------------------
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def rows(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def __add__(self, other: "UpsertResult") -> "UpsertResult":
+        return UpsertResult(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+        )
+
+    def __str__(self) -> str:
+        return f"{self.inserted:,} baru, {self.updated:,} diperbarui, {self.unchanged:,} tidak berubah"
+
+
+def normalize_run_id(s: pd.Series) -> pd.Series:
+    """run_id batch: trim + newline/tab jadi spasi (sama dengan mode typed)."""
+    return s.astype(str).str.strip().str.replace(r"[\n\r\t]", " ", regex=True)
+
+
+@contextmanager
+def transaction(con):
+    """BEGIN ... COMMIT di `con`; ROLLBACK kalau ada exception."""
+    con.execute("BEGIN TRANSACTION;")
+    try:
+        yield con
+    except BaseException:
+        con.execute("ROLLBACK;")
+        raise
+    con.execute("COMMIT;")
+
+
+def upsert_source(con, table: str, source: str, key_cols: list, col_list: list,
+                  dedup: bool = False, after: list = (), begin: bool = True) -> UpsertResult:
+    """
+    Upsert `source` (TEMP TABLE stg atau DataFrame yang di-register) ke `table` dalam satu
+    transaksi. Baris yang identik dengan isi tabel dilewati (tidak ditulis ulang);
+    sisanya INSERT OR REPLACE kalau key = PRIMARY KEY tabel, selain itu DELETE+INSERT.
+    dedup=True: ambil baris terakhir per key (rowid) dari source.
+    after: SQL tambahan (mis. tabel turunan) yang dijalankan di transaksi yang sama;
+    bisa membaca TEMP TABLE upsert_delta (baris yang ditulis, kolom _is_new).
+    Rollup tabel (tools_rollup) ikut dihitung ulang dan generation tabel (table_generation)
+    dinaikkan kalau ada baris yang ditulis.
+    begin=False: pemanggil sudah membuka transaksi (mis. satu file per batch, lihat transaction).
+    """
+    types = dict(table_schema(con, table))
+    cols_sql = ", ".join(_q(c) for c in col_list)
+    typed = ", ".join(f"CAST(s.{_q(c)} AS {types[c]}) AS {_q(c)}" for c in col_list)
+    keys_sql = ", ".join(_q(k) for k in key_cols)
+    on_key = " AND ".join(f"t.{_q(k)} = s.{_q(k)}" for k in key_cols)
+    same = " AND ".join(f"t.{_q(c)} IS NOT DISTINCT FROM s.{_q(c)}" for c in col_list)
+    src = f"(SELECT {typed} FROM {source} s"
+    if dedup:
+        src += f" QUALIFY row_number() OVER (PARTITION BY {keys_sql} ORDER BY s.rowid DESC) = 1"
+    src += ")"
+
+    with transaction(con) if begin else nullcontext():
+        total = con.execute(f"SELECT COUNT(*) FROM {src}").fetchone()[0]
+        # hanya baris baru/berubah yang ditulis
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE upsert_delta AS
+            SELECT s.*, t.{_q(key_cols[0])} IS NULL AS _is_new
+            FROM {src} s
+            LEFT JOIN {table} t ON {on_key}
+            WHERE t.{_q(key_cols[0])} IS NULL OR NOT ({same});
+        """)
+        changed, inserted = con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(_is_new::INT), 0) FROM upsert_delta"
+        ).fetchone()
+        if changed:
+            if table in ROLLUPS:
+                # versi lama baris yang akan di-update (grup rollup lamanya ikut dihitung ulang)
+                con.execute(f"""
+                    CREATE OR REPLACE TEMP TABLE upsert_old AS
+                    SELECT t.* FROM {table} t JOIN upsert_delta s ON {on_key} WHERE NOT s._is_new;
+                """)
+            if sorted(primary_key(con, table)) == sorted(key_cols):
+                con.execute(f"INSERT OR REPLACE INTO {table} ({cols_sql}) SELECT {cols_sql} FROM upsert_delta;")
+            else:
+                con.execute(f"""
+                    DELETE FROM {table} t USING (SELECT {keys_sql} FROM upsert_delta WHERE NOT _is_new) s
+                    WHERE {on_key};
+                """)
+                con.execute(f"INSERT INTO {table} ({cols_sql}) SELECT {cols_sql} FROM upsert_delta;")
+            for sql in after:
+                con.execute(sql)
+            if table in ROLLUPS:
+                new_rows = f"(SELECT t.* FROM {table} t SEMI JOIN upsert_delta s ON {on_key})"
+                refresh_rollups(con, table, [new_rows, "upsert_old"])
+                con.execute("DROP TABLE upsert_old;")
+            # cache query (tools_db.QueryCache) untuk tabel ini jadi basi
+            bump_generation(con, [table])
+        con.execute("DROP TABLE upsert_delta;")
+    return UpsertResult(int(inserted), int(changed - inserted), int(total - changed))
+
+
+def upsert_df(con, table: str, d: pd.DataFrame, key_cols: list, col_list: list = None,
+              after: list = (), begin: bool = True) -> UpsertResult:
+    """Normalisasi DataFrame hasil mapping (key str, dedup per key, datetime naive) lalu upsert."""
+    if d is None or d.empty:
+        return UpsertResult()
+
+    use_cols = col_list or d.columns.tolist()
+    missing = [c for c in use_cols if c not in d.columns]
+    if missing:
+        raise SchemaError(f"Missing columns for {table}: {missing}")
+
+    d = d[use_cols].copy()
+
+    # --- NORMALISASI KEY KE STRING ---
+    for k in key_cols:
+        d[k] = d[k].astype(str).fillna("").str.strip()
+
+    # --- DEDUP PER KEY (ambil terakhir) ---
+    d = d.drop_duplicates(subset=key_cols, keep="last")
+
+    # --- NORMALISASI DATETIME: jadikan naive (tanpa TZ) ---
+    for c in d.columns:
+        # kalau sudah tz-aware => buang TZ
+        if isinstance(d[c].dtype, pd.DatetimeTZDtype):
+            d[c] = pd.to_datetime(d[c], errors="coerce").dt.tz_localize(None)
+        # kalau datetime tapi bukan tz => pastikan datetime
+        elif pdt.is_datetime64_any_dtype(d[c]):
+            d[c] = pd.to_datetime(d[c], errors="coerce")
+        # kalau masih string/object dan kelihatan kolom waktu => parse + buang TZ
+        elif pdt.is_object_dtype(d[c]) and c.lower() in ("timestamp","ts","time","created_at","updated_at"):
+            d[c] = pd.to_datetime(d[c], errors="coerce", utc=True).dt.tz_localize(None)
+
+    return upsert_frame(con, table, d, key_cols, use_cols, after=after, begin=begin)
+
+
+def upsert_frame(con, table: str, d: pd.DataFrame, key_cols: list, col_list: list,
+                 after: list = (), begin: bool = True) -> UpsertResult:
+    """DataFrame (sudah dedup per key) -> upsert langsung dari view Arrow/pandas, tanpa salinan stg."""
+    if d is None or d.empty:
+        return UpsertResult()
+    view = f"df_upsert_{uuid.uuid4().hex[:8]}"
+    con.register(view, d)
+    try:
+        return upsert_source(con, table, view, key_cols, col_list, after=after, begin=begin)
+    finally:
+        con.unregister(view)
+
+
+# -------------------------------
+# Row fingerprint (fallback ID)
+# -------------------------------
+def _na_repr(v) -> str:
+    if v is None:
+        return "None"
+    if v is pd.NA:
+        return "<NA>"
+    if v is pd.NaT:
+        return "NaT"
+    return "nan"
+
+
+def _str_cells(col: pd.Series, mask: pd.Series) -> pd.Series:
+    """str(sel) seperti df.astype(str) di pandas 2 (None/NaN/<NA>/NaT tetap tertulis)."""
+    if pdt.is_datetime64_any_dtype(col):
+        # format datetime ditentukan sekolom (tanggal saja kalau semua 00:00) -> render kolom penuh
+        return col.astype(str)[mask].where(col[mask].notna(), "NaT")
+    sub = col[mask]
+    out = sub.astype(str)
+    na = sub.isna()
+    if na.any():
+        out = out.astype(object)
+        out[na] = sub[na].astype(object).map(_na_repr)
+    return out
+
+
+def _sha256_prefix(keys: pd.Series, n: int) -> pd.Series:
+    try:
+        mem = duckdb.connect()
+        try:
+            mem.register("fp_keys", pd.DataFrame({"k": keys.astype(object).to_numpy()}))
+            h = mem.execute(f"SELECT left(sha256(k), {int(n)}) AS h FROM fp_keys").df()["h"]
+            mem.unregister("fp_keys")
+        finally:
+            mem.close()
+        return pd.Series(h.to_numpy(), index=keys.index)
+    except duckdb.Error:
+        return keys.map(lambda k: hashlib.sha256(k.encode("utf-8")).hexdigest()[:n])
+
+
+def row_fingerprint(df: pd.DataFrame, mask: pd.Series = None, n: int = 16) -> pd.Series:
+    """
+    sha256("|".join(str(v) for v in baris))[:n] untuk baris `mask` saja — hasil identik
+    dengan df.astype(str).agg("|".join, axis=1) + hashlib (ID lama tetap stabil),
+    tapi string digabung vectorized & hash dihitung di DuckDB.
+    """
+    if mask is None:
+        mask = pd.Series(True, index=df.index)
+    if not mask.any() or df.shape[1] == 0:
+        return pd.Series(index=df.index[mask], dtype=object)
+    parts = [_str_cells(df[c], mask).astype(str) for c in df.columns]
+    keys = parts[0].str.cat(parts[1:], sep="|") if len(parts) > 1 else parts[0]
+    return _sha256_prefix(keys, n)
+
+
+# -------------------------------
+# Vision CSV
+# -------------------------------
+VISION_CSV_RENAME = {
+    "Network": "network", "network": "network",
+    "Tx Hash": "tx_hash", "tx_hash": "tx_hash",
+    "From": "from_address", "from": "from_address",
+    "To": "to_address", "to": "to_address",
+    "Block": "block_number", "block": "block_number",
+    "Gas Used": "gas_used", "gas_used": "gas_used",
+    "Gas Price (Gwei)": "gas_price_gwei", "gas_price_gwei": "gas_price_gwei",
+    "Estimated Fee (ETH)": "cost_eth", "estimated_fee_eth": "cost_eth",
+    "Estimated Fee (Rp)": "cost_idr", "estimated_fee_rp": "cost_idr",
+    "Contract": "contract", "contract": "contract",
+    "Function": "function_name", "function": "function_name",
+    "Timestamp": "timestamp", "timestamp": "timestamp",
+    "Status": "status", "status": "status",
+    "id": "id",
+}
+
+
+def map_csv_cost(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """CSV STC-Vision -> schema vision_costs (mendukung kolom minimal)."""
+    df = df_raw.rename(columns=VISION_CSV_RENAME, errors="ignore").copy()
+
+    # default project
+    df["project"] = "STC"
+
+    ts_raw = df.get("timestamp")
+    if ts_raw is not None:
+        ts_clean = (
+            pd.Series(ts_raw, index=df.index)
+              .astype(str)
+              .str.strip()
+              .str.replace(r"Z$", "+00:00", regex=True)
+        )
+        ts = pd.to_datetime(ts_clean, errors="coerce", utc=True, format="ISO8601")
+        ts = ts.fillna(pd.to_datetime(ts_clean, errors="coerce", dayfirst=True, utc=True))
+        df["timestamp"] = ts.dt.tz_localize(None)
+    else:
+        df["timestamp"] = pd.NaT
+
+    if "gas_price_gwei" in df.columns:
+        gwei_src = df["gas_price_gwei"]
+    else:
+        gwei_src = pd.Series(0, index=df.index, dtype="float64")
+    gwei = pd.to_numeric(gwei_src, errors="coerce").fillna(0)
+    df["gas_price_wei"] = (gwei * 1_000_000_000).round().astype("Int64")
+
+    # meta_json dari status
+    if "status" in df.columns:
+        df["meta_json"] = df["status"].astype(str).apply(lambda s: json.dumps({"status": s}) if s else "{}")
+    elif "meta_json" not in df.columns:
+        df["meta_json"] = "{}"
+
+    tx_series = df["tx_hash"] if "tx_hash" in df.columns else pd.Series("", index=df.index)
+    fn_series = df["function_name"] if "function_name" in df.columns else pd.Series("", index=df.index)
+    tx = tx_series.astype(str).fillna("")
+    fn = fn_series.astype(str).fillna("")
+
+    if "id" in df.columns:
+        df["id"] = df["id"].astype(str).fillna("").str.strip()
+    else:
+        df["id"] = ""
+    need_id = df["id"].eq("")
+    has_tx_fn = tx.str.strip().ne("") | fn.str.strip().ne("")
+    df["id"] = (tx + "::" + fn).where(need_id & has_tx_fn, df["id"])
+
+    # tanpa id & tx_hash::function_name -> fingerprint seluruh baris (hanya baris ini)
+    still_empty = df["id"].eq("")
+    if still_empty.any():
+        df.loc[still_empty, "id"] = "csv::" + row_fingerprint(df, still_empty)
+
+    for c in VISION_COLS:
+        if c not in df.columns:
+            df[c] = None
+
+    # casts numerik
+    df["block_number"] = pd.to_numeric(df["block_number"], errors="coerce").astype("Int64")
+    df["gas_used"]     = pd.to_numeric(df["gas_used"], errors="coerce").astype("Int64")
+    df["cost_eth"]     = pd.to_numeric(df["cost_eth"], errors="coerce")
+    df["cost_idr"]     = pd.to_numeric(df["cost_idr"], errors="coerce")
+
+    # network fallback
+    df["network"] = df["network"].fillna("(Unknown)")
+
+    keep_mask = (
+        df["id"].ne("") |
+        df["function_name"].astype(str).str.strip().ne("") |
+        df["gas_used"].fillna(0).ne(0) |
+        df["cost_eth"].fillna(0).ne(0) |
+        df["cost_idr"].fillna(0).ne(0)
+    )
+    return df.loc[keep_mask, VISION_COLS]
+
+
+# -------------------------------
+# NDJSON streaming
+# -------------------------------
+def _ndjson_objects(path: str) -> str:
+    p = path.replace("'", "''")
+    # baris JSON rusak -> NULL (bukan error), baris kosong dilewati
+    return f"read_json_objects('{p}', format='newline_delimited', ignore_errors=true)"
+
+
+def scan_ndjson(con, path: str) -> tuple:
+    """
+    Pass 1 (streaming, tanpa materialisasi): kumpulkan semua key objek sesuai urutan
+    kemunculan + hitung baris yang dilewati (JSON rusak / bukan objek). Baris dibaca per
+    batch sesuai urutan file; yang diproses di Python hanya kombinasi key unik per batch.
+    Return (keys, skipped_lines).
+    """
+    # kombinasi key per baris jadi satu string; pd.unique per batch mempertahankan urutan kemunculan
+    res = con.execute(f"""
+        SELECT CASE WHEN json_type(json) = 'OBJECT' THEN array_to_string(json_keys(json), chr(31)) END AS k
+        FROM {_ndjson_objects(path)}
+    """)
+    vectors = max(1, NDJSON_BATCH_ROWS // 2048)
+    keys, skipped = {}, 0
+    while True:
+        df = res.fetch_df_chunk(vectors)
+        if df.empty:
+            break
+        combos = df["k"]
+        skipped += int(combos.isna().sum())
+        for combo in pd.unique(combos.dropna()):
+            if combo:
+                keys.update(dict.fromkeys(combo.split(chr(31))))
+    return list(keys), skipped
+
+
+def iter_ndjson_batches(con, path: str, keys: list, batch_rows: int = NDJSON_BATCH_ROWS):
+    """
+    Pass 2: yield DataFrame per ~batch_rows baris. Semua kolom string (nilai objek/array
+    bersarang jadi teks JSON), key yang tidak ada di baris = NaN. Memori hanya sebesar
+    satu batch, berapa pun ukuran file.
+    """
+    if not keys:
+        return
+    spec = json.dumps({k: "VARCHAR" for k in keys}).replace("'", "''")
+    res = con.execute(f"""
+        SELECT unnest(from_json(json, '{spec}'))
+        FROM {_ndjson_objects(path)} WHERE json_type(json) = 'OBJECT'
+    """)
+    vectors = max(1, batch_rows // 2048)
+    while True:
+        df = res.fetch_df_chunk(vectors)
+        if df.empty:
+            break
+        yield df
+
+
+def _meta_to_json(x, default: str = "{}") -> str:
+    if isinstance(x, (dict, list)):
+        return json.dumps(x)
+    if x is None or (isinstance(x, float) and pd.isna(x)) or x == "":
+        return default
+    return str(x)
+
+
+def map_ndjson_cost(d: pd.DataFrame) -> pd.DataFrame:
+    """NDJSON vision_costs (satu batch) -> schema vision_costs."""
+    d = d.copy()
+    if "id" not in d.columns:
+        tx = d["tx_hash"] if "tx_hash" in d.columns else pd.Series("", index=d.index)
+        fn = d["function_name"] if "function_name" in d.columns else pd.Series("", index=d.index)
+        d["id"] = (tx.fillna("").astype(str) + "::" + fn.fillna("").astype(str)).str.strip()
+    d["id"] = d["id"].astype(str).fillna("").str.strip()
+    if "meta_json" in d.columns:
+        d["meta_json"] = d["meta_json"].map(_meta_to_json)
+    elif "meta" in d.columns:
+        d["meta_json"] = d["meta"].map(_meta_to_json)
+    else:
+        d["meta_json"] = "{}"
+
+    for c in VISION_COLS:
+        if c not in d.columns:
+            d[c] = None
+
+    d["project"] = d.get("project").fillna("STC").astype(str)
+
+    ts = pd.to_datetime(d["timestamp"], errors="coerce", utc=True)
+    d["timestamp"] = ts.dt.tz_convert(None).astype("datetime64[ns]")
+    d["timestamp"] = d["timestamp"].fillna(pd.Timestamp.now(tz="UTC").tz_localize(None))
+    d["block_number"]  = pd.to_numeric(d["block_number"], errors="coerce").astype("Int64")
+    d["gas_used"]      = pd.to_numeric(d["gas_used"], errors="coerce").astype("Int64")
+    d["gas_price_wei"] = pd.to_numeric(d["gas_price_wei"], errors="coerce").round().astype("Int64")
+    d["cost_eth"]      = pd.to_numeric(d["cost_eth"], errors="coerce")
+    d["cost_idr"]      = pd.to_numeric(d["cost_idr"], errors="coerce")
+
+    d["network"]       = d.get("network").astype(str).replace({"nan": None, "None": None}).fillna("(Unknown)")
+    d["contract"]      = d.get("contract").astype(str)
+    d["function_name"] = d.get("function_name").astype(str)
+
+    keep_mask = (
+        d["id"].ne("") |
+        d["function_name"].astype(str).str.strip().ne("") |
+        d["gas_used"].fillna(0).ne(0) |
+        d["cost_eth"].fillna(0).ne(0) |
+        d["cost_idr"].fillna(0).ne(0)
+    )
+    return d.loc[keep_mask, VISION_COLS]
+
+
+# -------------------------------
+# SWC findings
+# -------------------------------
+# bentuk ISO-8601 umum yang hasilnya identik antara pandas & dateutil.isoparse
+_ISO_COMMON = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$")
+_ISO_TZ_SUFFIX = r"(\d)(?:Z|[+-]\d{2}(?::?\d{2})?)$"
+
+
+def _isoparse_naive(ts):
+    from dateutil import parser
+    try:
+        dt = pd.Timestamp(parser.isoparse(ts))
+        return dt.tz_localize(None) if dt.tzinfo is not None else dt
+    except Exception:
+        return pd.NaT
+
+
+def parse_iso_wall_time(s: pd.Series) -> pd.Series:
+    """
+    ISO-8601 -> datetime naive, offset dibuang tanpa konversi (jam dinding tetap,
+    sama seperti isoparse(...).tz_localize(None)). Parse massal untuk bentuk umum,
+    dateutil.isoparse per baris hanya untuk sisa yang gagal.
+    """
+    raw = s.astype("string").str.strip()
+    has_time = raw.str.contains(r"\d{2}:\d{2}", regex=True, na=False)
+    wall = raw.where(~has_time, raw.str.replace(_ISO_TZ_SUFFIX, r"\1", regex=True))
+    common = wall.str.match(_ISO_COMMON, na=False)
+
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    if common.any():
+        # isoparse memotong pecahan detik ke mikrodetik
+        out[common] = pd.to_datetime(wall[common], errors="coerce", format="ISO8601").dt.floor("us")
+    rest = out.isna() & raw.notna() & raw.ne("")
+    if rest.any():
+        out[rest] = pd.to_datetime(raw[rest].map(_isoparse_naive))
+    return out
+
+
+def map_swc(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    CSV/NDJSON SWC -> schema swc_findings (vectorized): fallback finding_id
+    contract::swc_id::line_start, severity & confidence dinormalisasi sekali di sini,
+    dedup per finding_id. Jumlah timestamp gagal parse di attrs["invalid_timestamps"].
+    """
+    df = df.copy()
+    for c in COLS_SWC:
+        if c not in df.columns:
+            df[c] = pd.NA
+
+    df[SWC_TEXT_COLS] = df[SWC_TEXT_COLS].astype("string").fillna("")
+
+    # confidence: angka dulu, kalau gagal map dari kata (low/medium/high)
+    conf_str = df["confidence"].astype("string").str.strip()
+    conf_num = pd.to_numeric(conf_str.mask(conf_str.eq("")), errors="coerce")
+    df["confidence"] = conf_num.fillna(conf_str.str.lower().map(CONFIDENCE_WORDS)).astype("float64")
+    for c in ["line_start", "line_end"]:
+        v = df[c].astype("string")
+        df[c] = pd.to_numeric(v.mask(v.str.strip().eq("")), errors="coerce").astype("Int64")
+
+    df["severity"] = df["severity"].str.lower().replace(SEVERITY_ALIASES)
+
+    # fallback id: contract::swc_id::line_start
+    need_id = df["finding_id"].str.strip().eq("")
+    if need_id.any():
+        sub = df.loc[need_id]
+        df.loc[need_id, "finding_id"] = (
+            sub["contract"] + "::" + sub["swc_id"] + "::"
+            + sub["line_start"].astype("string").fillna("<NA>")
+        )
+        # contract, swc_id & line_start kosong semua -> fingerprint baris supaya tidak saling timpa
+        blank = need_id & df["finding_id"].eq("::::<NA>")
+        if blank.any():
+            df.loc[blank, "finding_id"] = "swc::" + row_fingerprint(df[COLS_SWC], blank)
+
+    df["timestamp"] = parse_iso_wall_time(df["timestamp"])
+    invalid_rows = int(df["timestamp"].isna().sum())
+    df["timestamp"] = df["timestamp"].fillna(pd.Timestamp.now(tz="UTC").tz_localize(None))
+
+    df = df.drop_duplicates(subset=["finding_id"], keep="last")[COLS_SWC]
+    df.attrs["invalid_timestamps"] = invalid_rows
+    return df
+
+
+# -------------------------------
+# Batch multi-file (worker thread pool)
+# -------------------------------
+def read_csv_file(path: str) -> pd.DataFrame:
+    """CSV dari path lokal, semua kolom str: DuckDB dulu, fallback parser python pandas."""
+    mem = duckdb.connect()
+    try:
+        return read_csv_duckdb(mem, path)
+    except duckdb.Error:
+        pass
+    finally:
+        mem.close()
+    opts = dict(sep=",", engine="python", on_bad_lines="skip", dtype=str,
+                keep_default_na=False, na_filter=False, quoting=csv.QUOTE_MINIMAL)
+    try:
+        return pd.read_csv(path, encoding="utf-8", **opts)
+    except (UnicodeDecodeError, pd.errors.ParserError):
+        with open(path, "rb") as f:
+            return pd.read_csv(io.StringIO(f.read().decode("utf-8", "ignore")), **opts)
+
+
+ROW_MAPPERS = {
+    "vision_costs": {"csv": map_csv_cost, "ndjson": map_ndjson_cost},
+    "swc_findings": {"csv": map_swc, "ndjson": map_swc},
+}
+
+
+def parse_file(table: str, path: str, kind: str, schema: list = None, stats: dict = None):
+    """
+    Worker thread pool: parse + normalisasi satu file jadi DataFrame siap upsert, per batch
+    (~NDJSON_BATCH_ROWS baris), di koneksi DuckDB in-memory sendiri (tidak menulis DB;
+    penulisan tetap satu writer). Tabel bench (CSV_TYPED_RULES) di-cast typed sesuai `schema`.
+    stats (opsional) diisi skipped_rows, invalid_timestamps selama batch di-yield.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(skipped_rows=0, invalid_timestamps=0)
+    mem = duckdb.connect()
+    try:
+        if table in CSV_TYPED_RULES:
+            _, stats["skipped_rows"] = stage_csv_typed(mem, path, table, schema=schema)
+            res = mem.execute("SELECT * FROM stg")
+            vectors = max(1, NDJSON_BATCH_ROWS // 2048)
+            while True:
+                d = res.fetch_df_chunk(vectors)
+                if d.empty:
+                    return
+                yield d
+
+        map_fn = ROW_MAPPERS[table][kind]
+        if kind == "ndjson":
+            keys, stats["skipped_rows"] = scan_ndjson(mem, path)
+            batches = iter_ndjson_batches(mem, path, keys)
+        else:
+            raw = read_csv_file(path)
+            stats["skipped_rows"] = raw.attrs.get("skipped_rows", 0)
+            batches = iter([raw])
+        for batch in batches:
+            d = map_fn(batch)
+            stats["invalid_timestamps"] += d.attrs.get("invalid_timestamps", 0)
+            yield d
+    finally:
+        mem.close()
+
+
+# -------------------------------
+# Ingest 1 file dari path (CLI / app)
+# -------------------------------
+@contextmanager
+def _stage(timings: dict, name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - t0
+
+
+def ingest_path(con, table: str, path: str, kind: str = None, timings: dict = None) -> tuple:
+    """
+    Parse -> mapping -> upsert satu file lokal ke `table` (koneksi `con` = DB target).
+    Tabel bench: typed staging DuckDB; vision/swc: mapping pandas, NDJSON per batch (satu transaksi per file).
+    timings (opsional) diakumulasi per tahap: parse, map, write (detik).
+    Return (UpsertResult, {"skipped_rows", "invalid_timestamps"}).
+    """
+    kind = kind or file_kind(path)
+    timings = timings if timings is not None else {}
+    key_cols = TABLE_KEYS[table]
+    after = TABLE_AFTER.get(table, ())
+    cols = [c for c, _ in table_schema(con, table)]
+    stats = {"skipped_rows": 0, "invalid_timestamps": 0}
+
+    if table in CSV_TYPED_RULES:
+        if kind != "csv":
+            raise SchemaError(f"{table} only accepts CSV input, got {kind}")
+        with _stage(timings, "parse"):
+            _, stats["skipped_rows"] = stage_csv_typed(con, path, table)
+        try:
+            with _stage(timings, "write"):
+                res = upsert_source(con, table, "stg", key_cols, cols, dedup=True, after=after)
+        finally:
+            con.execute("DROP TABLE IF EXISTS stg;")
+        return res, stats
+
+    map_fn = ROW_MAPPERS[table][kind]
+    res = UpsertResult()
+    mem = duckdb.connect()
+    try:
+        with _stage(timings, "parse"):
+            if kind == "ndjson":
+                keys, stats["skipped_rows"] = scan_ndjson(mem, path)
+                batches = iter_ndjson_batches(mem, path, keys)
+            else:
+                raw = read_csv_file(path)
+                stats["skipped_rows"] = raw.attrs.get("skipped_rows", 0)
+                batches = iter([raw])
+        # satu transaksi per file: batch ditulis satu per satu, gagal di tengah = tidak ada yang masuk
+        with transaction(con):
+            while True:
+                with _stage(timings, "parse"):
+                    batch = next(batches, None)
+                if batch is None:
+                    break
+                with _stage(timings, "map"):
+                    d = map_fn(batch)
+                stats["invalid_timestamps"] += d.attrs.get("invalid_timestamps", 0)
+                with _stage(timings, "write"):
+                    res += upsert_df(con, table, d, key_cols, cols, after=after, begin=False)
+    finally:
+        mem.close()
+    return res, stats
@@ -0,0 +1,129 @@
+"""
+Metrik turunan per run dari bench_tx (tanpa Streamlit): persentil latency p50/p90/p95/p99/max,
+histogram latency dan timeline throughput mined per detik dengan peak TPS sliding window.
+
+Hasilnya dimaterialisasi per run_id di tiga tabel dan dihitung ulang hanya untuk run yang
+disentuh upsert (RUN_STATS_SYNC_SQL di TABLE_AFTER bench_tx, transaksi yang sama), jadi drilldown
+run besar cukup membaca beberapa baris. Persentil exact (quantile_cont) untuk run sampai
+LATENCY_EXACT_MAX transaksi, di atasnya sketch t-digest (approx_quantile); metodenya tercatat.
+"""
+import os
+
+LATENCY_EXACT_MAX = int(os.getenv("EDA_LATENCY_EXACT_MAX", "1000000"))
+LATENCY_BINS = int(os.getenv("EDA_LATENCY_BINS", "50"))
+TPS_WINDOW_S = int(os.getenv("EDA_TPS_WINDOW_S", "10"))
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+# latency_ms NULL -> selisih mined_at - submitted_at; tanpa mined_at -> NULL (tidak dihitung).
+# 0 ms tetap nilai valid: ingest tidak lagi mengisi latency_ms kosong dengan 0.
+LATENCY_SQL = "CAST(COALESCE(latency_ms, date_diff('millisecond', submitted_at, mined_at)) AS DOUBLE)"
+OK_STATUSES = ("success", "ok", "confirmed", "mined")
+
+RUN_STATS = "bench_run_stats"
+RUN_HIST = "bench_run_latency_hist"
+RUN_TPS = "bench_run_tps"
+RUN_STATS_TABLES = [RUN_STATS, RUN_HIST, RUN_TPS]
+
+RUN_STATS_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {RUN_STATS} (
+      run_id TEXT PRIMARY KEY, tx_n BIGINT, ok_n BIGINT, mined_n BIGINT, lat_n BIGINT,
+      p50_ms DOUBLE, p90_ms DOUBLE, p95_ms DOUBLE, p99_ms DOUBLE, max_ms DOUBLE, mean_ms DOUBLE,
+      quantile_method TEXT, first_submitted TIMESTAMP, last_mined TIMESTAMP, duration_s DOUBLE,
+      tps_mined DOUBLE, tps_peak_1s BIGINT, tps_peak_window DOUBLE
+    );""",
+    f"""CREATE TABLE IF NOT EXISTS {RUN_HIST} (
+      run_id TEXT, bin INTEGER, bin_lo_ms DOUBLE, bin_hi_ms DOUBLE, n BIGINT,
+      PRIMARY KEY (run_id, bin)
+    );""",
+    f"""CREATE TABLE IF NOT EXISTS {RUN_TPS} (
+      run_id TEXT, second TIMESTAMP, mined BIGINT, tps_window DOUBLE,
+      PRIMARY KEY (run_id, second)
+    );""",
+]
+
+_TX_IN_KEYS = "bench_tx WHERE run_id IN (SELECT run_id FROM run_stats_keys{cond})"
+
+
+def _stats_insert(method: str, quantile_fn: str, cond: str) -> str:
+    qs = ", ".join(str(q) for q in QUANTILES)
+    ok = ", ".join(f"'{s}'" for s in OK_STATUSES)
+    return f"""
+        INSERT INTO {RUN_STATS}
+        SELECT t.run_id, t.tx_n, t.ok_n, t.mined_n, t.lat_n,
+               t.q[1], t.q[2], t.q[3], t.q[4], t.max_ms, t.mean_ms, '{method}',
+               t.first_submitted, t.last_mined, t.duration_s,
+               t.mined_n / NULLIF(t.duration_s, 0), p.peak_1s, p.peak_window
+        FROM (
+            SELECT run_id, COUNT(*) AS tx_n,
+                   COUNT(*) FILTER (WHERE lower(trim(status)) IN ({ok})) AS ok_n,
+                   COUNT(mined_at) AS mined_n, COUNT({LATENCY_SQL}) AS lat_n,
+                   {quantile_fn}({LATENCY_SQL}, [{qs}]) AS q,
+                   MAX({LATENCY_SQL}) AS max_ms, AVG({LATENCY_SQL}) AS mean_ms,
+                   MIN(submitted_at) AS first_submitted, MAX(mined_at) AS last_mined,
+                   date_diff('millisecond', MIN(submitted_at), MAX(mined_at)) / 1000.0 AS duration_s
+            FROM {_TX_IN_KEYS.format(cond=cond)}
+            GROUP BY run_id
+        ) t
+        LEFT JOIN (
+            SELECT run_id, MAX(mined) AS peak_1s, MAX(tps_window) AS peak_window
+            FROM {RUN_TPS} WHERE run_id IN (SELECT run_id FROM run_stats_keys{cond})
+            GROUP BY run_id
+        ) p USING (run_id);
+    """
+
+
+def run_stats_sql(runs: str) -> list:
+    """
+    SQL penghitungan ulang metrik untuk run di subquery `runs` (kolom run_id): hapus baris
+    lama ketiga tabel lalu isi lagi dari bench_tx. Dijalankan berurutan di satu transaksi.
+    """
+    bins = LATENCY_BINS
+    return [
+        f"""CREATE OR REPLACE TEMP TABLE run_stats_keys AS
+            SELECT run_id, COUNT(*) AS n FROM bench_tx WHERE run_id IN ({runs}) GROUP BY run_id;""",
+        *(f"DELETE FROM {t} WHERE run_id IN (SELECT run_id FROM run_stats_keys);" for t in RUN_STATS_TABLES),
+        # throughput mined per detik + rata-rata jendela TPS_WINDOW_S detik (detik kosong = 0)
+        f"""
+        INSERT INTO {RUN_TPS}
+        SELECT run_id, second, mined,
+               SUM(mined) OVER (
+                   PARTITION BY run_id ORDER BY second
+                   RANGE BETWEEN INTERVAL {TPS_WINDOW_S - 1} SECOND PRECEDING AND CURRENT ROW
+               ) / {TPS_WINDOW_S} AS tps_window
+        FROM (
+            SELECT run_id, date_trunc('second', mined_at) AS second, COUNT(*) AS mined
+            FROM {_TX_IN_KEYS.format(cond="")} AND mined_at IS NOT NULL
+            GROUP BY ALL
+        );""",
+        # histogram: {bins} bin lebar sama antara latency min..max per run
+        f"""
+        INSERT INTO {RUN_HIST}
+        WITH tx AS (
+            SELECT run_id, {LATENCY_SQL} AS lat FROM {_TX_IN_KEYS.format(cond="")}
+        ), b AS (
+            SELECT run_id, MIN(lat) AS lo, (MAX(lat) - MIN(lat)) / {bins} AS w
+            FROM tx WHERE lat IS NOT NULL GROUP BY run_id
+        )
+        SELECT run_id, bin, lo + bin * w AS bin_lo_ms, lo + (bin + 1) * w AS bin_hi_ms, COUNT(*) AS n
+        FROM (
+            SELECT tx.run_id, b.lo, b.w,
+                   CASE WHEN b.w > 0 THEN LEAST(floor((tx.lat - b.lo) / b.w)::INTEGER, {bins - 1}) ELSE 0 END AS bin
+            FROM tx JOIN b USING (run_id) WHERE tx.lat IS NOT NULL
+        )
+        GROUP BY run_id, bin, lo, w;""",
+        _stats_insert("exact", "quantile_cont", f" WHERE n <= {LATENCY_EXACT_MAX}"),
+        _stats_insert("approx", "approx_quantile", f" WHERE n > {LATENCY_EXACT_MAX}"),
+        "DROP TABLE run_stats_keys;",
+    ]
+
+
+# dijalankan setelah upsert bench_tx (lihat tools_db.TABLE_AFTER)
+RUN_STATS_SYNC_SQL = run_stats_sql("SELECT DISTINCT run_id FROM upsert_delta")
+
+
+def ensure_run_stats(con) -> None:
+    """Buat tabel metrik per run dan isi penuh dari bench_tx (DB lama). Dipanggil di transaksi migrasi."""
+    for ddl in RUN_STATS_DDL:
+        con.execute(ddl)
+    for sql in run_stats_sql("SELECT DISTINCT run_id FROM bench_tx"):
+        con.execute(sql)
@@ -0,0 +1,148 @@
+"""
+Tabel rollup (agregat per bucket waktu) untuk dashboard, dirawat di transaksi upsert yang sama
+(tools_ingest.upsert_source): grup yang tersentuh batch — versi lama & baru barisnya — dihapus
+lalu dihitung ulang dari tabel fakta, jadi MIN/MAX/arg_min tetap tepat walau baris di-update.
+
+Kolom bucket bernama `timestamp` (date_trunc dari timestamp baris), sehingga WHERE dari
+filter halaman bisa dipakai apa adanya selama kolomnya ada di rollup dan batas tanggalnya
+pas dengan grain (lihat rollup_ok).
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+GRAIN_STEP = {"day": timedelta(days=1), "hour": timedelta(hours=1)}
+
+
+@dataclass(frozen=True)
+class Rollup:
+    name: str
+    base: str
+    grain: str
+    keys: tuple
+    measures: tuple  # (kolom, tipe, ekspresi agregat)
+
+    @property
+    def columns(self) -> list:
+        return ["timestamp"] + list(self.keys) + [m[0] for m in self.measures]
+
+    def ddl(self, key_types: dict) -> str:
+        cols = ["timestamp TIMESTAMP"] + [f"{k} {key_types.get(k, 'TEXT')}" for k in self.keys]
+        cols += [f"{c} {t}" for c, t, _ in self.measures]
+        return f"CREATE TABLE IF NOT EXISTS {self.name} ({', '.join(cols)});"
+
+    def select(self, where: str = "") -> str:
+        cols = [f"date_trunc('{self.grain}', timestamp) AS timestamp", *self.keys]
+        cols += [f"{expr} AS {c}" for c, _, expr in self.measures]
+        return f"SELECT {', '.join(cols)} FROM {self.base} {where} GROUP BY ALL"
+
+
+_COST = "COALESCE(cost_idr, 0)"
+_VISION_KEYS = ("network", "contract", "function_name")
+_VISION_MEASURES = (
+    ("n", "BIGINT", "COUNT(*)"),
+    ("cost_idr", "DOUBLE", f"SUM({_COST})"),
+    ("cost_eth", "DOUBLE", "SUM(COALESCE(cost_eth, 0))"),
+    ("gas_used", "BIGINT", "SUM(gas_used)"),
+    ("ts_min", "TIMESTAMP", "MIN(timestamp)"),
+    ("ts_max", "TIMESTAMP", "MAX(timestamp)"),
+)
+
+VISION_DAILY = Rollup("vision_costs_daily", "vision_costs", "day", _VISION_KEYS, _VISION_MEASURES)
+# hourly: + titik min/max biaya per jam untuk line chart yang di-downsample
+VISION_HOURLY = Rollup("vision_costs_hourly", "vision_costs", "hour", _VISION_KEYS, _VISION_MEASURES + (
+    ("cost_min", "DOUBLE", f"MIN({_COST})"),
+    ("ts_cost_min", "TIMESTAMP", f"arg_min(timestamp, {_COST})"),
+    ("cost_max", "DOUBLE", f"MAX({_COST})"),
+    ("ts_cost_max", "TIMESTAMP", f"arg_max(timestamp, {_COST})"),
+))
+SWC_DAILY = Rollup("swc_findings_daily", "swc_findings", "day", ("network", "severity", "swc_id"), (
+    ("n", "BIGINT", "COUNT(*)"),
+    ("ts_min", "TIMESTAMP", "MIN(timestamp)"),
+    ("ts_max", "TIMESTAMP", "MAX(timestamp)"),
+))
+BENCH_DAILY = Rollup("bench_runs_daily", "bench_runs", "day", ("network", "scenario", "function_name"), (
+    ("n", "BIGINT", "COUNT(*)"),
+    ("tps_peak_max", "DOUBLE", "MAX(tps_peak)"),
+    ("p95_sum", "DOUBLE", "SUM(p95_ms)"),
+    ("p95_n", "BIGINT", "COUNT(p95_ms)"),
+    ("succ_sum", "DOUBLE", "SUM(COALESCE(success_rate, 0))"),
+    ("ts_min", "TIMESTAMP", "MIN(timestamp)"),
+    ("ts_max", "TIMESTAMP", "MAX(timestamp)"),
+))
+
+ROLLUPS = {}
+for _r in (VISION_DAILY, VISION_HOURLY, SWC_DAILY, BENCH_DAILY):
+    ROLLUPS.setdefault(_r.base, []).append(_r)
+ROLLUP_TABLES = [r.name for rs in ROLLUPS.values() for r in rs]
+
+
+def ensure_rollups(con) -> None:
+    """Buat tabel rollup yang belum ada dan isi penuh dari tabel faktanya (DB lama)."""
+    existing = {r[0] for r in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+    for rs in ROLLUPS.values():
+        for r in rs:
+            if r.name in existing:
+                continue
+            key_types = {row[1]: row[2] for row in con.execute(f"PRAGMA table_info('{r.base}')").fetchall()}
+            con.execute(r.ddl(key_types))
+            con.execute(f"INSERT INTO {r.name} {r.select()};")
+
+
+def refresh_rollups(con, base: str, sources: list) -> None:
+    """
+    Hitung ulang grup rollup `base` yang disentuh baris di `sources` (subquery/tabel dengan
+    kolom tabel fakta — mis. versi lama & baru baris yang di-upsert). Dipanggil di dalam transaksi.
+    """
+    for r in ROLLUPS.get(base, ()):
+        keys = ["timestamp", *r.keys]
+        sel = ", ".join([f"date_trunc('{r.grain}', timestamp) AS timestamp", *r.keys])
+        con.execute(
+            "CREATE OR REPLACE TEMP TABLE rollup_keys AS "
+            + " UNION ".join(f"SELECT {sel} FROM {s}" for s in sources)
+        )
+        lo, hi, has_null = con.execute(
+            "SELECT MIN(timestamp), MAX(timestamp), bool_or(timestamp IS NULL) FROM rollup_keys"
+        ).fetchone()
+        match = " AND ".join(f"r.{k} IS NOT DISTINCT FROM k.{k}" for k in keys)
+        con.execute(f"DELETE FROM {r.name} r USING rollup_keys k WHERE {match};")
+        # scan tabel fakta hanya di rentang waktu yang tersentuh
+        conds, params = [], []
+        if lo is not None:
+            conds.append("(timestamp >= ? AND timestamp < ?)")
+            params += [lo, hi + GRAIN_STEP[r.grain]]
+        if has_null:
+            conds.append("timestamp IS NULL")
+        if conds:
+            con.execute(f"""
+                INSERT INTO {r.name}
+                SELECT r.* FROM ({r.select("WHERE " + " OR ".join(conds))}) r
+                SEMI JOIN rollup_keys k ON {match};
+            """, params)
+        con.execute("DROP TABLE rollup_keys;")
+
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_IDENT_RE = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+_SQL_WORDS = {"where", "and", "or", "not", "is", "null", "in", "between", "true", "false",
+              "coalesce", "nullif", "lower", "upper", "trim"}
+
+
+def rollup_ok(rollup: Rollup, where: str, params) -> bool:
+    """
+    True kalau filter `where`/params bisa dijawab `rollup` dengan hasil sama: hanya memakai
+    kolom key/bucket rollup dan semua batas waktu pas di awal bucket (grain).
+    """
+    allowed = {"timestamp", *rollup.keys}
+    for ident in _IDENT_RE.findall(_LITERAL_RE.sub("''", where or "")):
+        if ident.lower() not in _SQL_WORDS and ident not in allowed:
+            return False
+    for p in params or ():
+        if isinstance(p, datetime) and p != _trunc(p, rollup.grain):
+            return False
+    return True
+
+
+def _trunc(ts: datetime, grain: str) -> datetime:
+    ts = ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0) if grain == "day" else ts
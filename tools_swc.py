@@ -0,0 +1,191 @@
+"""
+Query Security (SWC) di DuckDB tanpa Streamlit: filter halaman -> WHERE berparameter, heatmap
+SWC-ID × severity, jumlah per severity dan tabel detail dihitung di SQL. Severity & confidence
+sudah dinormalisasi saat ingest (tools_ingest.map_swc), jadi di sini tinggal dibaca.
+Hitungan dibaca dari rollup swc_findings_daily kalau filternya memungkinkan (rollup_ok).
+KB SWC (swc_kb.json + draft kontribusi pending_kb/*.json) dimuat sebagai dict per SWC-ID.
+"""
+import glob
+import json
+import os
+
+from tools_db import date_range_conds, where_sql
+from tools_files import cached_files
+from tools_rollup import SWC_DAILY, rollup_ok
+
+SEVERITY_ORDER = ["critical", "high", "medium", "low", "informational"]
+SEV_UNKNOWN = "(unknown)"
+SEV_SQL = f"COALESCE(severity, '{SEV_UNKNOWN}')"
+# urutan severity (1 = critical); NULL untuk nilai di luar SEVERITY_ORDER
+SEV_RANK_SQL = "NULLIF(list_position([" + ", ".join(f"'{s}'" for s in SEVERITY_ORDER) + "], {col}), 0)"
+
+
+def swc_where(date_range=None, network: str = None, severity: str = None) -> tuple:
+    """(klausa WHERE, params) dari filter halaman; None = semua."""
+    conds, params = date_range_conds(date_range)
+    if network is not None:
+        conds.append("network = ?")
+        params.append(network)
+    if severity is not None:
+        conds.append(f"{SEV_SQL} = ?")
+        params.append(severity)
+    return where_sql(conds), params
+
+
+def _counts(where: str, params: list, filt: str = "") -> tuple:
+    """
+    (sumber, ekspresi jumlah baris [FILTER filt]): rollup harian kalau filter memungkinkan,
+    selain itu tabel fakta.
+    """
+    filt = f" FILTER (WHERE {filt})" if filt else ""
+    if rollup_ok(SWC_DAILY, where, params):
+        return SWC_DAILY.name, f"COALESCE(SUM(n){filt}, 0)::BIGINT"
+    return "swc_findings", f"COUNT(*){filt}"
+
+
+def swc_overview(con) -> dict:
+    rows, ts_min, ts_max = con.execute(
+        f"SELECT COALESCE(SUM(n), 0), MIN(ts_min), MAX(ts_max) FROM {SWC_DAILY.name}"
+    ).fetchone()
+    nets = [r[0] for r in con.execute(
+        f"SELECT DISTINCT network FROM {SWC_DAILY.name} WHERE network IS NOT NULL ORDER BY 1"
+    ).fetchall()]
+    sevs = [r[0] for r in con.execute(f"SELECT DISTINCT {SEV_SQL} FROM {SWC_DAILY.name} ORDER BY 1").fetchall()]
+    return {"rows": rows, "ts_min": ts_min, "ts_max": ts_max, "networks": nets, "severities": sevs}
+
+
+def swc_metrics(con, where: str, params: list) -> tuple:
+    """(total temuan, severity high, SWC-ID unik) untuk filter `where`."""
+    src, count = _counts(where, params)
+    _, high = _counts(where, params, "severity = 'high'")
+    return con.execute(f"SELECT {count}, {high}, COUNT(DISTINCT swc_id) FROM {src} {where}", params).fetchone()
+
+
+def swc_heatmap(con, where: str, params: list):
+    """Matriks count SWC-ID (index) × severity (kolom), 0 untuk kombinasi kosong."""
+    src, count = _counts(where, params)
+    counts = con.execute(f"""
+        SELECT swc_id, {SEV_SQL} AS sev, {count} AS n
+        FROM {src} {where}
+        GROUP BY ALL HAVING swc_id IS NOT NULL
+    """, params).df()
+    return counts.pivot(index="swc_id", columns="sev", values="n").fillna(0).astype("int64")
+
+
+def swc_by_severity(con, where: str, params: list):
+    src, count = _counts(where, params)
+    return con.execute(f"""
+        SELECT {SEV_SQL} AS sev, {count} AS size
+        FROM {src} {where}
+        GROUP BY 1 ORDER BY {SEV_RANK_SQL.format(col="sev")} NULLS LAST, sev
+    """, params).df()
+
+
+def swc_ids(con, where: str, params: list) -> list:
+    src, _ = _counts(where, params)
+    return [r[0] for r in con.execute(
+        f"SELECT DISTINCT swc_id FROM {src} {where} ORDER BY 1", params
+    ).fetchall() if r[0] is not None]
+
+
+def swc_rows_sql(where: str = "") -> str:
+    return f"SELECT * FROM swc_findings {where} ORDER BY timestamp DESC"
+
+
+def swc_detail_sql(where: str) -> str:
+    """
+    SELECT tabel detail siap tampil (tanpa ORDER BY): teks kosong -> '', severity di luar
+    SEVERITY_ORDER -> NULL, line 0/0 -> NULL, confidence 2 desimal.
+    """
+    return f"""
+        SELECT COALESCE(finding_id, '') AS finding_id,
+               strftime(timestamp, '%Y-%m-%d %H:%M:%S') AS timestamp,
+               COALESCE(network, '') AS network, COALESCE(contract, '') AS contract,
+               COALESCE(file, '') AS file,
+               CASE WHEN COALESCE(line_start, 0) = 0 AND COALESCE(line_end, 0) = 0
+                    THEN NULL ELSE COALESCE(line_start, 0) END AS line_start,
+               CASE WHEN COALESCE(line_start, 0) = 0 AND COALESCE(line_end, 0) = 0
+                    THEN NULL ELSE COALESCE(line_end, 0) END AS line_end,
+               COALESCE(swc_id, '') AS swc_id, COALESCE(title, '') AS title,
+               CASE WHEN {SEV_RANK_SQL.format(col="severity")} IS NOT NULL THEN severity END AS severity,
+               round(confidence, 2) AS confidence,
+               COALESCE(status, '') AS status, COALESCE(remediation, '') AS remediation,
+               COALESCE(commit_hash, '') AS commit_hash
+        FROM swc_findings {where}
+    """
+
+
+DETAIL_DTYPES = {"line_start": "Int64", "line_end": "Int64"}
+
+
+def swc_detail_export_sql(where: str) -> str:
+    """swc_detail_sql urut severity lalu waktu terbaru (tabel detail lengkap / export CSV)."""
+    return (
+        swc_detail_sql(where)
+        + f" ORDER BY {SEV_RANK_SQL.format(col='swc_findings.severity')} NULLS LAST, swc_findings.timestamp DESC"
+    )
+
+
+# -------------------------------
+# Knowledge base SWC
+# -------------------------------
+SWC_KB_PATH = os.getenv("SWC_KB_PATH", "swc_kb.json")
+SWC_KB_PENDING_DIR = os.getenv("SWC_KB_PENDING_DIR", "pending_kb")
+
+
+def parse_swc_kb(data) -> dict:
+    """
+    Isi JSON KB -> {SWC-ID: {title, description, mitigation}}. Format:
+      1) list objek {id, title, description, mitigation}
+      2) dict per SWC-ID {title, description|impact, mitigation|fix[]}
+    """
+    out = {}
+    if isinstance(data, list):
+        for item in data:
+            sid = str(item.get("id", "")).strip()
+            if not sid:
+                continue
+            out[sid] = {
+                "title": item.get("title", ""),
+                "description": item.get("description", ""),
+                "mitigation": item.get("mitigation", ""),
+            }
+    elif isinstance(data, dict):
+        for sid, val in data.items():
+            out[str(sid)] = {
+                "title": val.get("title", ""),
+                "description": val.get("description", val.get("impact", "")),
+                "mitigation": (
+                    val.get("mitigation")
+                    if isinstance(val.get("mitigation"), str)
+                    else "\n".join(val.get("fix", [])) if isinstance(val.get("fix"), list) else ""
+                ),
+            }
+    return out
+
+
+def _read_kb(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_swc_kb(json.load(f))
+    except Exception:
+        return {}
+
+
+def _build_kb(paths: list) -> dict:
+    # paths[0] = KB utama; draft pending hanya mengisi SWC-ID yang belum ada (ditandai pending)
+    kb = _read_kb(paths[0])
+    for path in paths[1:]:
+        for sid, entry in _read_kb(path).items():
+            if sid not in kb:
+                kb[sid] = dict(entry, pending=os.path.basename(path))
+    return kb
+
+
+def load_swc_kb(path: str = SWC_KB_PATH, pending_dir: str = SWC_KB_PENDING_DIR) -> dict:
+    """
+    KB SWC: dict SWC-ID -> {title, description, mitigation[, pending]}. Di-cache per
+    (path, mtime_ns, size) semua file; hanya dibaca ulang kalau ada file yang berubah/bertambah.
+    """
+    paths = [path] + sorted(glob.glob(os.path.join(pending_dir, "*.json")))
+    return cached_files(("swc_kb", path, pending_dir), paths, _build_kb)
@@ -0,0 +1,140 @@
+"""
+Tabel detail berhalaman (server-side): hanya baris halaman yang terlihat yang diambil dari DuckDB
+dan dikirim ke browser. Pagination keyset pada (kolom urut, key) — tanpa OFFSET, jadi halaman
+ke-1000 sama murahnya dengan halaman pertama; urutan dikerjakan di SQL.
+"""
+import math
+
+import pandas as pd
+import streamlit as st
+
+from tools_db import and_where
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+SORT_COL = "_sort_value"
+
+
+def _py(v):
+    """Nilai pandas/numpy -> objek Python untuk parameter DuckDB (NaN/NaT -> None)."""
+    if v is None or (not isinstance(v, (list, tuple)) and pd.isna(v)):
+        return None
+    if hasattr(v, "to_pydatetime"):
+        return v.to_pydatetime()
+    if hasattr(v, "item"):
+        return v.item()
+    return v
+
+
+def keyset_cond(order: str, key_cols: list, after: tuple, desc: bool) -> tuple:
+    """
+    (kondisi, params) baris sesudah `after` = (nilai urut, *key) pada urutan
+    `order` ASC/DESC NULLS LAST lalu key searah.
+    """
+    op = "<" if desc else ">"
+    keys = "(" + ", ".join(key_cols) + ")"
+    marks = "(" + ", ".join("?" for _ in key_cols) + ")"
+    value, key_vals = after[0], list(after[1:])
+    if value is None:
+        # sudah di blok NULL (paling akhir): tinggal urut key
+        return f"({order} IS NULL AND {keys} {op} {marks})", key_vals
+    return (
+        f"({order} {op} ? OR ({order} = ? AND {keys} {op} {marks}) OR {order} IS NULL)",
+        [value, value] + key_vals,
+    )
+
+
+def fetch_page(con, source: str, where: str, params: list, order: str, key_cols: list,
+               page_size: int, after: tuple = None, desc: bool = False) -> tuple:
+    """
+    Satu halaman dari `source` (tabel atau subquery ber-alias) -> (DataFrame, cursor halaman
+    berikutnya atau None). after: cursor dari halaman sebelumnya (None = halaman pertama).
+    """
+    params = list(params)
+    if after is not None:
+        cond, cond_params = keyset_cond(order, key_cols, after, desc)
+        where = and_where(where, cond)
+        params += cond_params
+    direction = "DESC" if desc else "ASC"
+    order_by = ", ".join([f"{SORT_COL} {direction} NULLS LAST"] + [f"{k} {direction}" for k in key_cols])
+    df = con.execute(
+        f"SELECT *, {order} AS {SORT_COL} FROM {source} {where} ORDER BY {order_by} LIMIT ?",
+        params + [int(page_size) + 1],
+    ).df()
+    nxt = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        nxt = tuple(_py(last[c]) for c in [SORT_COL] + list(key_cols))
+    return df.drop(columns=[SORT_COL]), nxt
+
+
+def _go(state_key: str, step: int) -> None:
+    s = st.session_state[state_key]
+    if step > 0 and s["next"] is not None:
+        s["cursors"].append(s["next"])
+    elif step < 0 and len(s["cursors"]) > 1:
+        s["cursors"].pop()
+    elif step == 0:
+        s["cursors"] = [None]
+
+
+def paged_table(con, key: str, source: str, where: str = "", params: list = (), key_cols=("id",),
+                sort_options: dict = None, default_sort: str = "timestamp", default_desc: bool = True,
+                total: int = None, dtypes: dict = None, prepare=None, column_config: dict = None) -> pd.DataFrame:
+    """
+    Tabel detail berhalaman dengan kontrol urut & ukuran halaman. sort_options: label -> ekspresi
+    SQL (default: semua kolom `source`); total: jumlah baris kalau sudah diketahui pemanggil
+    (selain itu COUNT(*) dengan filter yang sama); dtypes: astype untuk tampilan; prepare:
+    fungsi DataFrame halaman -> DataFrame yang ditampilkan (kolom turunan, pilih kolom);
+    column_config: diteruskan ke st.dataframe. Return DataFrame halaman yang tampil.
+    """
+    params = list(params)
+    if sort_options is None:
+        cols = con.execute(f"SELECT * FROM {source} LIMIT 0").df().columns
+        sort_options = {c: f'"{c}"' for c in cols}
+    labels = list(sort_options)
+
+    c1, c2, c3 = st.columns([2, 1, 1])
+    sort_label = c1.selectbox(
+        "Urutkan", labels, key=f"{key}_sort",
+        index=labels.index(default_sort) if default_sort in labels else 0,
+    )
+    desc = c2.selectbox(
+        "Arah", ["Turun", "Naik"], index=0 if default_desc else 1, key=f"{key}_dir"
+    ) == "Turun"
+    page_size = c3.selectbox("Baris/halaman", PAGE_SIZES, index=1, key=f"{key}_size")
+
+    # filter/urutan/ukuran berubah -> kembali ke halaman pertama
+    state_key = f"{key}_pages"
+    sig = (source, where, tuple(map(str, params)), sort_label, desc, page_size)
+    s = st.session_state.get(state_key)
+    if s is None or s["sig"] != sig:
+        s = st.session_state[state_key] = {"sig": sig, "cursors": [None], "next": None}
+
+    df, s["next"] = fetch_page(
+        con, source, where, params, sort_options[sort_label], list(key_cols),
+        page_size, after=s["cursors"][-1], desc=desc,
+    )
+    if total is None:
+        total = con.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+    if dtypes:
+        df = df.astype(dtypes)
+    page = len(s["cursors"]) - 1
+    start = page * page_size
+    df.index = pd.RangeIndex(start, start + len(df))
+    if prepare is not None:
+        df = prepare(df)
+
+    st.dataframe(df, use_container_width=True, column_config=column_config)
+    n1, n2, n3, n4 = st.columns([1, 1, 1, 3])
+    n1.button("⏮ Awal", key=f"{key}_first", on_click=_go, args=(state_key, 0),
+              disabled=page == 0, use_container_width=True)
+    n2.button("◀ Sebelumnya", key=f"{key}_prev", on_click=_go, args=(state_key, -1),
+              disabled=page == 0, use_container_width=True)
+    n3.button("Berikutnya ▶", key=f"{key}_next", on_click=_go, args=(state_key, 1),
+              disabled=s["next"] is None, use_container_width=True)
+    n4.caption(
+        f"Baris {start + 1 if len(df) else 0:,}–{start + len(df):,} dari {total:,} · "
+        f"halaman {page + 1:,} / {max(1, math.ceil(total / page_size)):,}"
+    )
+    return df
@@ -0,0 +1,264 @@
+"""
+Query Cost (Vision) di DuckDB tanpa Streamlit: filter halaman dikompilasi jadi WHERE berparameter,
+metrik / agregat / top-N dihitung di SQL — yang masuk ke pandas hanya hasil seukuran chart/tabel.
+Agregat dibaca dari rollup vision_costs_daily/_hourly kalau filternya memungkinkan (rollup_ok).
+"""
+import os
+
+from tools_db import and_where, date_range_conds, where_sql
+from tools_rollup import VISION_DAILY, VISION_HOURLY, rollup_ok
+
+UNPARSED_LABEL = "⚠ Unparsed Function"
+
+# budget titik line chart biaya vs waktu (di atas ini di-downsample min/max per bucket waktu)
+SERIES_POINTS = int(os.getenv("EDA_CHART_POINTS", "4000"))
+SERIES_POINT_OPTIONS = sorted({1000, 2000, 4000, 8000, 16000, SERIES_POINTS})
+SMOOTH_WINDOW = 7
+
+# sama dengan fillna(UNPARSED_LABEL).replace({"(unknown)": UNPARSED_LABEL}) versi pandas
+FN_SQL = f"COALESCE(NULLIF(function_name, '(unknown)'), '{UNPARSED_LABEL}')"
+
+
+def vision_where(date_range=None, network: str = None, fn: str = None,
+                 hide_unparsed: bool = False) -> tuple:
+    """
+    (klausa WHERE, params) dari filter halaman. date_range: (start, end) date, end inklusif;
+    network/fn None = semua; hide_unparsed membuang baris UNPARSED_LABEL.
+    """
+    conds, params = date_range_conds(date_range)
+    if network is not None:
+        conds.append("network = ?")
+        params.append(network)
+    if fn is not None:
+        conds.append(f"{FN_SQL} = ?")
+        params.append(fn)
+    if hide_unparsed:
+        conds.append(f"{FN_SQL} <> ?")
+        params.append(UNPARSED_LABEL)
+    return where_sql(conds), params
+
+
+def vision_summary(con) -> dict:
+    rows, total_idr, ts_min, ts_max = con.execute(f"""
+        SELECT COALESCE(SUM(n), 0), COALESCE(SUM(cost_idr), 0), MIN(ts_min), MAX(ts_max)
+        FROM {VISION_DAILY.name}
+    """).fetchone()
+    uniq_tx = con.execute("SELECT COUNT(DISTINCT tx_hash) FROM vision_costs").fetchone()[0]
+    return {"rows": rows, "unique_tx": uniq_tx, "total_idr": total_idr, "ts_min": ts_min, "ts_max": ts_max}
+
+
+def vision_options(con) -> tuple:
+    """(daftar network, daftar function) untuk selectbox filter."""
+    nets = [r[0] for r in con.execute(
+        f"SELECT DISTINCT network FROM {VISION_DAILY.name} WHERE network IS NOT NULL ORDER BY 1"
+    ).fetchall()]
+    fns = [r[0] for r in con.execute(f"SELECT DISTINCT {FN_SQL} FROM {VISION_DAILY.name} ORDER BY 1").fetchall()]
+    return nets, fns
+
+
+def vision_unparsed_stats(con, where: str, params: list) -> tuple:
+    """(jumlah baris, jumlah unparsed) untuk filter `where`."""
+    if rollup_ok(VISION_DAILY, where, params):
+        sql = f"""
+            SELECT COALESCE(SUM(n), 0), COALESCE(SUM(n) FILTER (WHERE {FN_SQL} = ?), 0)
+            FROM {VISION_DAILY.name} {where}
+        """
+    else:
+        sql = f"SELECT COUNT(*), COUNT(*) FILTER (WHERE {FN_SQL} = ?) FROM vision_costs {where}"
+    return con.execute(sql, [UNPARSED_LABEL] + params).fetchone()
+
+
+def vision_cost_by_fn(con, where: str, params: list, limit: int = 15):
+    if rollup_ok(VISION_DAILY, where, params):
+        src, cost = VISION_DAILY.name, "cost_idr"
+    else:
+        src, cost = "vision_costs", "COALESCE(cost_idr, 0)"
+    return con.execute(f"""
+        SELECT {FN_SQL} AS fn, SUM({cost}) AS cost_idr_num
+        FROM {src} {where}
+        GROUP BY 1 ORDER BY cost_idr_num DESC, fn LIMIT ?
+    """, params + [int(limit)]).df()
+
+
+def _series_sql(where: str, smooth: bool = False, x_range=None) -> str:
+    """
+    Baris (ts, network, cost_idr_num) timestamp tidak null. smooth: rata-rata bergerak
+    SMOOTH_WINDOW titik per network (window SQL); x_range: potong waktu setelah smoothing.
+    """
+    y = "COALESCE(cost_idr, 0)"
+    if smooth:
+        y = (f"avg({y}) OVER (PARTITION BY network ORDER BY timestamp, id "
+             f"ROWS BETWEEN {SMOOTH_WINDOW - 1} PRECEDING AND CURRENT ROW)")
+    sql = (f"SELECT timestamp AS ts, network, {y} AS cost_idr_num "
+           f"FROM vision_costs {and_where(where, 'timestamp IS NOT NULL')}")
+    if x_range is not None:
+        sql = f"SELECT * FROM ({sql}) s WHERE ts BETWEEN ? AND ?"
+    return sql
+
+
+def _series_params(params: list, x_range) -> list:
+    return list(params) + (list(x_range) if x_range is not None else [])
+
+
+def vision_series_range(con, where: str, params: list) -> tuple:
+    """(jumlah titik, ts min, ts max) series untuk filter `where`."""
+    if rollup_ok(VISION_DAILY, where, params):
+        return con.execute(f"""
+            SELECT COALESCE(SUM(n), 0), MIN(ts_min), MAX(ts_max)
+            FROM {VISION_DAILY.name} {and_where(where, "timestamp IS NOT NULL")}
+        """, params).fetchone()
+    return con.execute(f"""
+        SELECT COUNT(*), MIN(timestamp), MAX(timestamp)
+        FROM vision_costs {and_where(where, "timestamp IS NOT NULL")}
+    """, params).fetchone()
+
+
+def vision_series(con, where: str, params: list, smooth: bool = False,
+                  max_points: int = SERIES_POINTS, x_range=None) -> tuple:
+    """
+    Titik line chart biaya vs waktu -> (DataFrame ts/network/cost_idr_num urut waktu, jumlah titik asli).
+    Kalau lebih dari max_points: per network, rentang waktu dibagi rata jadi bucket dan tiap
+    bucket diwakili titik min & max-nya (puncak/lembah tetap terlihat). Bucket >= 1 jam tanpa
+    smoothing/zoom dibaca dari rollup per jam (titik min/max tiap jam).
+    """
+    hourly = not smooth and x_range is None and rollup_ok(VISION_HOURLY, where, params)
+    sql = _series_sql(where, smooth, x_range)
+    all_params = _series_params(params, x_range)
+    if hourly:
+        n, n_net, lo, hi = con.execute(f"""
+            SELECT COALESCE(SUM(n), 0), COUNT(DISTINCT network), epoch_us(MIN(ts_min)), epoch_us(MAX(ts_max))
+            FROM {VISION_HOURLY.name} {and_where(where, "timestamp IS NOT NULL")}
+        """, params).fetchone()
+    else:
+        n, n_net, lo, hi = con.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT network), epoch_us(MIN(ts)), epoch_us(MAX(ts)) FROM ({sql}) s",
+            all_params,
+        ).fetchone()
+    if not max_points or n <= max_points:
+        return con.execute(f"SELECT * FROM ({sql}) s ORDER BY ts", all_params).df(), n
+
+    buckets = max(1, max_points // (2 * max(n_net, 1)))
+    width = max((hi - lo) / buckets, 1.0)
+    if hourly and width >= 3600 * 1e6:
+        points = f"""
+            SELECT network, timestamp AS ts,
+                   cost_min, ts_cost_min, cost_max, ts_cost_max
+            FROM {VISION_HOURLY.name} {and_where(where, "timestamp IS NOT NULL")}
+        """
+    else:
+        points = f"""
+            SELECT network, ts, cost_idr_num AS cost_min, ts AS ts_cost_min,
+                   cost_idr_num AS cost_max, ts AS ts_cost_max
+            FROM ({sql}) s
+        """
+        params = all_params
+    df = con.execute(f"""
+        WITH g AS (
+            SELECT network,
+                   arg_min(ts_cost_min, cost_min) AS t_min, min(cost_min) AS y_min,
+                   arg_max(ts_cost_max, cost_max) AS t_max, max(cost_max) AS y_max
+            FROM ({points}) p
+            GROUP BY network, LEAST(floor((epoch_us(ts) - ?) / ?)::BIGINT, ?)
+        )
+        SELECT t_min AS ts, network, y_min AS cost_idr_num FROM g
+        UNION
+        SELECT t_max, network, y_max FROM g
+        ORDER BY ts, network
+    """, params + [lo, width, buckets - 1]).df()
+    return df, n
+
+
+def vision_series_median(con, where: str, params: list, smooth: bool = False, x_range=None) -> float:
+    """Median biaya dari semua titik series (bukan hasil downsample)."""
+    return con.execute(
+        f"SELECT median(cost_idr_num) FROM ({_series_sql(where, smooth, x_range)}) s",
+        _series_params(params, x_range),
+    ).fetchone()[0]
+
+
+SCATTER_WHERE = "COALESCE(gas_used, 0) > 0 AND COALESCE(gas_price_wei, 0) > 0"
+# mode scatter: titik SVG -> WebGL di atas SCATTER_GL_POINTS -> grid density di atas SCATTER_POINTS
+SCATTER_GL_POINTS = 2000
+SCATTER_POINTS = int(os.getenv("EDA_SCATTER_POINTS", "50000"))
+SCATTER_BINS = 60
+OUTLIER_LIMIT = 500
+# sama dengan short_tx di app: 6 karakter awal … 4 akhir
+TX_SHORT_SQL = ("CASE WHEN length(tx_hash) > 12 THEN left(tx_hash, 6) || '…' || right(tx_hash, 4) "
+                "ELSE COALESCE(tx_hash, '') END")
+SCATTER_COLS = f"""network, {FN_SQL} AS fn, tx_hash, {TX_SHORT_SQL} AS tx_short,
+               COALESCE(cost_idr, 0) AS cost_idr_num,
+               gas_used AS gas_used_num, gas_price_wei AS gas_price_num"""
+
+
+def vision_scatter_count(con, where: str, params: list) -> int:
+    return con.execute(
+        f"SELECT COUNT(*) FROM vision_costs {and_where(where, SCATTER_WHERE)}", params
+    ).fetchone()[0]
+
+
+def vision_scatter(con, where: str, params: list):
+    """Baris untuk scatter gas used vs gas price (hanya yang gas > 0)."""
+    return con.execute(f"""
+        SELECT {SCATTER_COLS}
+        FROM vision_costs {and_where(where, SCATTER_WHERE)}
+        ORDER BY timestamp DESC
+    """, params).df()
+
+
+def vision_cost_iqr_threshold(con, where: str, params: list) -> float:
+    """Batas outlier biaya (Q3 + 1.5 IQR, kuantil linear seperti pandas) atas baris scatter."""
+    q1, q3 = con.execute(f"""
+        SELECT quantile_cont(COALESCE(cost_idr, 0), 0.25), quantile_cont(COALESCE(cost_idr, 0), 0.75)
+        FROM vision_costs {and_where(where, SCATTER_WHERE)}
+    """, params).fetchone()
+    return None if q1 is None else q3 + 1.5 * (q3 - q1)
+
+
+def vision_scatter_outliers(con, where: str, params: list, threshold: float, limit: int = OUTLIER_LIMIT):
+    """Outlier biaya (> threshold) untuk overlay, termahal dulu, maks `limit` baris."""
+    return con.execute(f"""
+        SELECT {SCATTER_COLS}
+        FROM vision_costs {and_where(and_where(where, SCATTER_WHERE), "COALESCE(cost_idr, 0) > ?")}
+        ORDER BY cost_idr_num DESC LIMIT ?
+    """, params + [threshold, int(limit)]).df()
+
+
+def vision_scatter_density(con, where: str, params: list, bins: int = SCATTER_BINS,
+                           log_x: bool = False, log_y: bool = False):
+    """
+    Agregat grid bins × bins gas used × gas price (di ruang log kalau skala log) ->
+    DataFrame ix, iy, x, y (titik tengah sel), n, cost_idr_num (total biaya per sel).
+    """
+    bins = int(bins)
+    fx = "log10(gas_used)" if log_x else "gas_used::DOUBLE"
+    fy = "log10(gas_price_wei)" if log_y else "gas_price_wei::DOUBLE"
+    df = con.execute(f"""
+        WITH s AS (
+            SELECT {fx} AS x, {fy} AS y, COALESCE(cost_idr, 0) AS cost
+            FROM vision_costs {and_where(where, SCATTER_WHERE)}
+        ),
+        e AS (SELECT min(x) AS x0, max(x) - min(x) AS wx, min(y) AS y0, max(y) - min(y) AS wy FROM s)
+        SELECT LEAST(COALESCE(floor((x - x0) / NULLIF(wx, 0) * {bins}), 0), {bins - 1})::INT AS ix,
+               LEAST(COALESCE(floor((y - y0) / NULLIF(wy, 0) * {bins}), 0), {bins - 1})::INT AS iy,
+               COUNT(*) AS n, SUM(cost) AS cost_idr_num,
+               any_value(x0) AS x0, any_value(wx) AS wx, any_value(y0) AS y0, any_value(wy) AS wy
+        FROM s, e
+        GROUP BY ix, iy ORDER BY iy, ix
+    """, params).df()
+    x = df["x0"] + (df["ix"] + 0.5) * df["wx"] / bins
+    y = df["y0"] + (df["iy"] + 0.5) * df["wy"] / bins
+    df["x"] = 10 ** x if log_x else x
+    df["y"] = 10 ** y if log_y else y
+    return df[["ix", "iy", "x", "y", "n", "cost_idr_num"]]
+
+
+def vision_top_cost(con, where: str, params: list, limit: int = 15):
+    return con.execute(f"""
+        SELECT *, {FN_SQL} AS fn, COALESCE(cost_idr, 0) AS cost_idr_num
+        FROM vision_costs {and_where(where, SCATTER_WHERE)}
+        ORDER BY cost_idr_num DESC LIMIT ?
+    """, params + [int(limit)]).df()
+
+
+def vision_rows_sql(where: str = "", cols: str = "*") -> str:
+    return f"SELECT {cols} FROM vision_costs {where} ORDER BY timestamp DESC"
@@ -0,0 +1,149 @@
+"""
+Watch-folder: pantau satu direktori dan ingest hanya baris yang baru di-append ke file collector
+(vision_costs*.ndjson, swc_findings*.ndjson/csv, bench_runs*.csv, bench_tx*.csv) lewat
+tools_ingest.ingest_path — upsert yang sama dengan app/CLI.
+
+Offset byte per file disimpan di ingest_offsets dan baru maju setelah upsert commit, jadi
+restart melanjutkan dari posisi terakhir; batch yang terulang setelah crash hanya di-upsert
+ulang per key (tidak dobel). Hanya baris lengkap (diakhiri newline) yang dibaca; header CSV
+diingat supaya potongan berikutnya tetap bisa di-parse.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+import duckdb
+
+from tools_db import TABLE_KEYS
+from tools_ingest import CSV_TYPED_RULES, UpsertResult, file_kind, ingest_path, spool_upload
+
+WATCH_MAX_BYTES = 16 * 1024 * 1024
+WATCH_EXTS = (".csv", ".ndjson", ".jsonl")
+
+
+def table_for_file(path: str):
+    """Tabel tujuan dari nama file (mis. bench_tx_node1.csv -> bench_tx); None kalau tidak cocok."""
+    base = os.path.basename(path).lower()
+    if not base.endswith(WATCH_EXTS):
+        return None
+    for table in TABLE_KEYS:
+        if table in base:
+            # tabel bench hanya dari CSV (typed staging)
+            if table in CSV_TYPED_RULES and file_kind(base) != "csv":
+                return None
+            return table
+    return None
+
+
+def _file_id(st) -> str:
+    # dev:inode — berubah kalau file di-rotate (nama sama, file baru)
+    return f"{st.st_dev}:{st.st_ino}"
+
+
+def _read_complete_lines(f, offset: int, max_bytes: int) -> bytes:
+    """Baca mulai `offset` sampai newline terakhir (maks ~max_bytes, kecuali satu baris lebih panjang)."""
+    f.seek(offset)
+    data = f.read(max_bytes)
+    cut = data.rfind(b"\n")
+    while cut < 0 and len(data) >= max_bytes:
+        more = f.read(max_bytes)
+        if not more:
+            break
+        data += more
+        cut = data.rfind(b"\n")
+    return data[:cut + 1] if cut >= 0 else b""
+
+
+def ingest_appended(con, path: str, table: str, max_bytes: int = WATCH_MAX_BYTES,
+                    timings: dict = None) -> tuple:
+    """
+    Satu micro-batch untuk satu file: baris lengkap baru sejak offset tersimpan -> ingest_path.
+    Return (UpsertResult, byte_diproses, masih_ada_sisa).
+    """
+    st = os.stat(path)
+    fid = _file_id(st)
+    row = con.execute(
+        "SELECT file_id, byte_offset, header, row_count FROM ingest_offsets WHERE path = ?", [path]
+    ).fetchone()
+    if row and row[0] == fid and row[1] <= st.st_size:
+        offset, header, rows = row[1], row[2], row[3]
+    else:
+        # file baru / di-rotate / di-truncate -> mulai dari awal
+        offset, header, rows = 0, None, 0
+    if offset >= st.st_size:
+        return UpsertResult(), 0, False
+
+    kind = file_kind(path)
+    start = offset
+    with open(path, "rb") as f:
+        if kind == "csv" and header is None:
+            f.seek(0)
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                return UpsertResult(), 0, False
+            header = line.rstrip(b"\r\n").decode("utf-8", "replace")
+            offset = len(line)
+        data = _read_complete_lines(f, offset, max_bytes)
+
+    res = UpsertResult()
+    if data.strip():
+        payload = (header.encode("utf-8") + b"\n" + data) if kind == "csv" else data
+        tmp = spool_upload(payload, suffix=".csv" if kind == "csv" else ".ndjson")
+        try:
+            res, _ = ingest_path(con, table, tmp, kind, timings=timings)
+        finally:
+            os.unlink(tmp)
+
+    new_offset = offset + len(data)
+    con.execute(
+        "INSERT OR REPLACE INTO ingest_offsets VALUES (?, ?, ?, ?, ?, ?, now()::TIMESTAMP)",
+        [path, table, fid, new_offset, header, rows + res.rows],
+    )
+    return res, new_offset - start, new_offset < st.st_size and bool(data)
+
+
+@contextmanager
+def _tick_connection(db_path: str):
+    # koneksi per putaran lalu ditutup, supaya proses lain bisa membuka file DB di antaranya
+    con = duckdb.connect(db_path)
+    try:
+        yield con
+    finally:
+        con.close()
+
+
+def watch_dir(db_path: str, directory: str, table: str = None, interval: float = 2.0,
+              max_bytes: int = WATCH_MAX_BYTES, on_batch=None, stop=None, once: bool = False,
+              connection=None):
+    """
+    Loop watcher. Default koneksi DuckDB dibuka per putaran (lihat _tick_connection);
+    connection: factory context manager lain, mis. ConnectionManager.writer di dalam app.
+    on_batch(path, table, res, nbytes, detik) dipanggil per micro-batch; stop: threading.Event
+    opsional; once=True: satu putaran sampai backlog habis.
+    """
+    connection = connection or (lambda: _tick_connection(db_path))
+    while not (stop is not None and stop.is_set()):
+        backlog = False
+        try:
+            with connection() as con:
+                for name in sorted(os.listdir(directory)):
+                    path = os.path.join(directory, name)
+                    target = table or table_for_file(path)
+                    if target is None or not os.path.isfile(path):
+                        continue
+                    t0 = time.perf_counter()
+                    res, nbytes, more = ingest_appended(con, path, target, max_bytes)
+                    backlog = backlog or more
+                    if nbytes and on_batch is not None:
+                        on_batch(path, target, res, nbytes, time.perf_counter() - t0)
+        except duckdb.IOException:
+            # DB sedang dikunci proses lain (mis. app Streamlit) -> coba lagi nanti
+            pass
+        if backlog:
+            continue
+        if once:
+            return
+        if stop is not None:
+            stop.wait(interval)
+        else:
+            time.sleep(interval)